@@ -14,6 +14,8 @@ import warnings
 import time
 warnings.filterwarnings('ignore')
 
+from app.data_providers.statements import BALANCE_SHEET_FIELDS, INCOME_STATEMENT_FIELDS, extract_statement
+
 # ====================================================================
 # KONFIGURASI HALAMAN
 # ====================================================================
@@ -104,37 +106,14 @@ class DataProvider:
         """Extract dan bersihkan data dari YFinance"""
         financial_data = {}
         
-        # Balance Sheet Items dengan error handling
+        # Balance Sheet & Income Statement: tabel alias bersama dengan app/main.py
         try:
-            # Coba berbagai nama kolom yang mungkin
-            total_assets_keys = ['Total Assets', 'TotalAssets', 'Total assets']
-            current_assets_keys = ['Current Assets', 'CurrentAssets', 'Current assets']
-            current_liab_keys = ['Current Liabilities', 'CurrentLiabilities', 'Current liabilities']
-            total_liab_keys = ['Total Liabilities Net Minority Interest', 'Total Liabilities', 'TotalLiabilities']
-            retained_keys = ['Retained Earnings', 'RetainedEarnings', 'Retained earnings']
-            equity_keys = ['Total Equity Gross Minority Interest', 'Total Equity', 'TotalEquity', 'Stockholder Equity']
-            
-            # Extract dengan fallback
-            financial_data['total_assets'] = self._safe_extract(balance_sheet, total_assets_keys)
-            financial_data['current_assets'] = self._safe_extract(balance_sheet, current_assets_keys)
-            financial_data['current_liabilities'] = self._safe_extract(balance_sheet, current_liab_keys)
-            financial_data['total_liabilities'] = self._safe_extract(balance_sheet, total_liab_keys)
-            financial_data['retained_earnings'] = self._safe_extract(balance_sheet, retained_keys)
-            financial_data['total_equity'] = self._safe_extract(balance_sheet, equity_keys)
-            
+            financial_data.update(extract_statement(balance_sheet, BALANCE_SHEET_FIELDS).latest(0))
         except Exception as e:
             st.warning(f"Beberapa data balance sheet tidak tersedia: {str(e)}")
         
-        # Income Statement Items
         try:
-            revenue_keys = ['Total Revenue', 'TotalRevenue', 'Revenue', 'Net Sales']
-            ebit_keys = ['EBIT', 'Operating Income', 'OperatingIncome']
-            net_income_keys = ['Net Income', 'NetIncome', 'Net income']
-            
-            financial_data['total_revenue'] = self._safe_extract(financials, revenue_keys)
-            financial_data['ebit'] = self._safe_extract(financials, ebit_keys)
-            financial_data['net_income'] = self._safe_extract(financials, net_income_keys)
-            
+            financial_data.update(extract_statement(financials, INCOME_STATEMENT_FIELDS).latest(0))
         except Exception as e:
             st.warning(f"Beberapa data income statement tidak tersedia: {str(e)}")
         
@@ -151,21 +130,6 @@ class DataProvider:
         
         return financial_data
     
-    def _safe_extract(self, dataframe, possible_keys):
-        """Safely extract value from dataframe dengan multiple possible keys"""
-        if dataframe.empty:
-            return 0
-        
-        for key in possible_keys:
-            if key in dataframe.index:
-                try:
-                    value = dataframe.loc[key].iloc[0]
-                    if pd.notna(value) and value != 0:
-                        return float(value)
-                except:
-                    continue
-        return 0
-    
     def get_alpha_vantage_data(self, ticker, api_key):
         """Mengambil data dari Alpha Vantage"""
         if not api_key:
@@ -0,0 +1,143 @@
+# ====================================================================
+# 📄 app/cli.py - CLI batch scoring (tanpa Streamlit/Plotly)
+# ====================================================================
+"""
+Skoring banyak ticker dari command line, mis. untuk job malam (cron):
+
+    python -m app.cli score --tickers universe.txt --source yfinance --out results.parquet
+
+Ticker diambil paralel lewat DataProvider (cache & rate limit yang sama
+dengan aplikasi Streamlit) dan dinilai per batch oleh ScreenerJob. Format
+output ditentukan dari ekstensi `--out` (.csv, .parquet, .json) atau
+`--format`; tanpa `--out` hasil CSV ditulis ke stdout.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+from app.core import UI_MODELS, ScreenerJob
+from app.models.registry import MODEL_REGISTRY
+from app.utils.constants import IDX_TICKERS, SCREENER_BATCH_SIZE
+from app.utils.tickers import parse_tickers
+
+OUTPUT_FORMATS = ('csv', 'parquet', 'json')
+
+
+def read_tickers(path: Optional[str]) -> List[str]:
+    """Ticker dari file (atau stdin untuk '-'); tanpa path pakai universe IDX bawaan"""
+    if path is None:
+        return list(IDX_TICKERS)
+    if path == '-':
+        return parse_tickers(sys.stdin.read())
+    return parse_tickers(Path(path).read_bytes())
+
+
+def output_format(out: Optional[str], fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    suffix = Path(out).suffix.lower().lstrip('.') if out else ''
+    if suffix in OUTPUT_FORMATS:
+        return suffix
+    if suffix:
+        raise ValueError(f"Format output tidak dikenal: .{suffix} (pilih {', '.join(OUTPUT_FORMATS)})")
+    return 'csv'
+
+
+def write_results(results: pd.DataFrame, out: Optional[str], fmt: str) -> None:
+    """Tulis hasil (index ticker) ke file atau stdout"""
+    frame = results.reset_index()
+    if fmt == 'parquet':
+        if not out:
+            raise ValueError("Output parquet membutuhkan --out")
+        frame.to_parquet(out, index=False)
+    elif fmt == 'json':
+        frame.to_json(out or sys.stdout, orient='records', indent=None)
+        if not out:
+            sys.stdout.write('\n')
+    else:
+        frame.to_csv(out or sys.stdout, index=False)
+
+
+def score(args: argparse.Namespace) -> int:
+    tickers = read_tickers(args.tickers)
+    if not tickers:
+        print("Tidak ada ticker untuk dinilai", file=sys.stderr)
+        return 2
+    fmt = output_format(args.out, args.format)
+
+    api_key = args.api_key or os.environ.get('ALPHA_VANTAGE_API_KEY')
+    if args.source == 'alpha_vantage' and not api_key:
+        print("Alpha Vantage membutuhkan --api-key atau ALPHA_VANTAGE_API_KEY", file=sys.stderr)
+        return 2
+
+    job = ScreenerJob(tickers, args.source, api_key, models=args.models,
+                      batch_size=args.batch_size, refresh=args.refresh).start()
+    try:
+        while not job.wait(args.progress_interval):
+            if not args.quiet:
+                done, total = job.progress
+                print(f"{done}/{total} ticker selesai", file=sys.stderr)
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+
+    results = job.results()
+    for ticker, error in job.errors.items():
+        print(f"{ticker}: {error}", file=sys.stderr)
+    if not args.quiet:
+        print(f"{len(results)} ticker dinilai, {len(job.errors)} gagal dalam {job.elapsed:.1f} detik",
+              file=sys.stderr)
+
+    if results.empty:
+        return 1
+    write_results(results, args.out, fmt)
+    return 0
+
+
+def model_list(value: str) -> List[str]:
+    keys = [key.strip() for key in value.split(',') if key.strip()]
+    unknown = [key for key in keys if key not in MODEL_REGISTRY]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"Model tidak dikenal: {', '.join(unknown)} (pilih dari {', '.join(MODEL_REGISTRY)})")
+    return keys
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description="Prediksi kebangkrutan tanpa UI")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('score', help="Nilai daftar ticker dan tulis hasilnya")
+    run.add_argument('--tickers', help="File ticker (CSV kolom 'ticker' atau teks); '-' untuk stdin. "
+                                       "Default: universe IDX bawaan")
+    run.add_argument('--source', choices=('yfinance', 'alpha_vantage'), default='yfinance')
+    run.add_argument('--api-key', help="API key Alpha Vantage (default: env ALPHA_VANTAGE_API_KEY)")
+    run.add_argument('--out', help="File output; tanpa ini CSV ke stdout")
+    run.add_argument('--format', choices=OUTPUT_FORMATS, help="Paksa format output (default dari ekstensi)")
+    run.add_argument('--models', type=model_list, default=list(UI_MODELS),
+                     help=f"Key model dipisah koma (default: {','.join(UI_MODELS)})")
+    run.add_argument('--batch-size', type=int, default=SCREENER_BATCH_SIZE)
+    run.add_argument('--refresh', action='store_true', help="Abaikan cache dan ambil ulang dari sumber")
+    run.add_argument('--progress-interval', type=float, default=5.0, help=argparse.SUPPRESS)
+    run.add_argument('-q', '--quiet', action='store_true', help="Tanpa laporan progress di stderr")
+    run.set_defaults(handler=score)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# ====================================================================
+# 📄 app/components/results_table.py
+# ====================================================================
+"""
+Tabel hasil besar dengan sort, filter dan paginasi di server.
+
+`ResultsTable` memegang DataFrame hasil scoring (ribuan-puluhan ribu
+baris) dan hanya mematerialisasi baris halaman yang terlihat. Urutan sort
+per (kolom, arah) dihitung sekali dengan argsort stabil lalu disimpan di
+instance; simpan instance di `st.session_state` agar cache itu bertahan
+antar rerun. Filter dihitung sebagai mask numpy dan diterapkan pada urutan
+sort yang sudah ada, sehingga sort tidak perlu diulang.
+"""
+
+import math
+from typing import Callable, Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+class TablePage(NamedTuple):
+    """Satu halaman hasil (baris mentah, belum diformat)"""
+    frame: pd.DataFrame
+    page: int  # 0-based, sudah di-clamp
+    pages: int
+    total: int  # jumlah baris setelah filter
+    start: int  # posisi baris pertama halaman dalam hasil terfilter
+
+
+class ResultsTable:
+    """Sort/filter/paginasi server-side di atas satu DataFrame yang tidak berubah"""
+
+    def __init__(self, frame: pd.DataFrame, search_columns: Sequence[str] = ()):
+        self.frame = frame
+        self.search_columns = tuple(search_columns)
+        self._orders: Dict[Tuple[Optional[str], bool], np.ndarray] = {}
+        self._haystack: Optional[pd.Series] = None
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def values(self, column: Optional[str]) -> pd.Series:
+        """Nilai kolom (atau index untuk `column` None / nama index) dengan index posisi"""
+        if column is None or column == self.frame.index.name:
+            return pd.Series(self.frame.index.to_numpy())
+        return pd.Series(self.frame[column].to_numpy())
+
+    def sort_order(self, column: Optional[str] = None, ascending: bool = True) -> np.ndarray:
+        """Posisi baris terurut (stabil, nilai kosong di akhir); di-cache per (kolom, arah)"""
+        key = (column, ascending)
+        order = self._orders.get(key)
+        if order is None:
+            if column is None and ascending:
+                order = np.arange(len(self.frame))
+            else:
+                order = self.values(column).sort_values(
+                    ascending=ascending, kind='stable', na_position='last'
+                ).index.to_numpy()
+            order.flags.writeable = False
+            self._orders[key] = order
+        return order
+
+    def mask(self, query: str = '', equals: Optional[Mapping[str, Sequence]] = None,
+             minimum: Optional[Mapping[str, float]] = None) -> Optional[np.ndarray]:
+        """Mask baris yang lolos filter (None: tanpa filter)"""
+        mask = None
+
+        def combine(current, condition):
+            return condition if current is None else current & condition
+
+        query = query.strip().lower()
+        if query:
+            if self._haystack is None:
+                parts = [self.values(column).astype(str).str.lower() for column in (None,) + self.search_columns]
+                self._haystack = parts[0].str.cat(parts[1:], sep=' ')
+            mask = combine(mask, self._haystack.str.contains(query, regex=False).to_numpy())
+        for column, allowed in (equals or {}).items():
+            if allowed:
+                mask = combine(mask, self.values(column).isin(list(allowed)).to_numpy())
+        for column, low in (minimum or {}).items():
+            if low is not None:
+                mask = combine(mask, (self.values(column) >= low).to_numpy())
+        return mask
+
+    def page(self, page: int = 0, page_size: int = 50, sort_by: Optional[str] = None,
+             ascending: bool = True, query: str = '', equals: Optional[Mapping[str, Sequence]] = None,
+             minimum: Optional[Mapping[str, float]] = None) -> TablePage:
+        """Ambil satu halaman setelah sort + filter; hanya baris halaman yang di-`iloc`"""
+        order = self.sort_order(sort_by, ascending)
+        mask = self.mask(query, equals, minimum)
+        if mask is not None:
+            order = order[mask[order]]
+
+        total = len(order)
+        pages = max(1, math.ceil(total / page_size))
+        page = min(max(page, 0), pages - 1)
+        start = page * page_size
+        return TablePage(self.frame.iloc[order[start:start + page_size]], page, pages, total, start)
+
+
+def show_results_table(table: ResultsTable, key: str, labels: Mapping[str, str],
+                       format_page: Callable[[pd.DataFrame], pd.DataFrame] = lambda frame: frame,
+                       equals_filters: Optional[Mapping[str, Sequence]] = None,
+                       minimum_filter: Optional[Tuple[str, str, int]] = None,
+                       default_sort: Optional[str] = None, **dataframe_kwargs) -> TablePage:
+    """Kontrol sort/filter/halaman + st.dataframe yang hanya berisi halaman aktif.
+
+    `labels` memetakan kolom yang bisa diurutkan ke label tampilan,
+    `equals_filters` kolom -> pilihan untuk multiselect, `minimum_filter`
+    (kolom, label, nilai maksimum) untuk slider batas bawah, dan
+    `format_page` mengubah baris mentah halaman menjadi tabel tampilan.
+    """
+    columns = list(labels)
+    col1, col2, col3 = st.columns([2, 1, 2])
+    sort_by = col1.selectbox("Urutkan:", columns, format_func=labels.get, key=f'{key}_sort',
+                             index=columns.index(default_sort) if default_sort in columns else 0)
+    ascending = col2.radio("Arah:", ["⬇️ Turun", "⬆️ Naik"], key=f'{key}_direction',
+                           horizontal=True) == "⬆️ Naik"
+    query = col3.text_input("Cari:", key=f'{key}_query', placeholder="Ticker atau nama perusahaan")
+
+    equals, minimum = {}, {}
+    filter_columns = st.columns(len(equals_filters or {}) + (minimum_filter is not None) or 1)
+    for col, (column, options) in zip(filter_columns, (equals_filters or {}).items()):
+        equals[column] = col.multiselect(labels.get(column, column), list(options), key=f'{key}_eq_{column}')
+    if minimum_filter is not None:
+        column, label, high = minimum_filter
+        minimum[column] = filter_columns[-1].slider(label, 0, high, 0, key=f'{key}_min_{column}')
+
+    page_size = st.session_state.get(f'{key}_page_size', PAGE_SIZES[1])
+    page = table.page(st.session_state.get(f'{key}_page', 1) - 1, page_size, sort_by, ascending,
+                      query, equals, minimum)
+
+    st.dataframe(format_page(page.frame), **dataframe_kwargs)
+
+    # Filter baru bisa memperkecil jumlah halaman: clamp sebelum widget dibuat
+    st.session_state[f'{key}_page'] = page.page + 1
+    col1, col2, col3 = st.columns([1, 1, 2])
+    col1.number_input("Halaman:", min_value=1, max_value=page.pages, key=f'{key}_page')
+    col2.selectbox("Baris/halaman:", PAGE_SIZES, index=1, key=f'{key}_page_size')
+    end = page.start + len(page.frame)
+    col3.caption(f"Baris {page.start + 1 if page.total else 0:,}–{end:,} dari {page.total:,}"
+                 f" (total {len(table):,}) · halaman {page.page + 1}/{page.pages}")
+    return page
@@ -0,0 +1,1040 @@
+# ====================================================================
+# 📄 app/core.py - Model, validasi & DataProvider tanpa UI
+# ====================================================================
+"""
+Inti aplikasi tanpa dependensi Streamlit/Plotly.
+
+Hanya numpy/pandas yang diimpor saat modul dimuat; yfinance dan requests
+(client Alpha Vantage) baru diimpor ketika provider pertama kali dipakai,
+sehingga worker dan test yang hanya butuh model/validasi tetap ringan.
+
+Dipakai oleh halaman Streamlit (app/main.py) maupun proses headless seperti
+CLI batch (app/cli.py): record finansial, DataProvider dengan cache,
+BankruptcyPredictor, dan ScreenerJob untuk menilai banyak ticker sekaligus.
+"""
+
+import atexit
+import logging
+import math
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Tuple, Optional, Any, Callable, Iterable, Iterator, Mapping, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.data_providers import alpha_vantage
+from app.data_providers.cache import FundamentalsCache
+from app.data_providers.coalesce import SingleFlight
+from app.data_providers.replay import ReplayProvider, upstream_from_env
+from app.data_providers.statements import (
+    BALANCE_SHEET_FIELDS,
+    INCOME_STATEMENT_FIELDS,
+    append_new_periods,
+    extract_history,
+    extract_statement,
+    trailing_twelve_months,
+)
+from app.models.registry import INVALID_ZONE, MODEL_REGISTRY, score_arrays
+from app.utils.constants import (
+    ALPHA_VANTAGE_FUNCTIONS,
+    CACHE_INFO_TTL,
+    CACHE_TTL,
+    FETCH_MAX_WORKERS,
+    HISTORY_PERIODS,
+    QUARTER_DUE_DAYS,
+    RISK_EMOJIS,
+    SCREENER_BATCH_SIZE,
+    SOURCE_CONCURRENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _yf_ticker(ticker: str):
+    """yfinance.Ticker; yfinance (beserta curl_cffi) baru diimpor saat fetch pertama"""
+    import yfinance
+    return yfinance.Ticker(ticker)
+
+
+# ====================================================================
+# CONSTANTS
+# ====================================================================
+# Model yang ditampilkan di halaman analisis & screener (key MODEL_REGISTRY)
+UI_MODELS = ('altman', 'springate', 'zmijewski', 'grover')
+
+# Define financial field names that should be converted to float
+NUMERIC_FIELDS = {
+    'current_assets', 'current_liabilities', 'total_assets', 'total_liabilities',
+    'total_revenue', 'ebit', 'net_income', 'retained_earnings', 'market_cap',
+    'total_equity', 'current_price', 'book_value', 'shares_outstanding',
+    'ebitda', 'profit_margin'
+}
+
+# ====================================================================
+# FINANCIAL RECORD
+# ====================================================================
+class CompanyInfo(NamedTuple):
+    """Metadata perusahaan (non-numerik)"""
+    company_name: str = 'Unknown'
+    sector: str = 'N/A'
+    industry: str = 'N/A'
+    country: str = 'N/A'
+
+
+class FinancialRecord(NamedTuple):
+    """Data finansial satu perusahaan-periode sebagai tuple float ringkas.
+    
+    Semua field numerik adalah float (0.0 jika tidak tersedia); metadata
+    perusahaan disimpan terpisah di `info`. Gunakan `from_dict`/`to_dict`
+    untuk konversi dari/ke bentuk dict lama.
+    """
+    current_assets: float = 0.0
+    current_liabilities: float = 0.0
+    total_assets: float = 0.0
+    total_liabilities: float = 0.0
+    total_revenue: float = 0.0
+    ebit: float = 0.0
+    net_income: float = 0.0
+    retained_earnings: float = 0.0
+    market_cap: float = 0.0
+    total_equity: float = 0.0
+    current_price: float = 0.0
+    book_value: float = 0.0
+    shares_outstanding: float = 0.0
+    ebitda: float = 0.0
+    profit_margin: float = 0.0
+    info: CompanyInfo = CompanyInfo()
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FinancialRecord':
+        """Buat record dari dict finansial (format lama)"""
+        numeric = {
+            key: DataProvider.safe_float(data[key], 0.0) if data[key] is not None else 0.0
+            for key in RECORD_FIELDS if key in data
+        }
+        info = CompanyInfo(**{key: data[key] for key in CompanyInfo._fields if key in data})
+        return cls(info=info, **numeric)
+    
+    def to_dict(self) -> Dict:
+        """Kembalikan bentuk dict lama (field numerik + metadata)"""
+        data = dict(zip(RECORD_FIELDS, self))
+        data.update(self.info._asdict())
+        return data
+    
+    @staticmethod
+    def to_frame(records) -> pd.DataFrame:
+        """Gabungkan banyak record menjadi satu DataFrame untuk batch scoring"""
+        n = len(RECORD_FIELDS)
+        values = np.array([record[:n] for record in records], dtype=float).reshape(-1, n)
+        frame = pd.DataFrame(values, columns=list(RECORD_FIELDS))
+        for key in CompanyInfo._fields:
+            frame[key] = [getattr(record.info, key) for record in records]
+        return frame
+
+
+# Field numerik FinancialRecord dengan urutan tetap
+RECORD_FIELDS = FinancialRecord._fields[:-1]
+
+# ====================================================================
+# DATA PROVIDER CLASS
+# ====================================================================
+class DataProvider:
+    """Kelas untuk mengambil data dari berbagai sumber"""
+    
+    _cache: Optional[FundamentalsCache] = None
+    _cache_lock = threading.Lock()
+    _memo = SingleFlight()
+    _upstream = upstream_from_env()
+    _source_limits = {source: threading.BoundedSemaphore(limit)
+                      for source, limit in SOURCE_CONCURRENCY.items()}
+    
+    @staticmethod
+    def get_cache() -> FundamentalsCache:
+        """Cache fundamental persisten bersama (dibuat saat pertama dipakai).
+        
+        Mode record/replay memakai cache terisolasi per proses, bukan CACHE_DIR:
+        cache lokal yang hangat akan membuat fixture tidak terekam dan replay
+        melewati latency/error yang disuntikkan.
+        """
+        with DataProvider._cache_lock:
+            if DataProvider._cache is None:
+                DataProvider._cache = FundamentalsCache(DataProvider._run_cache_path())
+            return DataProvider._cache
+    
+    @staticmethod
+    def _run_cache_path() -> Optional[Path]:
+        """None (CACHE_DIR) untuk mode live, direktori sementara untuk record/replay"""
+        if DataProvider._upstream is None:
+            return None
+        directory = tempfile.mkdtemp(prefix='fundamentals-')
+        atexit.register(shutil.rmtree, directory, True)
+        return Path(directory) / 'fundamentals.sqlite'
+    
+    @staticmethod
+    def safe_float(value, default=0.0):
+        """Safely convert value to float"""
+        try:
+            if value and value != 'None' and value != '-' and str(value).strip() != '':
+                # Remove any commas or other formatting
+                clean_value = str(value).replace(',', '').replace(' ', '')
+                return float(clean_value)
+        except (ValueError, TypeError) as e:
+            print(f"Warning: Could not convert '{value}' to float: {e}")
+        return default
+    
+    @staticmethod
+    def set_upstream(upstream: Optional[Any]) -> None:
+        """Pasang Recorder/ReplayProvider (app.data_providers.replay); None = live.
+        
+        Cache dan memo dibuat ulang agar hasil mode sebelumnya tidak terpakai.
+        """
+        with DataProvider._cache_lock:
+            DataProvider._upstream = upstream
+            DataProvider._cache = None
+        DataProvider._memo.clear()
+    
+    @staticmethod
+    def _call_upstream(source: str, kind: str, ticker: str, fetch: Callable[[], Any]) -> Any:
+        """Titik panggilan jaringan yfinance; diteruskan ke recorder/replay jika aktif.
+        
+        Endpoint Alpha Vantage memakai seam yang sama di dalam antrean client
+        (`AlphaVantageClient.query_many(..., upstream)`).
+        """
+        upstream = DataProvider._upstream
+        if upstream is None:
+            return fetch()
+        return upstream.call(source, kind, ticker, fetch)
+    
+    @staticmethod
+    def _succeeded(result: Tuple[Optional[FinancialRecord], Optional[str]]) -> bool:
+        return result[1] is None
+    
+    @staticmethod
+    def get_yfinance_data(ticker: str, refresh: bool = False) -> Tuple[Optional[FinancialRecord], Optional[str]]:
+        """Mengambil data dari Yahoo Finance (permintaan bersamaan untuk ticker sama digabung)"""
+        return DataProvider._memo.do(
+            ('yfinance', ticker), lambda: DataProvider._load_yfinance_data(ticker, refresh),
+            refresh=refresh, cache_if=DataProvider._succeeded
+        )
+    
+    @staticmethod
+    def _load_yfinance_data(ticker: str, refresh: bool = False) -> Tuple[Optional[FinancialRecord], Optional[str]]:
+        """Muat data Yahoo Finance via cache persisten kecuali refresh=True"""
+        try:
+            raw, error = DataProvider._yfinance_raw(ticker, refresh)
+            if error:
+                return None, error
+            
+            # Metadata perusahaan hanya dipakai jika sudah ada di cache (lihat get_company_info)
+            info = DataProvider.get_cache().get('yfinance', ticker, 'info', ttl=CACHE_INFO_TTL)
+            
+            # Extract financial data
+            financial_data = DataProvider._extract_yfinance_data(
+                raw['balance_sheet'], raw['financials'], raw['quote'],
+                CompanyInfo(**info) if info else CompanyInfo()
+            )
+            
+            if financial_data.total_assets <= 0:
+                return None, "Data total assets tidak valid atau tidak tersedia"
+            
+            return financial_data, None
+            
+        except Exception as e:
+            return None, f"Error YFinance: {str(e)}"
+    
+    @staticmethod
+    def _yfinance_raw(ticker: str, refresh: bool = False) -> Tuple[Optional[Dict], Optional[str]]:
+        """Response mentah dari cache persisten, fetch jika belum ada atau refresh=True"""
+        cache = DataProvider.get_cache()
+        raw = None if refresh else cache.get('yfinance', ticker)
+        
+        if raw is None or 'quote' not in raw:
+            raw, error = DataProvider._call_upstream(
+                'yfinance', 'annual', ticker, lambda: DataProvider._fetch_yfinance_raw(ticker)
+            )
+            if error:
+                return None, error
+            cache.set('yfinance', ticker, raw)
+        return raw, None
+    
+    @staticmethod
+    def _fetch_yfinance_raw(ticker: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """Ambil response mentah Yahoo Finance (quote + laporan keuangan tahunan).
+        
+        Validasi ticker memakai quote ringan (fast_info), bukan `info` yang
+        lambat; metadata perusahaan dimuat terpisah lewat get_company_info.
+        """
+        stock = _yf_ticker(ticker)
+        quote = DataProvider._fetch_yfinance_quote(stock)
+        
+        # Check if ticker is valid
+        if quote is None:
+            return None, f"Ticker {ticker} tidak ditemukan atau tidak valid"
+        
+        # Get financial statements
+        try:
+            financials = stock.financials
+            balance_sheet = stock.balance_sheet
+            
+            if balance_sheet.empty or financials.empty:
+                return None, "Data laporan keuangan tidak tersedia"
+            
+        except Exception as e:
+            return None, f"Error mengambil laporan keuangan: {str(e)}"
+        
+        return {'quote': quote, 'financials': financials, 'balance_sheet': balance_sheet}, None
+    
+    @staticmethod
+    def _fetch_yfinance_quote(stock) -> Optional[Dict[str, float]]:
+        """Harga terakhir dan market cap dari fast_info; None jika ticker tidak valid"""
+        try:
+            fast_info = stock.fast_info
+            last_price = fast_info['lastPrice']
+        except Exception:
+            return None
+        if last_price is None or pd.isna(last_price):
+            return None
+        try:
+            market_cap = fast_info['marketCap']
+        except Exception:
+            market_cap = None
+        return {
+            'current_price': DataProvider.safe_float(last_price),
+            'market_cap': DataProvider.safe_float(market_cap) if market_cap is not None and pd.notna(market_cap) else 0.0
+        }
+    
+    @staticmethod
+    def get_company_info(ticker: str, refresh: bool = False) -> CompanyInfo:
+        """Metadata perusahaan dari `info` yfinance (lambat), di-cache terpisah dari statement"""
+        return DataProvider._memo.do(
+            ('yfinance_info', ticker), lambda: DataProvider._load_company_info(ticker, refresh),
+            refresh=refresh, cache_if=lambda info: info != CompanyInfo()
+        )
+    
+    @staticmethod
+    def _load_company_info(ticker: str, refresh: bool = False) -> CompanyInfo:
+        cache = DataProvider.get_cache()
+        cached = None if refresh else cache.get('yfinance', ticker, 'info', ttl=CACHE_INFO_TTL)
+        if cached is not None:
+            return CompanyInfo(**cached)
+        
+        try:
+            info = DataProvider._call_upstream('yfinance', 'info', ticker, lambda: _yf_ticker(ticker).info) or {}
+        except Exception:
+            return CompanyInfo()
+        if not info:
+            return CompanyInfo()
+        
+        company_info = CompanyInfo(
+            company_name=info.get('longName', info.get('shortName', 'Unknown')),
+            sector=info.get('sector', 'N/A'),
+            industry=info.get('industry', 'N/A'),
+            country=info.get('country', 'N/A')
+        )
+        cache.set('yfinance', ticker, company_info._asdict(), 'info')
+        return company_info
+    
+    @staticmethod
+    def _extract_yfinance_data(balance_sheet, financials, quote: Mapping[str, float],
+                               info: CompanyInfo = CompanyInfo()) -> FinancialRecord:
+        """Extract dan clean data dari YFinance"""
+        financial_data = {}
+        
+        # Balance sheet & income statement: satu reindex per statement (lihat STATEMENT_ALIASES)
+        try:
+            financial_data.update(extract_statement(balance_sheet, BALANCE_SHEET_FIELDS).latest())
+        except Exception as e:
+            logger.warning("Beberapa data balance sheet tidak tersedia: %s", e)
+        
+        try:
+            financial_data.update(extract_statement(financials, INCOME_STATEMENT_FIELDS).latest())
+        except Exception as e:
+            logger.warning("Beberapa data income statement tidak tersedia: %s", e)
+        
+        # Company information (keep as strings)
+        financial_data.update(info._asdict())
+        
+        # Quote data
+        financial_data['market_cap'] = quote.get('market_cap', 0.0)
+        financial_data['current_price'] = quote.get('current_price', 0.0)
+        
+        # Calculate missing values
+        if not financial_data.get('total_equity') and financial_data.get('total_assets') and financial_data.get('total_liabilities'):
+            financial_data['total_equity'] = financial_data['total_assets'] - financial_data['total_liabilities']
+        
+        # Estimate EBIT if missing
+        if not financial_data.get('ebit') and financial_data.get('net_income'):
+            financial_data['ebit'] = financial_data['net_income'] * 1.2
+        
+        return FinancialRecord.from_dict(financial_data)
+    
+    @staticmethod
+    def get_alpha_vantage_data(ticker: str, api_key: str,
+                               refresh: bool = False) -> Tuple[Optional[FinancialRecord], Optional[str]]:
+        """Mengambil data dari Alpha Vantage API (permintaan bersamaan untuk symbol sama digabung).
+        
+        Mode replay tidak membutuhkan API key karena tidak ada request jaringan.
+        """
+        if not api_key and not isinstance(DataProvider._upstream, ReplayProvider):
+            return None, "API Key Alpha Vantage diperlukan"
+        
+        symbol = ticker.replace('.JK', '').replace('.', '-')
+        return DataProvider._memo.do(
+            ('alpha_vantage', symbol),
+            lambda: DataProvider._load_alpha_vantage_data(symbol, api_key, refresh),
+            refresh=refresh, cache_if=DataProvider._succeeded
+        )
+    
+    @staticmethod
+    def _load_alpha_vantage_data(symbol: str, api_key: str,
+                                 refresh: bool = False) -> Tuple[Optional[FinancialRecord], Optional[str]]:
+        """Muat data Alpha Vantage (laporan tahunan terbaru) via cache persisten"""
+        try:
+            raw, error = DataProvider._fetch_alpha_vantage_raw(symbol, api_key, refresh)
+            if error:
+                return None, error
+            
+            financial_data = DataProvider._extract_alpha_vantage_data(raw, symbol)
+            if financial_data is None or financial_data.total_assets <= 0:
+                return None, "Data total assets tidak valid atau tidak tersedia"
+            
+            return financial_data, None
+            
+        except Exception as e:
+            return None, f"Error Alpha Vantage: {str(e)}"
+    
+    @staticmethod
+    def _fetch_alpha_vantage_raw(symbol: str, api_key: str,
+                                 refresh: bool = False) -> Tuple[Optional[Dict], Optional[str]]:
+        """JSON mentah OVERVIEW, BALANCE_SHEET dan INCOME_STATEMENT untuk satu symbol.
+        
+        Endpoint yang belum ada di cache diambil bersamaan lewat antrean client
+        (tetap dalam budget rate limit). Tiap endpoint disimpan ke cache begitu
+        berhasil, sehingga jika endpoint lain gagal, error langsung dikembalikan
+        tanpa menunggu dan budget yang sudah terpakai tidak terbuang.
+        """
+        cache = DataProvider.get_cache()
+        raw = {}
+        if not refresh:
+            for function in ALPHA_VANTAGE_FUNCTIONS:
+                data = cache.get('alpha_vantage', symbol, function.lower())
+                if data is not None:
+                    raw[function] = data
+        
+        missing = [function for function in ALPHA_VANTAGE_FUNCTIONS if function not in raw]
+        if missing:
+            def store(request, data):
+                # Dipanggil di worker client, juga setelah fetch ini berhenti karena error
+                if data:
+                    cache.set('alpha_vantage', symbol, data, request[0].lower())
+            
+            # Antrean client bersama per API key mengatur budget rate limit
+            client = alpha_vantage.get_client(api_key or '')
+            results = client.query_many([(function, symbol) for function in missing],
+                                        DataProvider._upstream, store)
+            for (function, _), data, error in results:
+                if isinstance(error, alpha_vantage.RateLimitError):
+                    return None, "Rate limit Alpha Vantage tercapai, coba lagi nanti"
+                if isinstance(error, alpha_vantage.AlphaVantageError):
+                    # API key salah, endpoint premium, dst.: bukan berarti symbol salah
+                    return None, f"Error Alpha Vantage: {str(error)}"
+                if error is not None:
+                    raise error
+                
+                if not data:
+                    return None, f"Symbol {symbol} tidak ditemukan di Alpha Vantage"
+                raw[function] = data
+        
+        if not raw['BALANCE_SHEET'].get('annualReports') or not raw['INCOME_STATEMENT'].get('annualReports'):
+            return None, "Data laporan keuangan tidak tersedia"
+        
+        return raw, None
+    
+    @staticmethod
+    def _extract_alpha_vantage_data(raw: Dict, symbol: str, position: int = 0,
+                                    reports: str = 'annualReports') -> Optional[FinancialRecord]:
+        """Record dari laporan ke-`position` (0 = terbaru) pada JSON Alpha Vantage.
+        
+        `reports` memilih 'annualReports' atau 'quarterlyReports'.
+        """
+        overview = raw['OVERVIEW']
+        balance_reports = raw['BALANCE_SHEET'].get(reports, [])
+        if position >= len(balance_reports):
+            return None
+        balance = balance_reports[position]
+        income = next((report for report in raw['INCOME_STATEMENT'].get(reports, [])
+                       if report.get('fiscalDateEnding') == balance.get('fiscalDateEnding')), {})
+        
+        def value(report, key):
+            return DataProvider.safe_float(report.get(key, 0))
+        
+        total_revenue = value(income, 'totalRevenue')
+        net_income = value(income, 'netIncome')
+        shares = value(balance, 'commonStockSharesOutstanding') or value(overview, 'SharesOutstanding')
+        total_equity = value(balance, 'totalShareholderEquity')
+        
+        financial_data = {
+            'company_name': overview.get('Name', symbol),
+            'sector': overview.get('Sector', 'N/A'),
+            'industry': overview.get('Industry', 'N/A'),
+            'country': overview.get('Country', 'N/A'),
+            'current_assets': value(balance, 'totalCurrentAssets'),
+            'current_liabilities': value(balance, 'totalCurrentLiabilities'),
+            'total_assets': value(balance, 'totalAssets'),
+            'total_liabilities': value(balance, 'totalLiabilities'),
+            'total_equity': total_equity,
+            'retained_earnings': value(balance, 'retainedEarnings'),
+            'total_revenue': total_revenue,
+            'ebit': value(income, 'ebit') or value(income, 'operatingIncome'),
+            'ebitda': value(income, 'ebitda'),
+            'net_income': net_income,
+            'profit_margin': net_income / total_revenue if total_revenue else 0.0,
+            'market_cap': value(overview, 'MarketCapitalization'),
+            'shares_outstanding': shares,
+            'book_value': total_equity / shares if shares else value(overview, 'BookValue'),
+        }
+        return FinancialRecord.from_dict(financial_data)
+    
+    @staticmethod
+    def _alpha_vantage_frame(raw: Dict, symbol: str, reports: str = 'annualReports') -> pd.DataFrame:
+        """Semua laporan Alpha Vantage sebagai frame fiscal_date × RECORD_FIELDS (urut naik)"""
+        balance_reports = raw['BALANCE_SHEET'].get(reports, [])
+        records = [DataProvider._extract_alpha_vantage_data(raw, symbol, position, reports)
+                   for position in range(len(balance_reports))]
+        frame = FinancialRecord.to_frame(records)[list(RECORD_FIELDS)]
+        frame.index = pd.DatetimeIndex(
+            pd.to_datetime([report.get('fiscalDateEnding') for report in balance_reports]),
+            name='fiscal_date'
+        )
+        return frame[frame['total_assets'] > 0].sort_index()
+    
+    @staticmethod
+    def get_history(ticker: str, source: str = 'yfinance', api_key: Optional[str] = None,
+                    refresh: bool = False, period: str = 'annual') -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """Semua periode laporan sebagai time series untuk scoring per periode.
+        
+        `period`: 'annual' (laporan tahunan dari response yang sama, tanpa fetch
+        tambahan), 'quarterly' (laporan kuartalan apa adanya) atau 'ttm'
+        (income statement dijumlah 4 kuartal, neraca posisi kuartal terakhir).
+        Hasilnya DataFrame dengan index (ticker, fiscal_date) urut naik dan kolom
+        RECORD_FIELDS. Market cap dan harga hanya diketahui untuk periode
+        laporan terbaru source, dan hanya dipasang jika baris terakhir memang
+        periode itu; periode lain bernilai 0 (validator memakai book equity).
+        """
+        if source not in DataProvider._source_limits:
+            raise ValueError(f"Source tidak dikenal: {source}")
+        if period not in HISTORY_PERIODS:
+            raise ValueError(f"Periode tidak dikenal: {period}")
+        
+        try:
+            if period == 'annual':
+                history, newest, error = DataProvider._annual_history(ticker, source, api_key, refresh)
+            else:
+                history, error = DataProvider._quarterly_history(ticker, source, api_key, refresh)
+                newest = history.index.max() if history is not None and not history.empty else None
+                if history is not None and period == 'ttm':
+                    history = trailing_twelve_months(history)
+            if error:
+                return None, error
+            latest = DataProvider._latest_quote(ticker, source, api_key)
+        except Exception as e:
+            return None, f"Error history {source}: {str(e)}"
+        
+        if history.empty:
+            return None, "Data laporan keuangan historis tidak tersedia"
+        
+        # Sisa NaN: item yang tidak dilaporkan sama sekali pada periode itu (TTM dengan
+        # kuartal bolong sudah dibuang), diisi 0 seperti history tahunan agar auto-fix validator berlaku
+        history = history.reindex(columns=list(RECORD_FIELDS)).fillna(0.0)
+        history[['market_cap', 'current_price']] = 0.0
+        # Quote hari ini tidak dicampur ke periode lama: jika periode terbaru dibuang
+        # (data tidak lengkap), semua periode memakai book equity
+        if history.index[-1] == newest:
+            for field, value in latest.items():
+                history.iloc[-1, history.columns.get_loc(field)] = value
+        history.index = pd.MultiIndex.from_product([[ticker], history.index],
+                                                   names=['ticker', 'fiscal_date'])
+        return history, None
+    
+    @staticmethod
+    def _annual_history(ticker: str, source: str, api_key: Optional[str], refresh: bool
+                        ) -> Tuple[Optional[pd.DataFrame], Optional[pd.Timestamp], Optional[str]]:
+        """(history, periode terbaru yang dilaporkan source, error)"""
+        if source == 'yfinance':
+            raw, error = DataProvider._yfinance_raw(ticker, refresh)
+            if error:
+                return None, None, error
+            statements = (raw['balance_sheet'], raw['financials'])
+            dates = [date for frame in statements if frame is not None for date in frame.columns]
+            return extract_history(*statements), DataProvider._newest_date(dates), None
+        
+        symbol = ticker.replace('.JK', '').replace('.', '-')
+        raw, error = DataProvider._fetch_alpha_vantage_raw(symbol, api_key, refresh)
+        if error:
+            return None, None, error
+        dates = [report.get('fiscalDateEnding') for function in ('BALANCE_SHEET', 'INCOME_STATEMENT')
+                 for report in raw[function].get('annualReports', [])]
+        return (DataProvider._alpha_vantage_frame(raw, symbol, 'annualReports'),
+                DataProvider._newest_date(dates), None)
+    
+    @staticmethod
+    def _newest_date(dates: Iterable) -> Optional[pd.Timestamp]:
+        dates = pd.to_datetime(pd.Index(list(dates)), errors='coerce').dropna()
+        return dates.max() if len(dates) else None
+    
+    @staticmethod
+    def _latest_quote(ticker: str, source: str, api_key: Optional[str]) -> Dict[str, float]:
+        """Market cap & harga terbaru (dari cache) untuk periode terakhir history"""
+        if source == 'yfinance':
+            raw, _ = DataProvider._yfinance_raw(ticker)
+            quote = raw['quote'] if raw else {}
+            return {'market_cap': quote.get('market_cap', 0.0),
+                    'current_price': quote.get('current_price', 0.0)}
+        
+        symbol = ticker.replace('.JK', '').replace('.', '-')
+        raw, _ = DataProvider._fetch_alpha_vantage_raw(symbol, api_key)
+        overview = raw['OVERVIEW'] if raw else {}
+        return {'market_cap': DataProvider.safe_float(overview.get('MarketCapitalization', 0)),
+                'current_price': 0.0}
+    
+    @staticmethod
+    def _quarterly_history(ticker: str, source: str, api_key: Optional[str],
+                           refresh: bool) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """Laporan kuartalan dari store inkremental (fiscal_date × field, NaN jika tidak ada).
+        
+        Store tidak kedaluwarsa dan di-pin di cache (tidak ikut eviction LRU):
+        periode tersimpan tidak pernah diunduh ulang.
+        Provider hanya dihubungi jika kuartal berikutnya sudah waktunya terbit
+        (atau refresh=True), dan hanya periode yang lebih baru yang ditambahkan.
+        """
+        cache = DataProvider.get_cache()
+        key = ticker if source == 'yfinance' else ticker.replace('.JK', '').replace('.', '-')
+        stored = cache.get(source, key, 'quarterly', ttl=math.inf)
+        
+        if stored is None or refresh or DataProvider._quarter_due(stored):
+            if source == 'yfinance':
+                fresh, error = DataProvider._call_upstream(
+                    'yfinance', 'quarterly', key, lambda: DataProvider._fetch_yfinance_quarterly(key)
+                )
+            else:
+                # JSON statement yang ada di cache dipakai untuk pengisian pertama
+                raw, error = DataProvider._fetch_alpha_vantage_raw(
+                    key, api_key, refresh=refresh or stored is not None
+                )
+                fresh = DataProvider._alpha_vantage_frame(raw, key, 'quarterlyReports') if raw else None
+            
+            if error:
+                if stored is None:
+                    return None, error
+            else:
+                history = append_new_periods(stored['history'] if stored else None, fresh)
+                stored = {'history': history, 'checked_at': time.time()}
+                cache.set(source, key, stored, 'quarterly', pinned=True)
+        
+        return stored['history'], None
+    
+    @staticmethod
+    def _quarter_due(stored: Dict) -> bool:
+        """Apakah kuartal baru mungkin sudah terbit sejak pengecekan terakhir"""
+        if time.time() - stored['checked_at'] < CACHE_TTL:
+            return False
+        if stored['history'].empty:
+            return True
+        next_due = stored['history'].index.max() + pd.Timedelta(days=QUARTER_DUE_DAYS)
+        return pd.Timestamp.now() >= next_due
+    
+    @staticmethod
+    def _fetch_yfinance_quarterly(ticker: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """Laporan kuartalan yfinance (neraca + income statement) sebagai time series"""
+        stock = _yf_ticker(ticker)
+        try:
+            balance_sheet = stock.quarterly_balance_sheet
+            financials = stock.quarterly_financials
+        except Exception as e:
+            return None, f"Error mengambil laporan kuartalan: {str(e)}"
+        
+        if balance_sheet is None or balance_sheet.empty:
+            return None, "Data laporan kuartalan tidak tersedia"
+        return extract_history(balance_sheet, financials, fill_value=None), None
+    
+    @staticmethod
+    def fetch(ticker: str, source: str = 'yfinance', api_key: Optional[str] = None,
+              refresh: bool = False) -> Tuple[Optional[FinancialRecord], Optional[str]]:
+        """Ambil satu ticker dari source ('yfinance' atau 'alpha_vantage')"""
+        if source == 'yfinance':
+            return DataProvider.get_yfinance_data(ticker, refresh=refresh)
+        if source == 'alpha_vantage':
+            return DataProvider.get_alpha_vantage_data(ticker, api_key, refresh=refresh)
+        raise ValueError(f"Source tidak dikenal: {source}")
+    
+    @staticmethod
+    def fetch_limited(ticker: str, source: str = 'yfinance', api_key: Optional[str] = None,
+                      refresh: bool = False) -> Tuple[Optional[FinancialRecord], Optional[str]]:
+        """`fetch` dalam batas SOURCE_CONCURRENCY source tersebut (bersama semua pemanggil)"""
+        if source not in DataProvider._source_limits:
+            raise ValueError(f"Source tidak dikenal: {source}")
+        with DataProvider._source_limits[source]:
+            return DataProvider.fetch(ticker, source, api_key, refresh)
+    
+    @staticmethod
+    def get_many(tickers: Iterable[str], source: str = 'yfinance', api_key: Optional[str] = None,
+                 refresh: bool = False, max_workers: int = FETCH_MAX_WORKERS
+                 ) -> Iterator[Tuple[str, Optional[FinancialRecord], Optional[str]]]:
+        """Ambil banyak ticker secara paralel, yield (ticker, data, error) saat selesai.
+        
+        Thread pool dibatasi `max_workers`, dan jumlah fetch bersamaan ke satu
+        source dibatasi SOURCE_CONCURRENCY (berlaku untuk semua pemanggil).
+        """
+        if source not in DataProvider._source_limits:
+            raise ValueError(f"Source tidak dikenal: {source}")
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return
+        
+        def fetch_one(ticker):
+            return DataProvider.fetch_limited(ticker, source, api_key, refresh)
+        
+        pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers))),
+                                  thread_name_prefix=f"fetch-{source}")
+        futures = {}
+        try:
+            futures = {pool.submit(fetch_one, ticker): ticker for ticker in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    data, error = future.result()
+                except Exception as e:
+                    data, error = None, f"Error {source}: {str(e)}"
+                yield ticker, data, error
+        finally:
+            # Konsumen berhenti lebih awal: batalkan ticker yang belum mulai
+            # (manual, `shutdown(cancel_futures=True)` baru ada di Python 3.9)
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+# ====================================================================
+# BANKRUPTCY PREDICTOR CLASS
+# ====================================================================
+class ValidatedData(NamedTuple):
+    """Snapshot data finansial yang sudah divalidasi dan di-auto-fix (read-only).
+    
+    Dibuat sekali oleh `BankruptcyPredictor.validate` lalu dipakai bersama
+    oleh semua model tanpa copy atau validasi ulang. `values` berisi satu
+    array per field di NUMERIC_FIELDS (satu elemen per perusahaan).
+    """
+    values: Mapping[str, np.ndarray]
+    errors: np.ndarray
+    index: Optional[pd.Index] = None
+    
+    @property
+    def is_valid(self) -> bool:
+        return not any(self.errors)
+    
+    @property
+    def message(self) -> str:
+        for error in self.errors:
+            if error:
+                return error
+        return "Data valid"
+    
+    def get(self, key: str, position: int = 0) -> float:
+        return float(self.values[key][position])
+
+
+class BankruptcyPredictor:
+    """Kelas untuk prediksi kebangkrutan dengan berbagai model"""
+    
+    @staticmethod
+    def _as_float_array(values) -> np.ndarray:
+        """Convert a column to float64, treating missing/invalid values as 0"""
+        arr = np.asarray(values)
+        if arr.dtype.kind in 'biuf':
+            arr = arr.astype(float)
+        else:
+            arr = np.array([DataProvider.safe_float(v, 0.0) for v in arr.ravel()], dtype=float)
+        arr[np.isnan(arr)] = 0.0
+        return arr
+    
+    @staticmethod
+    def _validate_columns(columns, n: int = 1) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Versi vektor dari validate_data: clean + auto-fix semua baris sekaligus.
+        
+        Returns (arrays, errors). Baris yang tidak valid berisi NaN di semua
+        kolom dan pesan error di `errors` (None untuk baris valid).
+        """
+        zeros = np.zeros(n)
+        d = {
+            key: BankruptcyPredictor._as_float_array(columns[key]) if key in columns else zeros.copy()
+            for key in NUMERIC_FIELDS
+        }
+        
+        ta = d['total_assets']
+        valid = np.isfinite(ta) & (ta > 0)  # TA inf membuat semua rasio 0: skor palsu
+        
+        # Auto-fix missing data (urutan sama dengan validate_data)
+        ca = np.where(d['current_assets'] <= 0, ta * 0.4, d['current_assets'])
+        cl = np.where(d['current_liabilities'] <= 0, ca * 0.5, d['current_liabilities'])
+        tl = np.where(d['total_liabilities'] <= 0, ta * 0.5, d['total_liabilities'])
+        te = np.where(d['total_equity'] <= 0, ta - tl, d['total_equity'])
+        ebit = np.where((d['ebit'] == 0) & (d['net_income'] != 0), d['net_income'] * 1.2, d['ebit'])
+        mc = np.where(d['market_cap'] <= 0, te, d['market_cap'])
+        d.update({
+            'current_assets': ca, 'current_liabilities': cl, 'total_liabilities': tl,
+            'total_equity': te, 'ebit': ebit, 'market_cap': mc
+        })
+        
+        if not valid.all():
+            for key in d:
+                d[key] = np.where(valid, d[key], np.nan)
+        
+        errors = np.where(valid, None, np.where(np.isinf(ta), "Total Assets tidak boleh tak hingga",
+                                                "Total Assets harus lebih besar dari 0"))
+        return d, errors
+    
+    @staticmethod
+    def validate(data) -> ValidatedData:
+        """Validasi sekali dan kembalikan snapshot read-only untuk semua model.
+        
+        `data` berupa dict/FinancialRecord satu perusahaan, list FinancialRecord,
+        DataFrame, atau dict kolom -> array.
+        """
+        if isinstance(data, ValidatedData):
+            return data
+        
+        index = None
+        if isinstance(data, FinancialRecord):
+            columns = {key: np.array([value]) for key, value in zip(RECORD_FIELDS, data)}
+            n = 1
+        elif isinstance(data, (list, tuple)):
+            values = np.array([record[:len(RECORD_FIELDS)] for record in data], dtype=float)
+            values = values.reshape(-1, len(RECORD_FIELDS))
+            columns = {key: values[:, i] for i, key in enumerate(RECORD_FIELDS)}
+            n = len(values)
+        elif isinstance(data, pd.DataFrame):
+            index = data.index
+            columns = {key: data[key].to_numpy() for key in NUMERIC_FIELDS if key in data.columns}
+            n = len(index)
+        else:
+            columns = {key: np.atleast_1d(data[key]) for key in NUMERIC_FIELDS if key in data}
+            n = max((len(v) for v in columns.values()), default=1)
+        
+        clean, errors = BankruptcyPredictor._validate_columns(columns, n)
+        for arr in clean.values():
+            arr.flags.writeable = False
+        errors.flags.writeable = False
+        return ValidatedData(MappingProxyType(clean), errors, index)
+    
+    @staticmethod
+    def validate_data(data: Dict) -> Tuple[bool, str]:
+        """Validasi dan clean data finansial - FIXED VERSION"""
+        try:
+            # Convert only numeric fields to float, keep non-numeric fields as they are
+            for key in NUMERIC_FIELDS:
+                if key in data:
+                    data[key] = DataProvider.safe_float(data[key], 0.0) if data[key] is not None else 0.0
+            
+            snapshot = BankruptcyPredictor.validate(data)
+            if not snapshot.is_valid:
+                return False, snapshot.message
+            
+            # Update original data with auto-fixed values
+            for key in snapshot.values:
+                value = snapshot.get(key)
+                if key in data or value != 0:
+                    data[key] = value
+            
+            return True, "Data valid"
+            
+        except Exception as e:
+            return False, f"Error validasi: {str(e)}"
+    
+    @staticmethod
+    def score_frame(data, models: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Menghitung semua model untuk banyak perusahaan sekaligus (vectorized).
+        
+        `data` berupa DataFrame, dict kolom -> array dengan kolom NUMERIC_FIELDS,
+        list FinancialRecord atau ValidatedData; `models` memilih subset key
+        MODEL_REGISTRY (default semua). Hasilnya satu baris per input dengan kolom
+        `<model>_score`, komponen (`altman_x1`, ...), `<model>_status`,
+        `<model>_risk`, `zmijewski_probability` (0-1) dan `error`.
+        """
+        snapshot = BankruptcyPredictor.validate(data)
+        valid = pd.isna(snapshot.errors)
+        out = {}
+        
+        for key, result in score_arrays(snapshot.values, models).items():
+            zones = MODEL_REGISTRY[key].zones
+            statuses = np.array([zone[0] for zone in zones], dtype=object)
+            risks = np.array([zone[1] for zone in zones], dtype=object)
+            out[f'{key}_score'] = result['score']
+            if 'probability' in result:
+                out[f'{key}_probability'] = result['probability']
+            for term in MODEL_REGISTRY[key].terms:
+                out[f'{key}_{term.component}'] = result[term.component]
+            # Skor NaN/inf tidak diberi zona (bukan zona terakhir/tersehat)
+            known = valid & (result['zone'] != INVALID_ZONE)
+            out[f'{key}_status'] = np.where(known, statuses[result['zone']], None)
+            out[f'{key}_risk'] = np.where(known, risks[result['zone']], None)
+        
+        out['error'] = snapshot.errors
+        return pd.DataFrame(out, index=snapshot.index)
+    
+    @staticmethod
+    def score(key: str, data) -> Dict:
+        """Hitung satu model dari MODEL_REGISTRY untuk satu perusahaan (dict hasil untuk UI)"""
+        model = MODEL_REGISTRY[key]
+        try:
+            snapshot = BankruptcyPredictor.validate(data)
+            if snapshot.errors[0]:
+                return {'error': snapshot.errors[0]}
+            
+            result = score_arrays(snapshot.values, [key])[key]
+            if result['zone'][0] == INVALID_ZONE:
+                return {'error': "Skor tidak dapat dihitung dari data ini (NaN/inf)"}
+            status, risk, recommendation = model.zones[int(result['zone'][0])]
+            
+            output = {'score': round(float(result['score'][0]), 3)}
+            if 'probability' in result:
+                output['probability'] = round(float(result['probability'][0]) * 100, 1)
+            output.update({'status': status, 'risk': risk, 'color': RISK_EMOJIS[risk]})
+            if recommendation:
+                output['recommendation'] = recommendation
+            output['components'] = {
+                term.label: round(float(result[term.component][0]), 3) for term in model.terms
+            }
+            output['formula'] = model.formula
+            return output
+        except Exception as e:
+            return {'error': f"Error {model.name}: {str(e)}"}
+    
+    @staticmethod
+    def altman_z_score(data) -> Dict:
+        """Menghitung Altman Z-Score"""
+        return BankruptcyPredictor.score('altman', data)
+    
+    @staticmethod
+    def springate_score(data) -> Dict:
+        """Menghitung Springate S-Score"""
+        return BankruptcyPredictor.score('springate', data)
+    
+    @staticmethod
+    def zmijewski_score(data) -> Dict:
+        """Menghitung Zmijewski X-Score"""
+        return BankruptcyPredictor.score('zmijewski', data)
+    
+    @staticmethod
+    def grover_score(data) -> Dict:
+        """Menghitung Grover G-Score"""
+        return BankruptcyPredictor.score('grover', data)
+
+# ====================================================================
+# SCREENER
+# ====================================================================
+class ScreenerJob:
+    """Screener universe di background thread.
+    
+    Ticker diambil paralel lewat DataProvider.get_many dan dinilai per batch
+    dengan score_frame; UI membaca `results()` kapan saja sehingga tabel
+    terisi bertahap tanpa menunggu ticker paling lambat.
+    """
+    
+    def __init__(self, tickers: Sequence[str], source: str = 'yfinance', api_key: Optional[str] = None,
+                 models: Sequence[str] = UI_MODELS, batch_size: int = SCREENER_BATCH_SIZE,
+                 refresh: bool = False):
+        self.tickers = list(dict.fromkeys(tickers))
+        self.source = source
+        self.api_key = api_key
+        self.refresh = refresh
+        self.models = tuple(models)
+        self.batch_size = batch_size
+        self.errors: Dict[str, str] = {}
+        self.started_at = time.perf_counter()
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._scoring = threading.Lock()  # satu batch dinilai pada satu waktu
+        self._pending = []
+        self._frames = []
+        self._results: Optional[pd.DataFrame] = None
+        self._completed = 0
+        self._finished = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='screener', daemon=True)
+    
+    def start(self) -> 'ScreenerJob':
+        self._thread.start()
+        return self
+    
+    def cancel(self) -> None:
+        self._cancelled.set()
+    
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+    
+    @property
+    def progress(self) -> Tuple[int, int]:
+        with self._lock:
+            return self._completed, len(self.tickers)
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+    
+    def _run(self) -> None:
+        fetches = DataProvider.get_many(self.tickers, self.source, self.api_key, self.refresh)
+        try:
+            for ticker, data, error in fetches:
+                with self._lock:
+                    self._completed += 1
+                    if error:
+                        self.errors[ticker] = error
+                    else:
+                        self._pending.append((ticker, data))
+                    full = len(self._pending) >= self.batch_size
+                if full:
+                    self._score_pending()
+                if self._cancelled.is_set():
+                    break
+            self._score_pending()
+        finally:
+            fetches.close()
+            self.elapsed = time.perf_counter() - self.started_at
+            self._finished.set()
+    
+    def _score_pending(self) -> None:
+        # Pemanggil results() menunggu batch yang sedang dinilai thread job
+        with self._scoring:
+            self._score_batch()
+    
+    def _score_batch(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        records = [record for _, record in batch]
+        scores = BankruptcyPredictor.score_frame(records, self.models)
+        scores.index = pd.Index([ticker for ticker, _ in batch], name='ticker')
+        scores.insert(0, 'company_name', [record.info.company_name for record in records])
+        scores.insert(1, 'market_cap', [record.market_cap for record in records])
+        scores.insert(2, 'total_assets', [record.total_assets for record in records])
+        risks = scores[[f'{key}_risk' for key in self.models]]
+        scores['high_risk_models'] = (risks == 'Tinggi').sum(axis=1)
+        with self._lock:
+            self._frames.append(scores)
+    
+    def results(self) -> pd.DataFrame:
+        """Semua hasil yang sudah masuk (ticker yang baru tiba dinilai dalam satu batch)"""
+        self._score_pending()
+        with self._lock:
+            if self._frames:
+                frames = ([self._results] if self._results is not None else []) + self._frames
+                self._results = pd.concat(frames)
+                self._frames = []
+            return self._results if self._results is not None else pd.DataFrame()
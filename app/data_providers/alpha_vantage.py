@@ -0,0 +1,237 @@
+# ====================================================================
+# 📄 app/data_providers/alpha_vantage.py
+# ====================================================================
+"""
+Client Alpha Vantage dengan rate limiter sliding window dan koneksi HTTP
+yang dipakai ulang.
+
+Free tier dibatasi per menit dan per hari per API key. Setiap request
+dicatat di log kedua window (menunggu jika salah satunya penuh), sehingga
+tidak ada rentang 60 detik / 24 jam yang melebihi budget, dan banyak ticker
+bisa diantrikan lalu dikuras pada laju maksimum yang diizinkan. Response
+rate-limit per menit ("Note"/"Information") dicoba ulang otomatis ketika
+slot berikutnya tersedia; limit harian menghentikan request sampai slot
+harian kembali tersedia. Request dari antrean bisa dibungkus upstream
+Recorder/ReplayProvider (app.data_providers.replay) untuk mode offline.
+
+`requests` baru diimpor saat client pertama dibuat.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+from app.utils.constants import (
+    ALPHA_VANTAGE_MAX_WAIT,
+    ALPHA_VANTAGE_PER_DAY,
+    ALPHA_VANTAGE_PER_MINUTE,
+    ALPHA_VANTAGE_URL,
+)
+
+if TYPE_CHECKING:
+    import requests
+
+
+class AlphaVantageError(Exception):
+    """Response error dari Alpha Vantage (symbol tidak valid, endpoint premium, dst.)"""
+
+
+class RateLimitError(AlphaVantageError):
+    """Budget request habis dan tidak akan tersedia dalam batas waktu tunggu"""
+
+
+class SlidingWindow:
+    """Log waktu request: maksimal `capacity` request dalam setiap rentang `period` detik"""
+
+    def __init__(self, capacity: int, period: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.period = period
+        self._clock = clock
+        self._log: deque = deque()
+
+    def _expire(self, now: float) -> None:
+        while self._log and self._log[0] <= now - self.period:
+            self._log.popleft()
+
+    def wait_time(self) -> float:
+        """Detik sampai satu slot tersedia"""
+        now = self._clock()
+        self._expire(now)
+        if len(self._log) < self.capacity:
+            return 0.0
+        return self._log[0] + self.period - now
+
+    def take(self) -> None:
+        self._log.append(self._clock())
+
+    def drain(self) -> None:
+        """Penuhi window (server menolak request: budget sebenarnya sudah habis)"""
+        now = self._clock()
+        self._expire(now)
+        self._log.extend([now] * (self.capacity - len(self._log)))
+
+
+class RateLimiter:
+    """Gabungan beberapa sliding window; satu request dicatat di semuanya"""
+
+    MINUTE, DAY = 0, 1  # urutan window pada AlphaVantageClient
+
+    def __init__(self, buckets: Sequence[SlidingWindow], sleep: Callable[[float], None] = time.sleep):
+        self.buckets = tuple(buckets)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        """Blok sampai slot tersedia di semua window; kembalikan total waktu tunggu"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                wait = max(bucket.wait_time() for bucket in self.buckets)
+                if wait <= 0:
+                    for bucket in self.buckets:
+                        bucket.take()
+                    return waited
+            if max_wait is not None and waited + wait > max_wait:
+                raise RateLimitError(f"Budget request habis, slot berikutnya dalam {wait:.0f} detik")
+            self._sleep(wait)
+            waited += wait
+
+    def penalize(self, bucket: int = 0) -> None:
+        with self._lock:
+            self.buckets[bucket].drain()
+
+
+class AlphaVantageClient:
+    """Client thread-safe: Session dengan connection pool + rate limiter per API key"""
+
+    def __init__(self, api_key: str, per_minute: int = ALPHA_VANTAGE_PER_MINUTE,
+                 per_day: int = ALPHA_VANTAGE_PER_DAY, max_retries: int = 3,
+                 max_wait: Optional[float] = ALPHA_VANTAGE_MAX_WAIT,
+                 session: Optional['requests.Session'] = None,
+                 limiter: Optional[RateLimiter] = None, workers: int = 4):
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.limiter = limiter or RateLimiter([
+            SlidingWindow(per_minute, 60.0),
+            SlidingWindow(per_day, 24 * 3600.0),
+        ])
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            session.mount('https://', adapter)
+        self.session = session
+        self._workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._pending: Set[Future] = set()
+
+    @staticmethod
+    def _rate_limited(data: Dict[str, Any]) -> bool:
+        if 'Note' in data:
+            return True
+        message = str(data.get('Information', '')).lower()
+        return 'rate limit' in message or 'frequency' in message or 'requests per' in message
+
+    @staticmethod
+    def _daily_limited(data: Dict[str, Any]) -> bool:
+        # Note per menit juga menyebut "500 calls per day"; limit harian hanya menyebut "per day"
+        message = str(data.get('Note') or data.get('Information', '')).lower()
+        return 'per day' in message and 'per minute' not in message
+
+    def query(self, function: str, symbol: str, **params) -> Dict[str, Any]:
+        """Panggil satu endpoint (mis. 'OVERVIEW'); retry otomatis saat kena rate limit"""
+        params = dict(params, function=function, symbol=symbol, apikey=self.api_key)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(self.max_wait)
+            response = self.session.get(ALPHA_VANTAGE_URL, params=params, timeout=30)
+            data = response.json()
+
+            if isinstance(data, dict) and self._rate_limited(data):
+                # Server sudah menghitung budget lebih banyak dari kita (mis. proses lain)
+                daily = self._daily_limited(data)
+                self.limiter.penalize(RateLimiter.DAY if daily else RateLimiter.MINUTE)
+                continue
+            if isinstance(data, dict) and 'Error Message' in data:
+                raise AlphaVantageError(data['Error Message'])
+            if isinstance(data, dict) and 'Information' in data:
+                raise AlphaVantageError(data['Information'])
+            return data
+
+        raise RateLimitError(f"Rate limit tercapai setelah {self.max_retries} kali retry")
+
+    def _call(self, upstream: Optional[Any], on_result: Optional[Callable[[Tuple[str, str], Any], None]],
+              function: str, symbol: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if upstream is None:
+            data = self.query(function, symbol, **params)
+        else:
+            # Recorder merekam response asli; ReplayProvider tidak pernah memanggil query
+            data = upstream.call('alpha_vantage', function, symbol,
+                                 lambda: self.query(function, symbol, **params))
+        if on_result is not None:
+            on_result((function, symbol), data)
+        return data
+
+    def submit(self, function: str, symbol: str, upstream: Optional[Any] = None,
+               on_result: Optional[Callable[[Tuple[str, str], Any], None]] = None, **params) -> Future:
+        """Antrikan satu request; dijalankan oleh worker sesuai budget rate limiter.
+
+        `upstream` (Recorder/ReplayProvider) membungkus request, lihat
+        `DataProvider.set_upstream`. `on_result((function, symbol), data)`
+        dipanggil di worker begitu request berhasil, sebelum future selesai,
+        juga jika pemanggil sudah tidak menunggu hasilnya.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self._workers, thread_name_prefix='alpha-vantage')
+            future = self._executor.submit(self._call, upstream, on_result, function, symbol, params)
+            self._pending.add(future)
+        # Di luar lock: callback langsung dipanggil jika future sudah selesai
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future) -> None:
+        with self._executor_lock:
+            self._pending.discard(future)
+
+    def query_many(self, requests_: Iterable[Tuple[str, str]], upstream: Optional[Any] = None,
+                   on_result: Optional[Callable[[Tuple[str, str], Any], None]] = None
+                   ) -> Iterator[Tuple[Tuple[str, str], Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Antrikan banyak (function, symbol) dan yield (request, data, error) saat selesai"""
+        futures = {self.submit(function, symbol, upstream, on_result): (function, symbol)
+                   for function, symbol in requests_}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+    def close(self) -> None:
+        """Batalkan request yang belum mulai lalu tutup pool dan session"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+            pending, self._pending = list(self._pending), set()
+        # Manual karena `shutdown(cancel_futures=True)` baru ada di Python 3.9;
+        # cancel() memanggil _forget, jadi dilakukan di luar lock
+        for future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.session.close()
+
+
+_clients: Dict[str, AlphaVantageClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str) -> AlphaVantageClient:
+    """Client bersama per API key (budget rate limit berlaku per key)"""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = AlphaVantageClient(api_key)
+        return client
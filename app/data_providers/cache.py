@@ -0,0 +1,135 @@
+# ====================================================================
+# 📄 app/data_providers/cache.py
+# ====================================================================
+"""
+Cache fundamental persisten (SQLite) untuk DataProvider.
+
+Response mentah provider (DataFrame laporan keuangan, dict info, JSON Alpha
+Vantage) disimpan per (source, ticker, period) dengan TTL dan eviction LRU
+berbasis ukuran, sehingga analisis ulang tidak perlu ke jaringan dan cache
+tetap ada setelah proses restart. Entri `pinned` (mis. store kuartalan
+inkremental) tidak pernah di-evict dan tidak dihitung dalam `max_bytes`.
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from app.utils.constants import CACHE_DIR, CACHE_MAX_BYTES, CACHE_TTL
+
+
+class FundamentalsCache:
+    """Key-value store SQLite dengan TTL dan LRU eviction (thread-safe)"""
+
+    def __init__(self, path: Union[str, Path, None] = None, ttl: float = CACHE_TTL,
+                 max_bytes: int = CACHE_MAX_BYTES):
+        self.path = Path(path) if path else Path(CACHE_DIR) / 'fundamentals.sqlite'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS fundamentals (
+                    source TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (source, ticker, period)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_fundamentals_accessed ON fundamentals (accessed_at)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(fundamentals)")}
+            if 'pinned' not in columns:  # file cache dari versi sebelumnya
+                self._conn.execute("ALTER TABLE fundamentals ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0")
+
+    def get(self, source: str, ticker: str, period: str = 'annual',
+            ttl: Optional[float] = None) -> Optional[Any]:
+        """Ambil payload jika ada dan belum kedaluwarsa, None jika tidak"""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM fundamentals WHERE source=? AND ticker=? AND period=?",
+                (source, ticker, period)
+            ).fetchone()
+            if row is None:
+                return None
+            if ttl is not None and now - row[1] > ttl:
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE fundamentals SET accessed_at=? WHERE source=? AND ticker=? AND period=?",
+                    (now, source, ticker, period)
+                )
+        return pickle.loads(row[0])
+
+    def set(self, source: str, ticker: str, payload: Any, period: str = 'annual',
+            pinned: bool = False) -> None:
+        """Simpan payload lalu evict entri paling lama tidak dipakai jika melebihi batas.
+
+        `pinned=True`: entri hanya hilang lewat `invalidate`/`clear`, tidak lewat eviction.
+        """
+        blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fundamentals "
+                "(source, ticker, period, payload, size, fetched_at, accessed_at, pinned) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, ticker, period, blob, len(blob), now, now, int(pinned))
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM fundamentals WHERE pinned = 0"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT source, ticker, period, size FROM fundamentals WHERE pinned = 0 ORDER BY accessed_at"
+        ).fetchall()
+        for source, ticker, period, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute(
+                "DELETE FROM fundamentals WHERE source=? AND ticker=? AND period=?",
+                (source, ticker, period)
+            )
+            total -= size
+
+    def invalidate(self, source: str, ticker: Optional[str] = None) -> None:
+        """Hapus cache satu ticker, atau seluruh source jika ticker None"""
+        with self._lock, self._conn:
+            if ticker is None:
+                self._conn.execute("DELETE FROM fundamentals WHERE source=?", (source,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM fundamentals WHERE source=? AND ticker=?", (source, ticker)
+                )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM fundamentals")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM fundamentals"
+            ).fetchone()
+        return {'entries': entries, 'bytes': size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,106 @@
+# ====================================================================
+# 📄 app/data_providers/coalesce.py
+# ====================================================================
+"""
+Memo in-process dengan semantik single-flight untuk fetch DataProvider.
+
+Permintaan bersamaan untuk key yang sama (mis. ('yfinance', 'BBRI.JK') dari
+beberapa sesi Streamlit) menunggu satu fetch yang sedang berjalan dan
+memakai hasilnya bersama. Hasil yang berhasil disimpan sebentar di LRU
+memori sehingga permintaan berikutnya tidak perlu ke disk cache/jaringan.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.utils.constants import MEMO_MAX_ENTRIES, MEMO_TTL
+
+
+class _Call:
+    """Fetch yang sedang berjalan; follower menunggu `done`"""
+    __slots__ = ('done', 'result', 'exception', 'refresh')
+
+    def __init__(self, refresh: bool = False):
+        self.refresh = refresh
+        self.done = threading.Event()
+        self.result = None
+        self.exception: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Koalesensi fetch per key + LRU memori dengan TTL (thread-safe)"""
+
+    def __init__(self, max_entries: int = MEMO_MAX_ENTRIES, ttl: float = MEMO_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()  # key -> (expires_at, value)
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'shared': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], refresh: bool = False,
+           cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Kembalikan fn() untuk key, memakai LRU atau fetch yang sedang berjalan.
+
+        Dengan `refresh` entri LRU diabaikan dan fetch non-refresh yang sedang
+        berjalan tidak dipakai (hasilnya bisa basi): pemanggil memulai fetch
+        sendiri yang menggantikannya, dan hasil fetch lama tidak lagi disimpan.
+        Fetch refresh yang sedang berjalan tetap dipakai bersama. Hasil hanya
+        disimpan di LRU jika `cache_if(result)` bernilai True (default: selalu).
+        """
+        with self._lock:
+            if not refresh:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry[1]
+            call = self._inflight.get(key)
+            leader = call is None or (refresh and not call.refresh)
+            if leader:
+                call = self._inflight[key] = _Call(refresh)
+                self._stats['misses'] += 1
+            else:
+                self._stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                # Digantikan fetch refresh: jangan timpa hasil yang lebih baru
+                current = self._inflight.get(key) is call
+                if current:
+                    del self._inflight[key]
+                if current and call.exception is None and (cache_if is None or cache_if(call.result)):
+                    self._store(key, call.result)
+            call.done.set()
+        return call.result
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), inflight=len(self._inflight))
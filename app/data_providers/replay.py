@@ -0,0 +1,138 @@
+# ====================================================================
+# 📄 app/data_providers/replay.py
+# ====================================================================
+"""
+Record/replay response mentah provider untuk benchmark dan test offline.
+
+Semua panggilan jaringan DataProvider lewat satu seam
+`upstream.call(source, kind, ticker, fetch)`: `DataProvider._call_upstream`
+untuk yfinance dan antrean AlphaVantageClient untuk tiap endpoint. `Recorder`
+menjalankan fetch asli lalu menyimpan hasilnya (DataFrame statement,
+dict info, JSON Alpha Vantage, termasuk exception) ke FixtureStore.
+`ReplayProvider` melayani fixture tersebut tanpa jaringan, dengan latency
+dan error rate yang bisa disuntikkan secara deterministik (seed).
+
+Mode bisa diaktifkan lewat environment: PROVIDER_MODE=record|replay,
+FIXTURE_DIR, REPLAY_LATENCY, REPLAY_JITTER, REPLAY_ERROR_RATE.
+"""
+
+import gzip
+import pickle
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from app.utils.constants import (
+    FIXTURE_DIR,
+    PROVIDER_MODE,
+    REPLAY_ERROR_RATE,
+    REPLAY_JITTER,
+    REPLAY_LATENCY,
+)
+
+
+class FixtureMissing(LookupError):
+    """Tidak ada fixture untuk (source, kind, ticker) yang diminta"""
+
+
+class InjectedError(ConnectionError):
+    """Error jaringan buatan dari ReplayProvider"""
+
+
+class Outcome(NamedTuple):
+    """Hasil satu panggilan upstream yang direkam"""
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class FixtureStore:
+    """Satu file pickle+gzip per (source, kind, ticker) di bawah `root`"""
+
+    def __init__(self, root: Union[str, Path, None] = None):
+        self.root = Path(root or FIXTURE_DIR)
+
+    def path(self, source: str, kind: str, ticker: str) -> Path:
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', ticker)
+        return self.root / source / f"{name}.{kind}.pkl.gz"
+
+    def save(self, source: str, kind: str, ticker: str, outcome: Outcome) -> None:
+        path = self.path(source, kind, ticker)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with gzip.open(tmp, 'wb') as f:
+            pickle.dump(outcome, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+    def load(self, source: str, kind: str, ticker: str) -> Outcome:
+        path = self.path(source, kind, ticker)
+        if not path.exists():
+            raise FixtureMissing(f"Fixture tidak ditemukan: {source}/{kind}/{ticker}")
+        with gzip.open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def keys(self) -> List[Tuple[str, str, str]]:
+        """(source, kind, ticker) untuk semua fixture tersimpan"""
+        keys = []
+        for path in sorted(self.root.glob('*/*.pkl.gz')):
+            ticker, kind = path.name[:-len('.pkl.gz')].rsplit('.', 1)
+            keys.append((path.parent.name, kind, ticker))
+        return keys
+
+
+class Recorder:
+    """Jalankan fetch asli dan rekam hasil/exception-nya"""
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+
+    def call(self, source: str, kind: str, ticker: str, fetch: Callable[[], Any]) -> Any:
+        try:
+            value = fetch()
+        except Exception as e:
+            self.store.save(source, kind, ticker, Outcome(error=e))
+            raise
+        self.store.save(source, kind, ticker, Outcome(value=value))
+        return value
+
+
+class ReplayProvider:
+    """Layani fixture tanpa jaringan, dengan latency dan error rate buatan"""
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: Optional[int] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._sleep = sleep
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def call(self, source: str, kind: str, ticker: str, fetch: Callable[[], Any]) -> Any:
+        # `fetch` sengaja tidak dipanggil: replay tidak pernah ke jaringan
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        if delay > 0:
+            self._sleep(delay)
+        if fail:
+            raise InjectedError(f"Injected error: {source}/{kind}/{ticker}")
+
+        outcome = self.store.load(source, kind, ticker)
+        if outcome.error is not None:
+            raise outcome.error
+        return outcome.value
+
+
+def upstream_from_env() -> Optional[Union[Recorder, ReplayProvider]]:
+    """Recorder/ReplayProvider sesuai PROVIDER_MODE, None untuk mode live"""
+    if PROVIDER_MODE == 'record':
+        return Recorder(FixtureStore())
+    if PROVIDER_MODE == 'replay':
+        return ReplayProvider(FixtureStore(), REPLAY_LATENCY, REPLAY_JITTER, REPLAY_ERROR_RATE)
+    return None
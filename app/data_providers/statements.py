@@ -0,0 +1,152 @@
+# ====================================================================
+# 📄 app/data_providers/statements.py
+# ====================================================================
+"""
+Tabel alias label laporan keuangan → field kanonik.
+
+Satu tabel dipakai oleh semua extractor (app/main.py dan app.py lama).
+Alias dikompilasi sekali menjadi daftar label berurutan, lalu semua baris
+yang dibutuhkan diambil dari DataFrame statement dengan satu `reindex`
+untuk seluruh periode. Per field dipakai alias pertama yang bernilai
+(bukan NaN dan bukan 0), dan alias yang cocok ikut dilaporkan.
+"""
+
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Field kanonik -> alias label, urut prioritas
+STATEMENT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    # Balance sheet
+    'total_assets': ('Total Assets', 'TotalAssets', 'Total assets'),
+    'current_assets': ('Current Assets', 'CurrentAssets', 'Current assets'),
+    'current_liabilities': ('Current Liabilities', 'CurrentLiabilities', 'Current liabilities'),
+    'total_liabilities': ('Total Liabilities Net Minority Interest', 'Total Liabilities', 'TotalLiabilities'),
+    'retained_earnings': ('Retained Earnings', 'RetainedEarnings', 'Retained earnings'),
+    'total_equity': ('Total Equity Gross Minority Interest', 'Stockholder Equity', 'Stockholders Equity',
+                     'Total Equity', 'TotalEquity'),
+    # Income statement
+    'total_revenue': ('Total Revenue', 'TotalRevenue', 'Revenue', 'Net Sales'),
+    'ebit': ('EBIT', 'Operating Income', 'OperatingIncome'),
+    'net_income': ('Net Income', 'NetIncome', 'Net income'),
+}
+
+BALANCE_SHEET_FIELDS = ('total_assets', 'current_assets', 'current_liabilities', 'total_liabilities',
+                        'retained_earnings', 'total_equity')
+INCOME_STATEMENT_FIELDS = ('total_revenue', 'ebit', 'net_income')
+
+# Jarak maksimum kuartal pertama-terakhir dalam satu jendela TTM (3 kuartal ≈ 273 hari)
+TTM_MAX_SPAN_DAYS = 300
+
+
+class Extraction(NamedTuple):
+    """Hasil ekstraksi: satu baris per periode (urutan kolom statement)"""
+    values: pd.DataFrame  # periode × field, NaN jika tidak ada alias bernilai
+    matched: pd.DataFrame  # periode × field, alias yang dipakai (None jika tidak ada)
+
+    def latest(self, default: float = 0.0) -> Dict[str, float]:
+        """Nilai periode pertama (terbaru untuk yfinance) sebagai dict field -> float"""
+        if self.values.empty:
+            return {field: default for field in self.values.columns}
+        return {field: float(value) if pd.notna(value) else default
+                for field, value in self.values.iloc[0].items()}
+
+
+@lru_cache(maxsize=16)
+def compile_aliases(fields: Tuple[str, ...]) -> Tuple[pd.Index, np.ndarray]:
+    """Label berurutan untuk `fields` dan offset blok alias per field"""
+    labels, offsets = [], [0]
+    for field in fields:
+        labels.extend(STATEMENT_ALIASES[field])
+        offsets.append(len(labels))
+    return pd.Index(labels), np.array(offsets)
+
+
+def extract_statement(frame: Optional[pd.DataFrame],
+                      fields: Sequence[str] = tuple(STATEMENT_ALIASES)) -> Extraction:
+    """Ambil semua field dari statement (label × periode) dengan satu reindex"""
+    fields = tuple(fields)
+    labels, offsets = compile_aliases(fields)
+    if frame is None or frame.empty:
+        empty = pd.DataFrame(columns=list(fields), dtype=float)
+        return Extraction(empty, empty.astype(object))
+
+    if not frame.index.is_unique:
+        frame = frame[~frame.index.duplicated()]
+    block = frame.reindex(labels).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    present = ~np.isnan(block) & (block != 0)
+    periods = np.arange(block.shape[1])
+
+    values = np.full((block.shape[1], len(fields)), np.nan)
+    matched = np.full((block.shape[1], len(fields)), None, dtype=object)
+    label_array = labels.to_numpy(dtype=object)
+    for j in range(len(fields)):
+        rows = slice(offsets[j], offsets[j + 1])
+        found = present[rows].any(axis=0)
+        first = present[rows].argmax(axis=0)
+        values[:, j] = np.where(found, block[rows][first, periods], np.nan)
+        matched[:, j] = np.where(found, label_array[rows][first], None)
+
+    return Extraction(
+        pd.DataFrame(values, index=frame.columns, columns=list(fields)),
+        pd.DataFrame(matched, index=frame.columns, columns=list(fields), dtype=object)
+    )
+
+
+def extract_history(balance_sheet: Optional[pd.DataFrame],
+                    financials: Optional[pd.DataFrame],
+                    fill_value: Optional[float] = 0.0) -> pd.DataFrame:
+    """Semua periode laporan sebagai time series (index `fiscal_date`, urut naik).
+
+    Balance sheet dan income statement digabung per tanggal fiskal; periode
+    tanpa Total Assets dibuang dan field yang tidak ada bernilai `fill_value`
+    (None: tetap NaN, mis. untuk kuartal yang akan dijumlah menjadi TTM).
+    """
+    balance = extract_statement(balance_sheet, BALANCE_SHEET_FIELDS).values
+    income = extract_statement(financials, INCOME_STATEMENT_FIELDS).values
+    balance.index = pd.to_datetime(balance.index)
+    income.index = pd.to_datetime(income.index)
+
+    history = balance.join(income, how='inner')
+    history = history[history['total_assets'].notna()].sort_index()
+    if fill_value is not None:
+        history = history.fillna(fill_value)
+    history.index.name = 'fiscal_date'
+    return history
+
+
+def append_new_periods(stored: Optional[pd.DataFrame], fresh: pd.DataFrame) -> pd.DataFrame:
+    """Tambahkan periode `fresh` yang lebih baru dari periode terakhir `stored`.
+
+    Periode yang sudah tersimpan tidak pernah ditimpa oleh response baru.
+    """
+    if stored is None or stored.empty:
+        return fresh.sort_index()
+    newer = fresh[fresh.index > stored.index.max()]
+    if newer.empty:
+        return stored
+    return pd.concat([stored, newer]).sort_index()
+
+
+def trailing_twelve_months(quarterly: pd.DataFrame,
+                           flows: Sequence[str] = INCOME_STATEMENT_FIELDS) -> pd.DataFrame:
+    """Seri TTM dari laporan kuartalan.
+
+    Item income statement (`flows`) dijumlah 4 kuartal berturut-turut,
+    item neraca memakai posisi kuartal terakhir. Kuartal tanpa 3 kuartal
+    sebelumnya dalam rentang ~12 bulan (data bolong) tidak dihasilkan,
+    begitu juga jendela yang item flow-nya hanya dilaporkan sebagian
+    kuartal (jumlahnya bukan 12 bulan). Item yang tidak dilaporkan sama
+    sekali dalam jendela tetap NaN.
+    """
+    quarterly = quarterly.sort_index()
+    flows = [field for field in flows if field in quarterly.columns]
+    ttm = quarterly.copy()
+    ttm[flows] = quarterly[flows].rolling(4, min_periods=4).sum()
+    reported = quarterly[flows].notna().rolling(4, min_periods=1).sum()
+    partial = ((reported > 0) & (reported < 4)).any(axis=1).to_numpy()
+    span = quarterly.index.to_series().diff(3)
+    complete = (span <= pd.Timedelta(days=TTM_MAX_SPAN_DAYS)).to_numpy() & ~partial
+    return ttm[complete]
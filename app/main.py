@@ -7,12 +7,42 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import yfinance as yf
-import requests
+from plotly.subplots import make_subplots
+import hashlib
+import json
+import math
 import time
 import warnings
 from datetime import datetime
-from typing import Dict, Tuple, Optional, Any
+from typing import Any, Dict, List, Optional, Callable, NamedTuple, Sequence, Tuple
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core import (
+    UI_MODELS,
+    BankruptcyPredictor,
+    CompanyInfo,
+    DataProvider,
+    FinancialRecord,
+    ScreenerJob,
+    ValidatedData,
+)
+from app.components.results_table import ResultsTable, show_results_table
+from app.data_providers.coalesce import SingleFlight
+from app.models.break_even import break_even
+from app.models.registry import INVALID_ZONE, MODEL_REGISTRY, score_arrays
+from app.models.sensitivity import apply_changes, scenario_error, score_gradients
+from app.models.uncertainty import ScoreDistribution, simulate_scores
+from app.utils.constants import (
+    IDX_TICKERS,
+    INPUT_ERRORS,
+    RENDER_MEMO_MAX_ENTRIES,
+    RISK_EMOJIS,
+    SCREENER_REFRESH_SECONDS,
+)
+from app.utils.tickers import parse_tickers
 
 warnings.filterwarnings('ignore')
 
@@ -138,466 +168,127 @@ POPULAR_TICKERS = [
     "ASII.JK", "GGRM.JK", "KLBF.JK", "ICBP.JK", "SMGR.JK"
 ]
 
+# Universe bawaan mode Screener
+SCREENER_UNIVERSES = {
+    "IDX (bawaan)": IDX_TICKERS,
+    "Ticker Populer": POPULAR_TICKERS,
+    "Emiten Pailit": BANKRUPT_COMPANIES
+}
+
 RISK_COLORS = {
     'Tinggi': '#e74c3c',
     'Sedang': '#f39c12',
     'Rendah': '#27ae60'
 }
 
-RISK_EMOJIS = {
-    'Tinggi': '🔴',
-    'Sedang': '🟡',
-    'Rendah': '🟢'
-}
+# Urutan zona risiko untuk heatmap perbandingan
+RISK_LEVELS = {'Rendah': 0, 'Sedang': 1, 'Tinggi': 2}
+
+# Batas jumlah emiten di mode Perbandingan
+COMPARE_MAX_TICKERS = 20
+
+# Pilihan periode tren skor (DataProvider.get_history)
+HISTORY_PERIOD_LABELS = {'annual': 'Tahunan', 'ttm': 'TTM (kuartalan)'}
 
-# Define financial field names that should be converted to float
-NUMERIC_FIELDS = {
-    'current_assets', 'current_liabilities', 'total_assets', 'total_liabilities',
-    'total_revenue', 'ebit', 'net_income', 'retained_earnings', 'market_cap',
-    'total_equity', 'current_price', 'book_value', 'shares_outstanding',
-    'ebitda', 'profit_margin'
+# Field input model yang bisa diubah di panel what-if
+WHAT_IF_FIELDS = {
+    'current_assets': 'Current Assets',
+    'current_liabilities': 'Current Liabilities',
+    'total_assets': 'Total Assets',
+    'total_liabilities': 'Total Liabilities',
+    'total_revenue': 'Total Revenue',
+    'ebit': 'EBIT',
+    'net_income': 'Net Income',
+    'retained_earnings': 'Retained Earnings',
+    'market_cap': 'Market Cap',
+    'total_equity': 'Total Equity'
 }
 
+# Penyebut rasio model: slider berhenti di WHAT_IF_MIN_DENOMINATOR_PCT, bukan -100% (bagi nol)
+WHAT_IF_DENOMINATORS = ('total_assets', 'total_liabilities', 'current_liabilities')
+WHAT_IF_MIN_DENOMINATOR_PCT = -95
+
 # ====================================================================
-# DATA PROVIDER CLASS
+# SESSION STATE
 # ====================================================================
-class DataProvider:
-    """Kelas untuk mengambil data dari berbagai sumber"""
-    
-    @staticmethod
-    def safe_float(value, default=0.0):
-        """Safely convert value to float"""
-        try:
-            if value and value != 'None' and value != '-' and str(value).strip() != '':
-                # Remove any commas or other formatting
-                clean_value = str(value).replace(',', '').replace(' ', '')
-                return float(clean_value)
-        except (ValueError, TypeError) as e:
-            print(f"Warning: Could not convert '{value}' to float: {e}")
-        return default
-    
-    @staticmethod
-    def get_yfinance_data(ticker: str) -> Tuple[Optional[Dict], Optional[str]]:
-        """Mengambil data dari Yahoo Finance"""
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            # Check if ticker is valid
-            if not info or info.get('regularMarketPrice') is None:
-                return None, f"Ticker {ticker} tidak ditemukan atau tidak valid"
-            
-            # Get financial statements
-            try:
-                financials = stock.financials
-                balance_sheet = stock.balance_sheet
-                
-                if balance_sheet.empty or financials.empty:
-                    return None, "Data laporan keuangan tidak tersedia"
-                
-            except Exception as e:
-                return None, f"Error mengambil laporan keuangan: {str(e)}"
-            
-            # Extract financial data
-            financial_data = DataProvider._extract_yfinance_data(balance_sheet, financials, info)
-            
-            if not financial_data.get('total_assets') or financial_data['total_assets'] <= 0:
-                return None, "Data total assets tidak valid atau tidak tersedia"
-            
-            return financial_data, None
-            
-        except Exception as e:
-            return None, f"Error YFinance: {str(e)}"
-    
-    @staticmethod
-    def _extract_yfinance_data(balance_sheet, financials, info):
-        """Extract dan clean data dari YFinance"""
-        financial_data = {}
-        
-        # Balance Sheet extraction dengan fallback
-        try:
-            # Total Assets
-            total_assets_keys = ['Total Assets', 'TotalAssets']
-            financial_data['total_assets'] = DataProvider._safe_extract(balance_sheet, total_assets_keys)
-            
-            # Current Assets
-            current_assets_keys = ['Current Assets', 'CurrentAssets']
-            financial_data['current_assets'] = DataProvider._safe_extract(balance_sheet, current_assets_keys)
-            
-            # Current Liabilities
-            current_liab_keys = ['Current Liabilities', 'CurrentLiabilities']
-            financial_data['current_liabilities'] = DataProvider._safe_extract(balance_sheet, current_liab_keys)
-            
-            # Total Liabilities
-            total_liab_keys = [
-                'Total Liabilities Net Minority Interest', 
-                'Total Liabilities', 
-                'TotalLiabilities'
-            ]
-            financial_data['total_liabilities'] = DataProvider._safe_extract(balance_sheet, total_liab_keys)
-            
-            # Retained Earnings
-            retained_keys = ['Retained Earnings', 'RetainedEarnings']
-            financial_data['retained_earnings'] = DataProvider._safe_extract(balance_sheet, retained_keys)
-            
-            # Total Equity
-            equity_keys = [
-                'Total Equity Gross Minority Interest',
-                'Stockholder Equity',
-                'TotalEquity'
-            ]
-            financial_data['total_equity'] = DataProvider._safe_extract(balance_sheet, equity_keys)
-            
-        except Exception as e:
-            st.warning(f"Beberapa data balance sheet tidak tersedia: {str(e)}")
-        
-        # Income Statement extraction
-        try:
-            # Revenue
-            revenue_keys = ['Total Revenue', 'Revenue', 'Net Sales']
-            financial_data['total_revenue'] = DataProvider._safe_extract(financials, revenue_keys)
-            
-            # EBIT
-            ebit_keys = ['EBIT', 'Operating Income', 'OperatingIncome']
-            financial_data['ebit'] = DataProvider._safe_extract(financials, ebit_keys)
-            
-            # Net Income
-            net_income_keys = ['Net Income', 'NetIncome']
-            financial_data['net_income'] = DataProvider._safe_extract(financials, net_income_keys)
-            
-        except Exception as e:
-            st.warning(f"Beberapa data income statement tidak tersedia: {str(e)}")
-        
-        # Company information (keep as strings)
-        financial_data['company_name'] = info.get('longName', info.get('shortName', 'Unknown'))
-        financial_data['sector'] = info.get('sector', 'N/A')
-        financial_data['industry'] = info.get('industry', 'N/A')
-        financial_data['country'] = info.get('country', 'N/A')
-        
-        # Numeric company info
-        financial_data['market_cap'] = DataProvider.safe_float(info.get('marketCap', 0))
-        financial_data['current_price'] = DataProvider.safe_float(info.get('currentPrice', 0))
-        
-        # Calculate missing values
-        if not financial_data.get('total_equity') and financial_data.get('total_assets') and financial_data.get('total_liabilities'):
-            financial_data['total_equity'] = financial_data['total_assets'] - financial_data['total_liabilities']
-        
-        # Estimate EBIT if missing
-        if not financial_data.get('ebit') and financial_data.get('net_income'):
-            financial_data['ebit'] = financial_data['net_income'] * 1.2
-        
-        return financial_data
+class AnalysisResult(NamedTuple):
+    """Skor model UI untuk satu record (dihitung sekali per input & setting Monte Carlo)"""
+    snapshot: ValidatedData
+    results: Dict[str, Dict]
+    error_models: List[str]
+    distributions: Dict[str, ScoreDistribution]
+
+
+class AnalysisState(NamedTuple):
+    """Analisis terakhir di `st.session_state['analysis']`.
     
-    @staticmethod
-    def _safe_extract(dataframe, possible_keys, default=0):
-        """Safely extract value dengan multiple possible keys"""
-        if dataframe.empty:
-            return default
-        
-        for key in possible_keys:
-            if key in dataframe.index:
-                try:
-                    value = dataframe.loc[key].iloc[0]
-                    if pd.notna(value) and value != 0:
-                        return DataProvider.safe_float(value)
-                except:
-                    continue
-        return default
+    Rerun (expander, widget sidebar, what-if) merender ulang dari state ini;
+    provider hanya dipanggil lagi untuk input baru atau refresh eksplisit.
+    `key` berisi (source, ticker, periode) atau ('manual', hash input).
+    """
+    key: Tuple
+    financial_data: FinancialRecord
+    data_source: str
+    ticker: Optional[str] = None
+    history: Optional[pd.DataFrame] = None
+    company_info: Optional[Callable[[], CompanyInfo]] = None  # metadata yang belum dimuat
+    analyses: Optional[Dict[Tuple[int, float], AnalysisResult]] = None  # (mc_draws, skala error) -> hasil
+
+
+def store_analysis(state: AnalysisState) -> AnalysisState:
+    """Simpan state di session; input yang sama memakai ulang state (dan skor) lama"""
+    current = st.session_state.get('analysis')
+    if current is not None and current.key == state.key:
+        return current
+    state = state._replace(analyses={})
+    st.session_state['analysis'] = state
+    return state
+
+def run_analysis(financial_data: FinancialRecord, mc_draws: int = 0,
+                 mc_error_scale: float = 1.0) -> AnalysisResult:
+    """Validasi sekali lalu skor semua model UI (+ simulasi Monte Carlo bila diminta)"""
+    snapshot = BankruptcyPredictor.validate(financial_data)
+    results, error_models = {}, []
+    for model_key in UI_MODELS:
+        model_name = MODEL_REGISTRY[model_key].name
+        result = BankruptcyPredictor.score(model_key, snapshot)
+        if 'error' not in result:
+            results[model_name] = result
+        else:
+            error_models.append(f"{model_name}: {result['error']}")
     
-    @staticmethod
-    def get_alpha_vantage_data(ticker: str, api_key: str) -> Tuple[Optional[Dict], Optional[str]]:
-        """Mengambil data dari Alpha Vantage API"""
-        if not api_key:
-            return None, "API Key Alpha Vantage diperlukan"
-        
-        try:
-            symbol = ticker.replace('.JK', '').replace('.', '-')
-            
-            # Rate limiting
-            time.sleep(1)
-            
-            # Get company overview
-            overview_url = f"https://www.alphavantage.co/query?function=OVERVIEW&symbol={symbol}&apikey={api_key}"
-            response = requests.get(overview_url, timeout=30)
-            data = response.json()
-            
-            if 'Error Message' in data or 'Note' in data:
-                return None, "Rate limit tercapai atau symbol tidak ditemukan"
-            
-            if not data or data == {}:
-                return None, "Data tidak ditemukan untuk symbol ini"
-            
-            # Process Alpha Vantage data
-            financial_data = {
-                'company_name': data.get('Name', symbol),
-                'sector': data.get('Sector', 'N/A'),
-                'industry': data.get('Industry', 'N/A'),
-                'market_cap': DataProvider.safe_float(data.get('MarketCapitalization', 0)),
-                'total_revenue': DataProvider.safe_float(data.get('RevenueTTM', 0)),
-                'ebitda': DataProvider.safe_float(data.get('EBITDA', 0)),
-                'profit_margin': DataProvider.safe_float(data.get('ProfitMargin', 0)),
-                'book_value': DataProvider.safe_float(data.get('BookValue', 0)),
-                'shares_outstanding': DataProvider.safe_float(data.get('SharesOutstanding', 0))
-            }
-            
-            # Calculate estimates
-            financial_data['net_income'] = financial_data['total_revenue'] * financial_data['profit_margin']
-            financial_data['ebit'] = financial_data['ebitda'] * 0.9  # Estimate
-            financial_data['total_assets'] = financial_data['market_cap'] * 1.5  # Rough estimate
-            financial_data['current_assets'] = financial_data['total_assets'] * 0.4
-            financial_data['current_liabilities'] = financial_data['total_assets'] * 0.2
-            financial_data['total_liabilities'] = financial_data['total_assets'] * 0.6
-            financial_data['total_equity'] = financial_data['total_assets'] - financial_data['total_liabilities']
-            financial_data['retained_earnings'] = financial_data['total_equity'] * 0.5
-            
-            return financial_data, None
-            
-        except Exception as e:
-            return None, f"Error Alpha Vantage: {str(e)}"
+    distributions = {}
+    if results and mc_draws:
+        distributions = simulate_scores(
+            snapshot.values, mc_draws, INPUT_ERRORS, mc_error_scale, models=UI_MODELS
+        )
+    return AnalysisResult(snapshot, results, error_models, distributions)
 
 # ====================================================================
-# BANKRUPTCY PREDICTOR CLASS
+# RENDER MEMO
 # ====================================================================
-class BankruptcyPredictor:
-    """Kelas untuk prediksi kebangkrutan dengan berbagai model"""
-    
-    @staticmethod
-    def validate_data(data: Dict) -> Tuple[bool, str]:
-        """Validasi dan clean data finansial - FIXED VERSION"""
-        try:
-            # Make a copy to avoid modifying original data
-            clean_data = data.copy()
-            
-            # Convert only numeric fields to float
-            for key, value in clean_data.items():
-                if key in NUMERIC_FIELDS:
-                    if value is None:
-                        clean_data[key] = 0.0
-                    else:
-                        clean_data[key] = DataProvider.safe_float(value, 0.0)
-                # Keep non-numeric fields as they are
-            
-            # Update original data with cleaned numeric values
-            for key in NUMERIC_FIELDS:
-                if key in clean_data:
-                    data[key] = clean_data[key]
-            
-            # Minimum requirements
-            if data.get('total_assets', 0) <= 0:
-                return False, "Total Assets harus lebih besar dari 0"
-            
-            # Auto-fix missing data
-            if data.get('current_assets', 0) <= 0:
-                data['current_assets'] = data['total_assets'] * 0.4
-            
-            if data.get('current_liabilities', 0) <= 0:
-                data['current_liabilities'] = data['current_assets'] * 0.5
-            
-            if data.get('total_liabilities', 0) <= 0:
-                data['total_liabilities'] = data['total_assets'] * 0.5
-            
-            if data.get('total_equity', 0) <= 0:
-                data['total_equity'] = data['total_assets'] - data['total_liabilities']
-            
-            if data.get('ebit', 0) == 0 and data.get('net_income', 0) != 0:
-                data['ebit'] = data['net_income'] * 1.2
-            
-            if data.get('market_cap', 0) <= 0:
-                data['market_cap'] = data.get('total_equity', data['total_assets'] * 0.4)
-            
-            return True, "Data valid"
-            
-        except Exception as e:
-            return False, f"Error validasi: {str(e)}"
-    
-    @staticmethod
-    def altman_z_score(data: Dict) -> Dict:
-        """Menghitung Altman Z-Score"""
-        try:
-            # Create a copy for validation
-            data_copy = data.copy()
-            is_valid, message = BankruptcyPredictor.validate_data(data_copy)
-            if not is_valid:
-                return {'error': message}
-            
-            # Use validated data
-            data = data_copy
-            
-            # Components
-            x1 = (data['current_assets'] - data['current_liabilities']) / data['total_assets']
-            x2 = data.get('retained_earnings', 0) / data['total_assets']
-            x3 = data.get('ebit', 0) / data['total_assets']
-            x4 = data.get('market_cap', 0) / max(data.get('total_liabilities', 1), 1)
-            x5 = data.get('total_revenue', 0) / data['total_assets']
-            
-            # Z-Score calculation
-            z_score = 1.2*x1 + 1.4*x2 + 3.3*x3 + 0.6*x4 + 1.0*x5
-            
-            # Interpretation
-            if z_score < 1.8:
-                status, risk, color = "Distress Zone", "Tinggi", "🔴"
-                recommendation = "Hindari investasi - Risiko kebangkrutan tinggi"
-            elif z_score < 3.0:
-                status, risk, color = "Gray Zone", "Sedang", "🟡"
-                recommendation = "Hati-hati - Perlu analisis lebih dalam"
-            else:
-                status, risk, color = "Safe Zone", "Rendah", "🟢"
-                recommendation = "Relatif aman - Kondisi keuangan baik"
-            
-            return {
-                'score': round(z_score, 3),
-                'status': status,
-                'risk': risk,
-                'color': color,
-                'recommendation': recommendation,
-                'components': {
-                    'X1 (Working Capital/TA)': round(x1, 3),
-                    'X2 (Retained Earnings/TA)': round(x2, 3),
-                    'X3 (EBIT/TA)': round(x3, 3),
-                    'X4 (Market Cap/TL)': round(x4, 3),
-                    'X5 (Sales/TA)': round(x5, 3)
-                },
-                'formula': 'Z = 1.2×X1 + 1.4×X2 + 3.3×X3 + 0.6×X4 + 1.0×X5'
-            }
-        except Exception as e:
-            return {'error': f"Error Altman: {str(e)}"}
-    
-    @staticmethod
-    def springate_score(data: Dict) -> Dict:
-        """Menghitung Springate S-Score"""
-        try:
-            data_copy = data.copy()
-            is_valid, message = BankruptcyPredictor.validate_data(data_copy)
-            if not is_valid:
-                return {'error': message}
-            
-            data = data_copy
-            
-            # Components
-            a = (data['current_assets'] - data['current_liabilities']) / data['total_assets']
-            b = data.get('ebit', 0) / data['total_assets']
-            c = data.get('ebit', 0) / max(data['current_liabilities'], 1)
-            d = data.get('total_revenue', 0) / data['total_assets']
-            
-            # S-Score calculation
-            s_score = 1.03*a + 3.07*b + 0.66*c + 0.4*d
-            
-            # Interpretation
-            if s_score < 0.862:
-                status, risk, color = "Bankrupt", "Tinggi", "🔴"
-                recommendation = "Potensi kebangkrutan tinggi"
-            else:
-                status, risk, color = "Healthy", "Rendah", "🟢"
-                recommendation = "Kondisi finansial sehat"
-            
-            return {
-                'score': round(s_score, 3),
-                'status': status,
-                'risk': risk,
-                'color': color,
-                'recommendation': recommendation,
-                'components': {
-                    'A (WC/TA)': round(a, 3),
-                    'B (EBIT/TA)': round(b, 3),
-                    'C (EBIT/CL)': round(c, 3),
-                    'D (Sales/TA)': round(d, 3)
-                },
-                'formula': 'S = 1.03×A + 3.07×B + 0.66×C + 0.4×D'
-            }
-        except Exception as e:
-            return {'error': f"Error Springate: {str(e)}"}
-    
-    @staticmethod
-    def zmijewski_score(data: Dict) -> Dict:
-        """Menghitung Zmijewski X-Score"""
-        try:
-            data_copy = data.copy()
-            is_valid, message = BankruptcyPredictor.validate_data(data_copy)
-            if not is_valid:
-                return {'error': message}
-            
-            data = data_copy
-            
-            # Components
-            x1 = data.get('net_income', 0) / data['total_assets']
-            x2 = data.get('total_liabilities', 0) / data['total_assets']
-            x3 = data['current_assets'] / max(data['current_liabilities'], 1)
-            
-            # X-Score calculation
-            x_score = -4.3 - 4.5*x1 + 5.7*x2 - 0.004*x3
-            
-            # Prevent overflow
-            x_score = max(min(x_score, 50), -50)
-            probability = np.exp(x_score) / (1 + np.exp(x_score))
-            
-            # Interpretation
-            if probability > 0.5:
-                status, risk, color = "Financial Distress", "Tinggi", "🔴"
-                recommendation = "Probabilitas kebangkrutan tinggi"
-            else:
-                status, risk, color = "Healthy", "Rendah", "🟢"
-                recommendation = "Probabilitas kebangkrutan rendah"
-            
-            return {
-                'score': round(x_score, 3),
-                'probability': round(probability * 100, 1),
-                'status': status,
-                'risk': risk,
-                'color': color,
-                'recommendation': recommendation,
-                'components': {
-                    'X1 (NI/TA)': round(x1, 3),
-                    'X2 (TL/TA)': round(x2, 3),
-                    'X3 (CA/CL)': round(x3, 3)
-                },
-                'formula': 'X = -4.3 - 4.5×X1 + 5.7×X2 - 0.004×X3'
-            }
-        except Exception as e:
-            return {'error': f"Error Zmijewski: {str(e)}"}
-    
-    @staticmethod
-    def grover_score(data: Dict) -> Dict:
-        """Menghitung Grover G-Score"""
-        try:
-            data_copy = data.copy()
-            is_valid, message = BankruptcyPredictor.validate_data(data_copy)
-            if not is_valid:
-                return {'error': message}
-            
-            data = data_copy
-            
-            # Components
-            x1 = (data['current_assets'] - data['current_liabilities']) / data['total_assets']
-            x2 = data.get('ebit', 0) / data['total_assets']
-            x3 = data.get('net_income', 0) / data['total_assets']
-            debt_ratio = data.get('total_liabilities', 0) / data['total_assets']
-            
-            # G-Score calculation
-            g_score = 1.65*x1 + 3.404*x2 - 0.016*debt_ratio + 0.057
-            
-            # Interpretation
-            if g_score <= -0.02:
-                status, risk, color = "Bankrupt", "Tinggi", "🔴"
-            elif g_score <= 0.01:
-                status, risk, color = "Gray Zone", "Sedang", "🟡"
-            else:
-                status, risk, color = "Healthy", "Rendah", "🟢"
-            
-            return {
-                'score': round(g_score, 3),
-                'status': status,
-                'risk': risk,
-                'color': color,
-                'components': {
-                    'X1 (WC/TA)': round(x1, 3),
-                    'X2 (EBIT/TA)': round(x2, 3),
-                    'X3 (NI/TA)': round(x3, 3),
-                    'Debt Ratio': round(debt_ratio, 3)
-                },
-                'formula': 'G = 1.65×X1 + 3.404×X2 - 0.016×DebtRatio + 0.057'
-            }
-        except Exception as e:
-            return {'error': f"Error Grover: {str(e)}"}
+# Figure & fragmen HTML per hash konten hasil, dipakai bersama semua sesi (LRU terbatas)
+_render_memo = SingleFlight(max_entries=RENDER_MEMO_MAX_ENTRIES, ttl=math.inf)
+
+def content_hash(*parts) -> str:
+    """Hash stabil isi hasil: dict/list/angka/str, DataFrame atau array numpy"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            digest.update(repr(list(part.columns)).encode())
+        elif isinstance(part, np.ndarray):
+            # Byte sama dengan shape/dtype berbeda adalah konten berbeda
+            digest.update(f"{part.shape}{part.dtype.str}".encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b'|')
+    return digest.hexdigest()
+
+def memoized_render(kind: str, build: Callable[[], Any], *parts) -> Any:
+    """Hasil `build()` untuk konten `parts` yang sama dibangun sekali"""
+    return _render_memo.do((kind, content_hash(*parts)), build)
 
 # ====================================================================
 # UTILITY FUNCTIONS
@@ -618,30 +309,30 @@ def format_currency(amount, currency="Rp"):
     else:
         return f"{currency} {amount:,.0f}"
 
-def display_company_info(financial_data: Dict, ticker: str = None, data_source: str = None):
+def display_company_info(financial_data: FinancialRecord, ticker: str = None, data_source: str = None):
     """Display company information in a nice layout"""
-    st.subheader(f"🏢 {financial_data.get('company_name', 'Unknown Company')}")
+    st.subheader(f"🏢 {financial_data.info.company_name}")
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("💼 Sektor", financial_data.get('sector', 'N/A'))
+        st.metric("💼 Sektor", financial_data.info.sector)
         if ticker:
             st.metric("📊 Ticker", ticker)
     
     with col2:
-        market_cap = financial_data.get('market_cap', 0)
+        market_cap = financial_data.market_cap
         st.metric("💰 Market Cap", format_currency(market_cap))
         
-        current_price = financial_data.get('current_price', 0)
+        current_price = financial_data.current_price
         if current_price > 0:
             st.metric("💹 Harga Saham", format_currency(current_price))
     
     with col3:
-        total_assets = financial_data.get('total_assets', 0)
+        total_assets = financial_data.total_assets
         st.metric("🏛️ Total Assets", format_currency(total_assets))
         
-        industry = financial_data.get('industry', 'N/A')
+        industry = financial_data.info.industry
         if len(industry) > 20:
             industry = industry[:20] + "..."
         st.metric("🏭 Industri", industry)
@@ -651,17 +342,34 @@ def display_company_info(financial_data: Dict, ticker: str = None, data_source:
             st.metric("📡 Data Source", data_source.split(" ")[0])
         
         # Calculate and display current ratio
-        current_assets = financial_data.get('current_assets', 0)
-        current_liabilities = financial_data.get('current_liabilities', 1)
+        current_assets = financial_data.current_assets
+        current_liabilities = financial_data.current_liabilities
         current_ratio = current_assets / max(current_liabilities, 1)
         st.metric("📈 Current Ratio", f"{current_ratio:.2f}")
 
-def display_model_result(model_name: str, result: Dict, col):
+def display_model_result(model_name: str, result: Dict, col,
+                         distribution: Optional[ScoreDistribution] = None, model_key: str = None):
     """Display individual model result"""
     with col:
-        risk_class = f"risk-{result['risk'].lower()}"
+        card = memoized_render('model_card', lambda: model_card_html(model_name, result), model_name, result)
+        st.markdown(card, unsafe_allow_html=True)
         
-        st.markdown(f"""
+        if 'probability' in result:
+            st.caption(f"Probabilitas: {result['probability']}%")
+        
+        if distribution is not None:
+            show_score_distribution(MODEL_REGISTRY[model_key], distribution)
+        
+        # Component details
+        with st.expander("📋 Detail Komponen"):
+            st.code(result.get('formula', ''))
+            for comp, value in result['components'].items():
+                st.text(f"{comp}: {value}")
+
+def model_card_html(model_name: str, result: Dict) -> str:
+    """Kartu HTML hasil satu model"""
+    risk_class = f"risk-{result['risk'].lower()}"
+    return f"""
         <div class="metric-card {risk_class}">
             <h4>{result['color']} {model_name}</h4>
             <h2 style="margin: 0.5rem 0;">{result['score']}</h2>
@@ -671,16 +379,49 @@ def display_model_result(model_name: str, result: Dict, col):
                 {result.get('recommendation', '')}
             </p>
         </div>
-        """, unsafe_allow_html=True)
-        
-        if 'probability' in result:
-            st.caption(f"Probabilitas: {result['probability']}%")
-        
-        # Component details
-        with st.expander("📋 Detail Komponen"):
-            st.code(result.get('formula', ''))
-            for comp, value in result['components'].items():
-                st.text(f"{comp}: {value}")
+        """
+
+def show_score_distribution(model, distribution: ScoreDistribution):
+    """Tampilkan pita ketidakpastian dan probabilitas zona hasil Monte Carlo"""
+    q = distribution.quantiles
+    st.caption(f"🎲 Rentang 90%: {q[0.05]:.3f} – {q[0.95]:.3f} (median {q[0.5]:.3f})")
+    st.caption(" · ".join(
+        f"{RISK_EMOJIS[risk]} {status}: {prob:.0%}"
+        for (status, risk, _), prob in zip(model.zones, distribution.zone_probabilities)
+    ))
+    
+    with st.expander("🎲 Distribusi Skor"):
+        fig = memoized_render('distribution_chart', lambda: create_distribution_chart(model, distribution),
+                              model.key, distribution.scores)
+        st.plotly_chart(fig, use_container_width=True)
+        if distribution.valid_fraction < 1:
+            st.caption(f"{1 - distribution.valid_fraction:.1%} draw diabaikan (Total Assets ≤ 0)")
+
+def create_distribution_chart(model, distribution: ScoreDistribution) -> go.Figure:
+    """Histogram skor simulasi; bin dihitung di server agar payload kecil"""
+    scores = distribution.scores[~np.isnan(distribution.scores)]
+    low, high = np.percentile(scores, [0.5, 99.5]) if len(scores) else (0.0, 1.0)
+    counts, edges = np.histogram(scores, bins=40, range=(low, high))
+    centers = (edges[:-1] + edges[1:]) / 2
+    
+    # Warna bin sesuai zona risiko (Zmijewski: zona berdasarkan probabilitas)
+    zone_values = 1 / (1 + np.exp(-centers)) if model.link == 'logistic' else centers
+    zones = np.searchsorted(np.asarray(model.cuts), zone_values, side=model.side)
+    colors = [RISK_COLORS[model.zones[zone][1]] for zone in zones]
+    
+    fig = go.Figure(data=[go.Bar(x=centers, y=counts / max(len(scores), 1), marker_color=colors)])
+    fig.update_layout(
+        xaxis_title="Score",
+        yaxis_title="Frekuensi",
+        yaxis_tickformat='.0%',
+        bargap=0,
+        height=250,
+        margin=dict(l=10, r=10, t=10, b=10),
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
 
 def create_risk_chart(results: Dict) -> go.Figure:
     """Create risk assessment chart"""
@@ -718,6 +459,158 @@ def create_risk_chart(results: Dict) -> go.Figure:
     
     return fig
 
+def create_trajectory_chart(scores: pd.DataFrame, models: Sequence[str] = UI_MODELS) -> go.Figure:
+    """Skor tiap model per periode fiskal dengan garis threshold zona"""
+    years = scores.index.get_level_values('fiscal_date')
+    n_rows = (len(models) + 1) // 2
+    fig = make_subplots(rows=n_rows, cols=2, subplot_titles=[MODEL_REGISTRY[key].name for key in models])
+    
+    for i, key in enumerate(models):
+        model = MODEL_REGISTRY[key]
+        row, col = i // 2 + 1, i % 2 + 1
+        logistic = model.link == 'logistic'
+        values = scores[f'{key}_probability'] * 100 if logistic else scores[f'{key}_score']
+        colors = [RISK_COLORS.get(risk, '#95a5a6') for risk in scores[f'{key}_risk']]
+        fig.add_trace(go.Scatter(
+            x=years, y=values, mode='lines+markers',
+            line=dict(color='#7f8c8d'), marker=dict(color=colors, size=11),
+            customdata=scores[f'{key}_status'],
+            hovertemplate='%{x|%b %Y}: %{y:.3f}<br>%{customdata}<extra></extra>',
+            showlegend=False
+        ), row=row, col=col)
+        for cut in model.cuts:
+            fig.add_hline(y=cut * 100 if logistic else cut, line_dash='dash', line_color='#95a5a6',
+                          row=row, col=col)
+        if logistic:
+            fig.update_yaxes(title_text='Probabilitas (%)', row=row, col=col)
+    
+    fig.update_layout(
+        height=320 * n_rows,
+        margin=dict(t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def show_trajectory(history: pd.DataFrame, models: Sequence[str] = UI_MODELS):
+    """Tren skor per periode: semua periode dinilai dalam satu batch"""
+    trajectory = memoized_render('trajectory', lambda: build_trajectory(history, models), history, list(models))
+    if trajectory is None:
+        return
+    
+    fig, table = trajectory
+    st.subheader("📅 Tren Skor per Periode")
+    st.caption("Market cap hanya tersedia untuk periode terbaru; periode sebelumnya memakai book equity.")
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(table, use_container_width=True)
+
+def build_trajectory(history: pd.DataFrame, models: Sequence[str] = UI_MODELS
+                     ) -> Optional[Tuple[go.Figure, pd.DataFrame]]:
+    """Figure dan tabel tren skor (None jika kurang dari 2 periode valid)"""
+    scores = BankruptcyPredictor.score_frame(history, models)
+    scores = scores[scores['error'].isna()]
+    if len(scores) < 2:
+        return None
+    
+    table = pd.DataFrame({
+        MODEL_REGISTRY[key].name: [
+            f"{RISK_EMOJIS.get(risk, '')} {score:.3f} ({status})"
+            for score, status, risk in zip(scores[f'{key}_score'], scores[f'{key}_status'],
+                                           scores[f'{key}_risk'])
+        ]
+        for key in models
+    }, index=scores.index.get_level_values('fiscal_date').strftime('%Y-%m-%d'))
+    table.index.name = 'Periode Fiskal'
+    return create_trajectory_chart(scores, models), table
+
+@st.fragment
+def show_what_if_panel(snapshot: ValidatedData):
+    """Panel what-if: slider per field, skor & sensitivitas dihitung ulang instan"""
+    st.subheader("🔧 Simulasi What-If")
+    st.caption("Geser slider untuk mengubah input (%), semua model dihitung ulang tanpa mengambil data lagi.")
+    
+    changes = {}
+    cols = st.columns(3)
+    for i, (field, label) in enumerate(WHAT_IF_FIELDS.items()):
+        with cols[i % 3]:
+            low = WHAT_IF_MIN_DENOMINATOR_PCT if field in WHAT_IF_DENOMINATORS else -100
+            pct = st.slider(label, low, 200, 0, step=5, format="%d%%", key=f"what_if_{field}")
+            changes[field] = pct / 100
+            st.caption(format_currency(snapshot.get(field) * (1 + changes[field])))
+    
+    start = time.perf_counter()
+    # Tanpa auto-fix ulang: nilai skenario sama dengan caption "nilai baru" tiap slider
+    scenario = apply_changes(snapshot.values, changes)
+    error = scenario_error(scenario)
+    if error:
+        st.error(f"❌ Skenario tidak valid: {error}")
+        return
+    base_results = score_arrays(snapshot.values)
+    scenario_results = score_arrays(scenario)
+    gradients = score_gradients(scenario)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    rows = []
+    for key, model in MODEL_REGISTRY.items():
+        base_score = float(base_results[key]['score'][0])
+        new_score = float(scenario_results[key]['score'][0])
+        zone = int(scenario_results[key]['zone'][0])
+        if zone == INVALID_ZONE:
+            label = "⚪ Data tidak valid"
+        else:
+            status, risk, _ = model.zones[zone]
+            label = f"{RISK_EMOJIS[risk]} {status}"
+        rows.append({
+            'Model': model.name,
+            'Skor Awal': round(base_score, 3),
+            'Skor Skenario': round(new_score, 3),
+            'Perubahan': round(new_score - base_score, 3),
+            'Zona Skenario': label
+        })
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    
+    # Sensitivitas: turunan parsial analitik × nilai field / 100 = Δskor per +1% field
+    fields = [field for field in gradients.fields if field in WHAT_IF_FIELDS]
+    sensitivity = pd.DataFrame(
+        {
+            WHAT_IF_FIELDS[field]: [
+                gradients.score[key][0, gradients.fields.index(field)] * scenario[field][0] / 100
+                for key in MODEL_REGISTRY
+            ]
+            for field in fields
+        },
+        index=[model.name for model in MODEL_REGISTRY.values()]
+    )
+    with st.expander("📐 Sensitivitas (Δ skor per +1% input)"):
+        st.dataframe(sensitivity.style.format("{:+.4f}"), use_container_width=True)
+    
+    st.caption(f"⚡ Dihitung dalam {elapsed:.1f} ms")
+
+def show_break_even_table(snapshot: ValidatedData, models: Sequence[str] = UI_MODELS):
+    """Tabel jarak ke threshold: nilai field saat model berpindah zona"""
+    table = break_even(snapshot.values, models)
+    table = table[table['position'] == 0].dropna(subset=['break_even'])
+    
+    with st.expander("🎯 Jarak ke Threshold (Break-even)"):
+        if table.empty:
+            st.info("Tidak ada titik break-even yang dapat dihitung")
+            return
+        
+        st.caption("Nilai tiap input (input lain tetap) ketika model berpindah zona.")
+        table = table.assign(abs_pct=table['change_pct'].abs()).sort_values(['model', 'boundary', 'abs_pct'])
+        st.dataframe(
+            pd.DataFrame({
+                'Model': [MODEL_REGISTRY[key].name for key in table['model']],
+                'Batas Zona': table['boundary'].values,
+                'Input': [WHAT_IF_FIELDS.get(field, field) for field in table['field']],
+                'Nilai Saat Ini': [format_currency(value) for value in table['current']],
+                'Nilai Break-even': [format_currency(value) for value in table['break_even']],
+                'Perubahan (%)': table['change_pct'].round(1).values
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+
 def show_overall_assessment(risk_counts: pd.Series):
     """Show overall risk assessment and recommendations"""
     st.subheader("🎯 Kesimpulan & Rekomendasi")
@@ -834,6 +727,200 @@ def show_welcome_screen():
         - 🎯 Data finansial yang lebih lengkap dan akurat
         """)
 
+def create_screener_chart(results: pd.DataFrame, models: Sequence[str] = UI_MODELS) -> go.Figure:
+    """Jumlah emiten per zona risiko untuk tiap model"""
+    names = [MODEL_REGISTRY[key].name for key in models]
+    fig = go.Figure()
+    for risk in ('Rendah', 'Sedang', 'Tinggi'):
+        counts = [int((results[f'{key}_risk'] == risk).sum()) for key in models]
+        fig.add_trace(go.Bar(name=f"{RISK_EMOJIS[risk]} {risk}", x=names, y=counts,
+                             marker_color=RISK_COLORS[risk]))
+    fig.update_layout(
+        barmode='stack',
+        height=380,
+        yaxis_title="Jumlah Emiten",
+        legend=dict(orientation='h', y=1.1),
+        margin=dict(t=40, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def screener_table(results: pd.DataFrame, models: Sequence[str] = UI_MODELS) -> pd.DataFrame:
+    """Tabel tampilan screener: satu baris per ticker, skor & status per model"""
+    table = pd.DataFrame({
+        'Perusahaan': results['company_name'],
+        'Model Risiko Tinggi': results['high_risk_models'],
+        'Market Cap': results['market_cap'],
+    }, index=results.index)
+    for key in models:
+        name = MODEL_REGISTRY[key].name
+        table[name] = results[f'{key}_score'].round(3)
+        table[f'{name} Status'] = [
+            f"{RISK_EMOJIS.get(risk, '')} {status}" for status, risk in
+            zip(results[f'{key}_status'], results[f'{key}_risk'])
+        ]
+    table.index.name = 'Ticker'
+    return table
+
+def show_screener_results(job: ScreenerJob):
+    """Progress, ringkasan dan tabel hasil screener (bisa dipanggil berulang saat berjalan)"""
+    done, total = job.progress
+    results = job.results()
+    
+    st.progress(done / total if total else 1.0, text=f"📡 {done}/{total} ticker selesai")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("✅ Berhasil", len(results))
+    col2.metric("❌ Gagal", len(job.errors))
+    high_risk = int((results['high_risk_models'] >= 2).sum()) if not results.empty else 0
+    col3.metric("🔴 ≥2 Model Risiko Tinggi", high_risk)
+    if job.finished:
+        col4.metric("⏱️ Waktu", f"{job.elapsed:.1f} detik")
+    
+    if not results.empty:
+        st.plotly_chart(create_screener_chart(results, job.models), use_container_width=True)
+        
+        # Sort/filter/paginasi di server: browser hanya menerima halaman aktif.
+        # Index sort tersimpan di session selama hasil tidak berubah.
+        table = st.session_state.get('screener_table')
+        if table is None or table.frame is not results:
+            table = st.session_state['screener_table'] = ResultsTable(results, search_columns=('company_name',))
+        labels = {
+            'high_risk_models': 'Model Risiko Tinggi',
+            'ticker': 'Ticker',
+            'company_name': 'Perusahaan',
+            'market_cap': 'Market Cap',
+            **{f'{key}_score': MODEL_REGISTRY[key].name for key in job.models}
+        }
+        show_results_table(
+            table, 'screener', labels,
+            format_page=lambda rows: screener_table(rows, job.models),
+            minimum_filter=('high_risk_models', "Min. model risiko tinggi", len(job.models)),
+            default_sort='high_risk_models',
+            use_container_width=True,
+            column_config={'Market Cap': st.column_config.NumberColumn(format="%.0f")}
+        )
+    
+    if job.errors:
+        with st.expander(f"⚠️ {len(job.errors)} ticker gagal diambil"):
+            st.dataframe(pd.DataFrame({'Error': job.errors}).rename_axis('Ticker'), use_container_width=True)
+
+@st.fragment(run_every=SCREENER_REFRESH_SECONDS)
+def show_screener_live():
+    """Refresh hasil screener berkala selama job berjalan; halaman tetap responsif"""
+    job = st.session_state.get('screener_job')
+    if job is None:
+        return
+    show_screener_results(job)
+    if job.finished:
+        # Render final sekali secara statis (berhenti polling)
+        st.rerun()
+
+def show_screener_page(tickers: Sequence[str], run: bool, source: str, api_key: Optional[str]):
+    """Halaman mode Screener"""
+    st.subheader("🔎 Screener Universe")
+    
+    if run and tickers:
+        previous = st.session_state.get('screener_job')
+        if previous is not None:
+            previous.cancel()
+        st.session_state['screener_job'] = ScreenerJob(tickers, source, api_key).start()
+    
+    job = st.session_state.get('screener_job')
+    if job is None:
+        st.info("👈 Pilih universe ticker di sidebar lalu klik **Jalankan Screener**.")
+        return
+    
+    if job.finished:
+        show_screener_results(job)
+    else:
+        if st.button("⏹️ Hentikan Screener"):
+            job.cancel()
+        show_screener_live()
+
+def create_comparison_heatmap(results: pd.DataFrame, models: Sequence[str] = UI_MODELS) -> go.Figure:
+    """Heatmap emiten × model: warna zona risiko (RISK_COLORS), teks skor"""
+    risks = results[[f'{key}_risk' for key in models]]
+    levels = risks.apply(lambda column: column.map(RISK_LEVELS)).to_numpy(dtype=float)
+    scores = results[[f'{key}_score' for key in models]].to_numpy(dtype=float)
+    statuses = results[[f'{key}_status' for key in models]].to_numpy(dtype=object)
+    
+    colors = [RISK_COLORS[risk] for risk in RISK_LEVELS]
+    colorscale = [[0, colors[0]], [1 / 3, colors[0]], [1 / 3, colors[1]],
+                  [2 / 3, colors[1]], [2 / 3, colors[2]], [1, colors[2]]]
+    fig = go.Figure(go.Heatmap(
+        z=levels,
+        x=[MODEL_REGISTRY[key].name for key in models],
+        y=list(results.index),
+        text=np.round(scores, 2),
+        texttemplate='%{text}',
+        customdata=statuses,
+        hovertemplate='%{y} · %{x}<br>Score: %{text}<br>%{customdata}<extra></extra>',
+        colorscale=colorscale,
+        zmin=0,
+        zmax=2,
+        showscale=False,
+        xgap=2,
+        ygap=2
+    ))
+    fig.update_layout(
+        height=120 + 34 * len(results),
+        yaxis=dict(autorange='reversed'),
+        xaxis=dict(side='top'),
+        margin=dict(l=10, r=10, t=40, b=10),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def comparison_table(results: pd.DataFrame, models: Sequence[str] = UI_MODELS) -> pd.DataFrame:
+    """Tabel perbandingan dikelompokkan menurut jumlah model berisiko tinggi"""
+    table = screener_table(results, models)
+    high = results['high_risk_models']
+    table.insert(0, 'Kelompok', np.select(
+        [high >= 2, high == 1], ["🔴 ≥2 model risiko tinggi", "🟡 1 model risiko tinggi"],
+        "🟢 Tanpa risiko tinggi"
+    ))
+    order = np.lexsort((np.arange(len(table)), -high.to_numpy()))
+    return table.iloc[order]
+
+def show_comparison_page(tickers: Sequence[str], run: bool, source: str, api_key: Optional[str],
+                         refresh: bool = False):
+    """Halaman mode Perbandingan: fetch paralel, satu batch scoring, satu heatmap"""
+    st.subheader("📊 Perbandingan Multi-Emiten")
+    
+    job = st.session_state.get('comparison')
+    stale = job is None or (job.source, job.tickers) != (source, list(tickers))
+    if run and tickers and (stale or refresh):
+        with st.spinner(f"📡 Mengambil {len(tickers)} ticker secara paralel..."):
+            # batch_size = jumlah ticker: semua emiten dinilai dengan satu score_frame
+            job = ScreenerJob(tickers, source, api_key, batch_size=len(tickers), refresh=refresh).start()
+            job.wait()
+        st.session_state['comparison'] = job
+    
+    if job is None:
+        st.info("👈 Pilih 2–20 ticker di sidebar lalu klik **Bandingkan**.")
+        return
+    
+    results = job.results()
+    if not results.empty:
+        # Urutan baris mengikuti urutan pilihan user
+        results = results.reindex([ticker for ticker in job.tickers if ticker in results.index])
+        col1, col2, col3 = st.columns(3)
+        col1.metric("🏢 Emiten", len(results))
+        col2.metric("🔴 ≥2 Model Risiko Tinggi", int((results['high_risk_models'] >= 2).sum()))
+        col3.metric("⏱️ Waktu", f"{job.elapsed:.1f} detik")
+        
+        fig = memoized_render('comparison_heatmap', lambda: create_comparison_heatmap(results, job.models),
+                              results, list(job.models))
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(comparison_table(results, job.models), use_container_width=True,
+                     column_config={'Market Cap': st.column_config.NumberColumn(format="%.0f")})
+    
+    if job.errors:
+        with st.expander(f"⚠️ {len(job.errors)} ticker gagal diambil"):
+            st.dataframe(pd.DataFrame({'Error': job.errors}).rename_axis('Ticker'), use_container_width=True)
+
 # ====================================================================
 # MAIN APPLICATION
 # ====================================================================
@@ -855,10 +942,13 @@ def main():
     with st.sidebar:
         st.header("⚙️ Konfigurasi")
         
+        mode = st.radio("🧭 Mode:", ["Analisis Tunggal", "Perbandingan", "Screener"], horizontal=True)
+        
         # Data source selection
+        sources = ["YFinance (Gratis)", "Alpha Vantage (API Key)", "Input Manual"]
         data_source = st.selectbox(
             "📊 Pilih Sumber Data:",
-            ["YFinance (Gratis)", "Alpha Vantage (API Key)", "Input Manual"],
+            sources if mode == "Analisis Tunggal" else sources[:2],
             help="YFinance: Data gratis tanpa API key\nAlpha Vantage: Perlu API key, data lebih akurat"
         )
         
@@ -877,207 +967,298 @@ def main():
             else:
                 st.warning("⚠️ API Key diperlukan untuk Alpha Vantage")
             
-            st.info("📝 **Free Tier:** 500 requests/day, 5 requests/minute")
+            st.info("📝 **Free Tier:** 500 requests/day, 5 requests/minute (3 request per ticker, lalu dari cache)")
         
-        # Input section
-        if data_source != "Input Manual":
-            st.subheader("📈 Input Ticker Saham")
+        if mode == "Screener":
+            st.subheader("🔎 Universe Screener")
+            universe = st.radio("Daftar ticker:", list(SCREENER_UNIVERSES) + ["Upload File"])
+            if universe == "Upload File":
+                uploaded = st.file_uploader(
+                    "Upload daftar ticker:", type=['csv', 'txt'],
+                    help="CSV dengan kolom 'ticker', atau teks dipisah koma/baris baru"
+                )
+                screener_tickers = parse_tickers(uploaded.getvalue()) if uploaded else []
+            else:
+                screener_tickers = SCREENER_UNIVERSES[universe]
+            st.caption(f"{len(screener_tickers)} ticker")
             
-            # Ticker suggestions
-            ticker_type = st.radio(
-                "Pilih jenis ticker:",
-                ["Ticker Populer", "Emiten Pailit", "Custom Input"],
-                help="Pilih kategori untuk suggestions atau input manual"
+            run_screener = st.button(
+                "🔎 Jalankan Screener",
+                type="primary",
+                use_container_width=True,
+                disabled=not screener_tickers or (data_source == "Alpha Vantage (API Key)" and not api_key)
+            )
+        elif mode == "Perbandingan":
+            st.subheader("📊 Emiten Pembanding")
+            compare_tickers = st.multiselect(
+                f"Pilih ticker (maks {COMPARE_MAX_TICKERS}):",
+                sorted(set(IDX_TICKERS) | set(POPULAR_TICKERS) | set(BANKRUPT_COMPANIES)),
+                default=POPULAR_TICKERS[:5],
+                max_selections=COMPARE_MAX_TICKERS
+            )
+            extra_tickers = st.text_input("Ticker tambahan:", placeholder="Contoh: GOTO.JK, BUKA.JK")
+            compare_tickers = list(dict.fromkeys(compare_tickers + parse_tickers(extra_tickers)))
+            compare_tickers = compare_tickers[:COMPARE_MAX_TICKERS]
+            st.caption(f"{len(compare_tickers)} ticker")
+            
+            compare_refresh = st.checkbox("🔄 Refresh data (abaikan cache)", key='compare_refresh')
+            run_compare = st.button(
+                "📊 Bandingkan",
+                type="primary",
+                use_container_width=True,
+                disabled=len(compare_tickers) < 2 or (data_source == "Alpha Vantage (API Key)" and not api_key)
             )
+        else:
+            # Uncertainty mode
+            mc_draws = 0
+            mc_error_scale = 1.0
+            if st.checkbox("🎲 Mode Ketidakpastian (Monte Carlo)",
+                           help="Simulasikan error input untuk melihat rentang skor dan probabilitas zona"):
+                mc_draws = st.select_slider("Jumlah simulasi:", [10000, 50000, 100000, 200000], value=100000)
+                mc_error_scale = st.slider(
+                    "Skala error input:", 0.5, 3.0, 1.0, step=0.25,
+                    help="Pengali asumsi error per field (1.0 = default)"
+                )
+        
+            # Input section
+            if data_source != "Input Manual":
+                st.subheader("📈 Input Ticker Saham")
+            
+                # Ticker suggestions
+                ticker_type = st.radio(
+                    "Pilih jenis ticker:",
+                    ["Ticker Populer", "Emiten Pailit", "Custom Input"],
+                    help="Pilih kategori untuk suggestions atau input manual"
+                )
             
-            if ticker_type == "Ticker Populer":
-                ticker_input = st.selectbox("Pilih Ticker:", [""] + POPULAR_TICKERS)
-            elif ticker_type == "Emiten Pailit":
-                ticker_input = st.selectbox("Pilih Emiten Pailit:", [""] + BANKRUPT_COMPANIES)
-            else:
-                ticker_input = st.text_input(
-                    "Custom Ticker:",
-                    value="BBRI.JK",
-                    placeholder="Contoh: BBRI.JK, TLKM.JK"
+                if ticker_type == "Ticker Populer":
+                    ticker_input = st.selectbox("Pilih Ticker:", [""] + POPULAR_TICKERS)
+                elif ticker_type == "Emiten Pailit":
+                    ticker_input = st.selectbox("Pilih Emiten Pailit:", [""] + BANKRUPT_COMPANIES)
+                else:
+                    ticker_input = st.text_input(
+                        "Custom Ticker:",
+                        value="BBRI.JK",
+                        placeholder="Contoh: BBRI.JK, TLKM.JK"
+                    )
+            
+                # Quick ticker buttons
+                st.markdown("**⚡ Quick Access:**")
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("BBRI.JK", use_container_width=True):
+                        ticker_input = "BBRI.JK"
+                        st.rerun()
+                with col2:
+                    if st.button("MYRX.JK", use_container_width=True):
+                        ticker_input = "MYRX.JK"
+                        st.rerun()
+            
+                history_period = st.radio(
+                    "📅 Periode tren skor:",
+                    list(HISTORY_PERIOD_LABELS),
+                    format_func=HISTORY_PERIOD_LABELS.get,
+                    horizontal=True,
+                    help="TTM: income statement 4 kuartal terakhir + neraca kuartal terakhir"
                 )
             
-            # Quick ticker buttons
-            st.markdown("**⚡ Quick Access:**")
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("BBRI.JK", use_container_width=True):
-                    ticker_input = "BBRI.JK"
-                    st.rerun()
-            with col2:
-                if st.button("MYRX.JK", use_container_width=True):
-                    ticker_input = "MYRX.JK"
-                    st.rerun()
+                refresh_data = st.checkbox(
+                    "🔄 Refresh data (abaikan cache)",
+                    help="Ambil ulang data dari sumber meskipun masih ada di cache lokal"
+                )
             
-            # Analysis button
-            analyze_btn = st.button(
-                "🚀 Analisis Sekarang!", 
-                type="primary", 
-                use_container_width=True,
-                disabled=not ticker_input or (data_source == "Alpha Vantage (API Key)" and not api_key)
-            )
+                # Analysis button
+                analyze_btn = st.button(
+                    "🚀 Analisis Sekarang!", 
+                    type="primary", 
+                    use_container_width=True,
+                    disabled=not ticker_input or (data_source == "Alpha Vantage (API Key)" and not api_key)
+                )
         
-        else:
-            # Manual input form
-            st.subheader("✏️ Input Data Manual")
+            else:
+                # Manual input form
+                st.subheader("✏️ Input Data Manual")
             
-            with st.form("manual_form"):
-                company_name = st.text_input("Nama Perusahaan", "PT Manual Input Tbk")
+                with st.form("manual_form"):
+                    company_name = st.text_input("Nama Perusahaan", "PT Manual Input Tbk")
                 
-                st.markdown("**📊 Data Keuangan (dalam Rupiah):**")
+                    st.markdown("**📊 Data Keuangan (dalam Rupiah):**")
                 
-                col1, col2 = st.columns(2)
-                with col1:
-                    current_assets = st.number_input(
-                        "Current Assets", 
-                        min_value=0.0, 
-                        value=0.0, 
-                        format="%.0f",
-                        help="Aset lancar perusahaan"
-                    )
-                    total_assets = st.number_input(
-                        "Total Assets", 
-                        min_value=0.0, 
-                        value=0.0, 
-                        format="%.0f",
-                        help="Total aset perusahaan"
-                    )
-                    total_revenue = st.number_input(
-                        "Total Revenue", 
-                        min_value=0.0, 
-                        value=0.0, 
-                        format="%.0f",
-                        help="Pendapatan total"
-                    )
-                    net_income = st.number_input(
-                        "Net Income", 
-                        value=0.0, 
-                        format="%.0f",
-                        help="Laba bersih (bisa negatif)"
-                    )
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        current_assets = st.number_input(
+                            "Current Assets", 
+                            min_value=0.0, 
+                            value=0.0, 
+                            format="%.0f",
+                            help="Aset lancar perusahaan"
+                        )
+                        total_assets = st.number_input(
+                            "Total Assets", 
+                            min_value=0.0, 
+                            value=0.0, 
+                            format="%.0f",
+                            help="Total aset perusahaan"
+                        )
+                        total_revenue = st.number_input(
+                            "Total Revenue", 
+                            min_value=0.0, 
+                            value=0.0, 
+                            format="%.0f",
+                            help="Pendapatan total"
+                        )
+                        net_income = st.number_input(
+                            "Net Income", 
+                            value=0.0, 
+                            format="%.0f",
+                            help="Laba bersih (bisa negatif)"
+                        )
                 
-                with col2:
-                    current_liabilities = st.number_input(
-                        "Current Liabilities", 
-                        min_value=0.0, 
-                        value=0.0, 
-                        format="%.0f",
-                        help="Utang lancar"
-                    )
-                    total_liabilities = st.number_input(
-                        "Total Liabilities", 
+                    with col2:
+                        current_liabilities = st.number_input(
+                            "Current Liabilities", 
+                            min_value=0.0, 
+                            value=0.0, 
+                            format="%.0f",
+                            help="Utang lancar"
+                        )
+                        total_liabilities = st.number_input(
+                            "Total Liabilities", 
+                            min_value=0.0, 
+                            value=0.0, 
+                            format="%.0f",
+                            help="Total utang"
+                        )
+                        ebit = st.number_input(
+                            "EBIT", 
+                            value=0.0, 
+                            format="%.0f",
+                            help="Earnings Before Interest & Tax"
+                        )
+                        retained_earnings = st.number_input(
+                            "Retained Earnings", 
+                            value=0.0, 
+                            format="%.0f",
+                            help="Laba ditahan"
+                        )
+                
+                    market_cap = st.number_input(
+                        "Market Cap", 
                         min_value=0.0, 
                         value=0.0, 
                         format="%.0f",
-                        help="Total utang"
+                        help="Nilai pasar perusahaan"
                     )
-                    ebit = st.number_input(
-                        "EBIT", 
-                        value=0.0, 
-                        format="%.0f",
-                        help="Earnings Before Interest & Tax"
-                    )
-                    retained_earnings = st.number_input(
-                        "Retained Earnings", 
-                        value=0.0, 
-                        format="%.0f",
-                        help="Laba ditahan"
-                    )
-                
-                market_cap = st.number_input(
-                    "Market Cap", 
-                    min_value=0.0, 
-                    value=0.0, 
-                    format="%.0f",
-                    help="Nilai pasar perusahaan"
-                )
                 
-                analyze_btn = st.form_submit_button(
-                    "🧮 Hitung Prediksi", 
-                    type="primary",
-                    use_container_width=True
-                )
+                    analyze_btn = st.form_submit_button(
+                        "🧮 Hitung Prediksi", 
+                        type="primary",
+                        use_container_width=True
+                    )
     
     # Main content
-    if data_source == "Input Manual" and analyze_btn:
-        if total_assets > 0:
-            manual_data = {
-                'company_name': company_name,
-                'current_assets': current_assets,
-                'current_liabilities': current_liabilities,
-                'total_assets': total_assets,
-                'total_liabilities': total_liabilities,
-                'total_revenue': total_revenue,
-                'ebit': ebit,
-                'net_income': net_income,
-                'retained_earnings': retained_earnings,
-                'market_cap': market_cap if market_cap > 0 else total_assets - total_liabilities,
-                'total_equity': total_assets - total_liabilities,
-                'sector': 'Manual Input',
-                'industry': 'Manual Input'
-            }
-            
-            process_analysis(manual_data, "Manual Input")
-        else:
-            st.error("❌ Total Assets harus lebih besar dari 0!")
+    if mode == "Screener":
+        source = 'yfinance' if "YFinance" in data_source else 'alpha_vantage'
+        show_screener_page(screener_tickers, run_screener, source, api_key)
     
-    elif data_source != "Input Manual" and analyze_btn:
-        if ticker_input:
-            # Get data based on source
-            with st.spinner(f"📡 Mengambil data dari {data_source}..."):
-                if "YFinance" in data_source:
-                    financial_data, error = DataProvider.get_yfinance_data(ticker_input)
-                elif "Alpha Vantage" in data_source:
-                    financial_data, error = DataProvider.get_alpha_vantage_data(ticker_input, api_key)
-                
-                if financial_data and not error:
-                    process_analysis(financial_data, data_source, ticker_input)
-                else:
-                    st.error(f"❌ {error}")
-                    show_troubleshooting_tips()
-        else:
-            st.error("❌ Harap masukkan ticker saham!")
+    elif mode == "Perbandingan":
+        source = 'yfinance' if "YFinance" in data_source else 'alpha_vantage'
+        show_comparison_page(compare_tickers, run_compare, source, api_key, refresh=compare_refresh)
     
     else:
-        # Welcome screen
-        show_welcome_screen()
+        if analyze_btn and data_source == "Input Manual":
+            if total_assets > 0:
+                manual_data = FinancialRecord(
+                    current_assets=current_assets,
+                    current_liabilities=current_liabilities,
+                    total_assets=total_assets,
+                    total_liabilities=total_liabilities,
+                    total_revenue=total_revenue,
+                    ebit=ebit,
+                    net_income=net_income,
+                    retained_earnings=retained_earnings,
+                    market_cap=market_cap if market_cap > 0 else total_assets - total_liabilities,
+                    total_equity=total_assets - total_liabilities,
+                    info=CompanyInfo(
+                        company_name=company_name,
+                        sector='Manual Input',
+                        industry='Manual Input'
+                    )
+                )
+                store_analysis(AnalysisState(('manual', hash(manual_data)), manual_data, "Manual Input"))
+            else:
+                st.session_state.pop('analysis', None)
+                st.error("❌ Total Assets harus lebih besar dari 0!")
+        
+        elif analyze_btn:
+            if ticker_input:
+                source = 'yfinance' if "YFinance" in data_source else 'alpha_vantage'
+                key = (source, ticker_input, history_period)
+                current = st.session_state.get('analysis')
+                
+                # Ticker yang sama tanpa refresh: pakai data & skor yang tersimpan
+                if refresh_data or current is None or current.key != key:
+                    with st.spinner(f"📡 Mengambil data dari {data_source}..."):
+                        financial_data, error = DataProvider.fetch(ticker_input, source, api_key,
+                                                                   refresh=refresh_data)
+                        if financial_data and not error:
+                            company_info = None
+                            if source == 'yfinance' and financial_data.info == CompanyInfo():
+                                company_info = lambda: DataProvider.get_company_info(ticker_input,
+                                                                                     refresh=refresh_data)
+                            history, _ = DataProvider.get_history(ticker_input, source, api_key,
+                                                                  period=history_period)
+                            st.session_state['analysis'] = AnalysisState(
+                                key, financial_data, data_source, ticker_input, history, company_info, {}
+                            )
+                        else:
+                            st.session_state.pop('analysis', None)
+                            st.error(f"❌ {error}")
+                            show_troubleshooting_tips()
+            else:
+                st.error("❌ Harap masukkan ticker saham!")
+        
+        state = st.session_state.get('analysis')
+        if state is not None:
+            process_analysis(state, mc_draws=mc_draws, mc_error_scale=mc_error_scale)
+        elif not analyze_btn:
+            # Welcome screen
+            show_welcome_screen()
 
-def process_analysis(financial_data: Dict, data_source: str, ticker: str = None):
-    """Process bankruptcy analysis and display results"""
+def process_analysis(state: AnalysisState, mc_draws: int = 0, mc_error_scale: float = 1.0):
+    """Process bankruptcy analysis and display results
+    
+    Skor diambil dari `state.analyses` bila sudah pernah dihitung untuk
+    setting Monte Carlo yang sama. Jika `state.company_info` masih ada,
+    metadata perusahaan dimuat setelah skor tampil, header diperbarui di
+    tempatnya, lalu disimpan ke session state.
+    """
+    financial_data, data_source, ticker = state.financial_data, state.data_source, state.ticker
     
     # Display company info
-    display_company_info(financial_data, ticker, data_source)
+    company_slot = st.empty()
+    with company_slot.container():
+        display_company_info(financial_data, ticker, data_source)
     
     # Perform analysis
     st.subheader("📊 Hasil Analisis Prediksi Kebangkrutan")
     
-    # Run all models
-    models = {
-        'Altman Z-Score': BankruptcyPredictor.altman_z_score,
-        'Springate S-Score': BankruptcyPredictor.springate_score,
-        'Zmijewski X-Score': BankruptcyPredictor.zmijewski_score,
-        'Grover G-Score': BankruptcyPredictor.grover_score
-    }
-    
-    results = {}
-    error_models = []
-    
-    for model_name, model_func in models.items():
-        result = model_func(financial_data.copy())
-        if 'error' not in result:
-            results[model_name] = result
-        else:
-            error_models.append(f"{model_name}: {result['error']}")
+    # Run all models (sekali per input & setting Monte Carlo)
+    models = {MODEL_REGISTRY[key].name: key for key in UI_MODELS}
+    mc_key = (mc_draws, mc_error_scale if mc_draws else 1.0)
+    analysis = state.analyses.get(mc_key)
+    if analysis is None:
+        with st.spinner(f"🎲 Mensimulasikan {mc_draws:,} skenario..." if mc_draws else "🧮 Menghitung skor..."):
+            analysis = state.analyses[mc_key] = run_analysis(financial_data, *mc_key)
+    snapshot, results, error_models, distributions = analysis
     
     if results:
         # Display model results
         cols = st.columns(2)
         for i, (model_name, result) in enumerate(results.items()):
-            display_model_result(model_name, result, cols[i % 2])
+            model_key = models[model_name]
+            display_model_result(model_name, result, cols[i % 2],
+                                 distributions.get(model_key), model_key)
         
         # Visual summary
         st.subheader("📈 Ringkasan Visual")
@@ -1096,12 +1277,22 @@ def process_analysis(financial_data: Dict, data_source: str, ticker: str = None)
             st.metric("📊 Total Model", len(results))
         
         # Risk chart
-        fig = create_risk_chart(results)
+        fig = memoized_render('risk_chart', lambda: create_risk_chart(results), results)
         st.plotly_chart(fig, use_container_width=True)
         
         # Overall assessment
         show_overall_assessment(risk_counts)
         
+        # Multi-year trajectory
+        if state.history is not None:
+            show_trajectory(state.history)
+        
+        # What-if simulation
+        show_what_if_panel(snapshot)
+        
+        # Break-even / distance to threshold
+        show_break_even_table(snapshot)
+        
         # Model explanations
         with st.expander("📚 Penjelasan Model & Threshold"):
             st.markdown("""
@@ -1137,6 +1328,16 @@ def process_analysis(financial_data: Dict, data_source: str, ticker: str = None)
             for error in error_models:
                 st.error(error)
         show_troubleshooting_tips()
+    
+    # Deferred company metadata: skor sudah tampil, header diperbarui di tempat
+    if state.company_info is not None:
+        info = state.company_info()
+        financial_data = financial_data._replace(info=info)
+        if info != state.financial_data.info:
+            with company_slot.container():
+                display_company_info(financial_data, ticker, data_source)
+        if st.session_state.get('analysis') is state:
+            st.session_state['analysis'] = state._replace(financial_data=financial_data, company_info=None)
 
 def show_troubleshooting_tips():
     """Show troubleshooting tips"""
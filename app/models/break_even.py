@@ -0,0 +1,121 @@
+# ====================================================================
+# 📄 app/models/break_even.py
+# ====================================================================
+"""
+Solver break-even: nilai sebuah field input ketika model melewati batas zona.
+
+Dengan field lain tetap, setiap model di MODEL_REGISTRY berbentuk
+S(x) = c0 + c1·x + c2/x (x di pembilang dan/atau penyebut rasio), sehingga
+titik potong dengan threshold diselesaikan secara tertutup (kuadratik).
+Model logistic memakai threshold di ruang logit: p = T ⇔ S = ln(T / (1 - T)).
+"""
+
+from typing import Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.models.registry import MODEL_REGISTRY, RATIOS, LinearModel, score_arrays
+from app.models.sensitivity import input_fields
+
+
+def field_coefficients(model: LinearModel, values: Mapping[str, np.ndarray],
+                       field: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Koefisien (c0, c1, c2) sehingga skor linear = c0 + c1·x + c2/x"""
+    n = len(values['total_assets'])
+    c0 = np.full(n, model.intercept)
+    c1 = np.zeros(n)
+    c2 = np.zeros(n)
+    for term in model.terms:
+        ratio = RATIOS[term.ratio]
+        weight = term.coefficient
+        slope = ratio.numerator.get(field, 0.0)
+        rest = sum(coef * values[name] for name, coef in ratio.numerator.items() if name != field)
+        if ratio.denominator == field:
+            c0 = c0 + weight * slope
+            c2 = c2 + weight * rest
+        else:
+            denominator = values[ratio.denominator]
+            if ratio.floor is not None:
+                denominator = np.maximum(denominator, ratio.floor)
+            c1 = c1 + weight * slope / denominator
+            c0 = c0 + weight * rest / denominator
+    return c0, c1, c2
+
+
+def solve_threshold(c0: np.ndarray, c1: np.ndarray, c2: np.ndarray, target: float,
+                    current: np.ndarray, minimum: Optional[float] = None) -> np.ndarray:
+    """Selesaikan c0 + c1·x + c2/x = target; pilih akar terdekat dengan nilai sekarang"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a, b, c = c1, c0 - target, c2
+        linear_root = np.where(a != 0, -b / a, np.nan)  # c2 == 0
+        inverse_root = np.where(b != 0, -c / b, np.nan)  # c1 == 0
+
+        disc = b * b - 4 * a * c
+        sqrt_disc = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        root1 = (-b + sqrt_disc) / (2 * a)
+        root2 = (-b - sqrt_disc) / (2 * a)
+
+    roots = np.stack([
+        np.where(c == 0, linear_root, np.where(a == 0, inverse_root, root1)),
+        np.where((c != 0) & (a != 0), root2, np.nan)
+    ])
+    if minimum is not None:
+        roots = np.where(roots >= minimum, roots, np.nan)
+    distance = np.where(np.isnan(roots), np.inf, np.abs(roots - current))
+    best = np.take_along_axis(roots, np.argmin(distance, axis=0)[None, :], axis=0)[0]
+    return best
+
+
+def break_even(values: Mapping[str, np.ndarray],
+               models: Optional[Sequence[str]] = None,
+               adjacent_only: bool = True) -> pd.DataFrame:
+    """Tabel break-even untuk semua perusahaan × model × batas zona × field.
+
+    Dengan `adjacent_only` hanya batas zona yang bersebelahan dengan zona
+    saat ini yang dilaporkan (keluar ke zona atas/bawah).
+    """
+    keys = list(models or MODEL_REGISTRY)
+    current_results = score_arrays(values, keys)
+    n = len(values['total_assets'])
+    positions = np.arange(n)
+    frames = []
+
+    for key in keys:
+        model = MODEL_REGISTRY[key]
+        zone = current_results[key]['zone']
+        fields = input_fields([term.ratio for term in model.terms if term.coefficient != 0])
+        denominators = {RATIOS[term.ratio].denominator for term in model.terms}
+
+        for i, cut in enumerate(model.cuts):
+            relevant = (zone == i) | (zone == i + 1) if adjacent_only else np.ones(n, dtype=bool)
+            if not relevant.any():
+                continue
+            target = np.log(cut / (1 - cut)) if model.link == 'logistic' else cut
+            boundary = f"{model.zones[i][0]} | {model.zones[i + 1][0]} ({cut:g})"
+
+            for field in fields:
+                current = values[field]
+                c0, c1, c2 = field_coefficients(model, values, field)
+                minimum = 0.0 if field in denominators else None
+                solution = solve_threshold(c0, c1, c2, target, current, minimum)
+                change = solution - current
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    change_pct = np.where(current != 0, change / np.abs(current) * 100, np.nan)
+                frames.append(pd.DataFrame({
+                    'position': positions[relevant],
+                    'model': key,
+                    'boundary': boundary,
+                    'cut': cut,
+                    'field': field,
+                    'current': current[relevant],
+                    'break_even': solution[relevant],
+                    'change': change[relevant],
+                    'change_pct': change_pct[relevant]
+                }))
+
+    columns = ['position', 'model', 'boundary', 'cut', 'field', 'current', 'break_even',
+               'change', 'change_pct']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
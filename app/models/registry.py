@@ -0,0 +1,263 @@
+# ====================================================================
+# 📄 app/models/registry.py
+# ====================================================================
+"""
+Registry koefisien untuk model prediksi kebangkrutan linear.
+
+Setiap model dideklarasikan sebagai tabel: rasio yang dipakai, koefisien,
+intercept, link function dan threshold zona risiko. Batch scoring menghitung
+matriks rasio sekali lalu menilai semua model dengan satu perkalian matriks,
+sehingga model baru cukup ditambahkan sebagai entri di MODEL_REGISTRY.
+"""
+
+from functools import lru_cache
+from typing import Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.constants import (
+    ALTMAN_EMERGING_THRESHOLDS,
+    ALTMAN_MODIFIED_THRESHOLDS,
+    ALTMAN_THRESHOLDS,
+    GROVER_THRESHOLDS,
+    SPRINGATE_THRESHOLD,
+    ZMIJEWSKI_THRESHOLD,
+)
+
+
+class Ratio(NamedTuple):
+    """Rasio keuangan: kombinasi linear field dibagi satu field penyebut"""
+    numerator: Mapping[str, float]
+    denominator: str
+    floor: Optional[float] = None  # penyebut minimum, mis. max(TL, 1)
+
+
+class Term(NamedTuple):
+    """Satu komponen model: nama kolom, rasio, koefisien, label tampilan"""
+    component: str
+    ratio: str
+    coefficient: float
+    label: str
+
+
+class LinearModel(NamedTuple):
+    """Definisi model linear dengan link function dan zona risiko"""
+    key: str
+    name: str
+    terms: Tuple[Term, ...]
+    intercept: float
+    link: str  # 'identity' atau 'logistic'
+    cuts: Tuple[float, ...]  # batas zona, urut naik
+    side: str  # 'right': nilai == batas masuk zona atas, 'left': zona bawah
+    zones: Tuple[Tuple[str, str, Optional[str]], ...]  # (status, risk, recommendation)
+    formula: str
+
+
+RATIOS = {
+    'wc_ta': Ratio({'current_assets': 1.0, 'current_liabilities': -1.0}, 'total_assets'),
+    're_ta': Ratio({'retained_earnings': 1.0}, 'total_assets'),
+    'ebit_ta': Ratio({'ebit': 1.0}, 'total_assets'),
+    'mc_tl': Ratio({'market_cap': 1.0}, 'total_liabilities', floor=1.0),
+    'te_tl': Ratio({'total_equity': 1.0}, 'total_liabilities', floor=1.0),
+    'sales_ta': Ratio({'total_revenue': 1.0}, 'total_assets'),
+    'ebit_cl': Ratio({'ebit': 1.0}, 'current_liabilities', floor=1.0),
+    'ni_ta': Ratio({'net_income': 1.0}, 'total_assets'),
+    'tl_ta': Ratio({'total_liabilities': 1.0}, 'total_assets'),
+    'ca_cl': Ratio({'current_assets': 1.0}, 'current_liabilities', floor=1.0),
+}
+
+# Batas clipping skor logit untuk mencegah overflow exp()
+LOGIT_CLIP = 50.0
+
+# Index zona untuk skor NaN/inf (bukan index model.zones)
+INVALID_ZONE = -1
+
+MODEL_REGISTRY: Dict[str, LinearModel] = {
+    'altman': LinearModel(
+        key='altman',
+        name='Altman Z-Score',
+        terms=(
+            Term('x1', 'wc_ta', 1.2, 'X1 (Working Capital/TA)'),
+            Term('x2', 're_ta', 1.4, 'X2 (Retained Earnings/TA)'),
+            Term('x3', 'ebit_ta', 3.3, 'X3 (EBIT/TA)'),
+            Term('x4', 'mc_tl', 0.6, 'X4 (Market Cap/TL)'),
+            Term('x5', 'sales_ta', 1.0, 'X5 (Sales/TA)'),
+        ),
+        intercept=0.0,
+        link='identity',
+        cuts=(ALTMAN_THRESHOLDS['distress'], ALTMAN_THRESHOLDS['safe']),
+        side='right',
+        zones=(
+            ("Distress Zone", "Tinggi", "Hindari investasi - Risiko kebangkrutan tinggi"),
+            ("Gray Zone", "Sedang", "Hati-hati - Perlu analisis lebih dalam"),
+            ("Safe Zone", "Rendah", "Relatif aman - Kondisi keuangan baik"),
+        ),
+        formula='Z = 1.2×X1 + 1.4×X2 + 3.3×X3 + 0.6×X4 + 1.0×X5',
+    ),
+    'altman_modified': LinearModel(
+        key='altman_modified',
+        name='Altman Modified',
+        terms=(
+            Term('x1', 'wc_ta', 0.717, 'X1 (Working Capital/TA)'),
+            Term('x2', 're_ta', 0.847, 'X2 (Retained Earnings/TA)'),
+            Term('x3', 'ebit_ta', 3.107, 'X3 (EBIT/TA)'),
+            Term('x4', 'te_tl', 0.42, 'X4 (Book Equity/TL)'),
+            Term('x5', 'sales_ta', 0.998, 'X5 (Sales/TA)'),
+        ),
+        intercept=0.0,
+        link='identity',
+        cuts=(ALTMAN_MODIFIED_THRESHOLDS['distress'], ALTMAN_MODIFIED_THRESHOLDS['safe']),
+        side='right',
+        zones=(
+            ("Distress Zone", "Tinggi", None),
+            ("Gray Zone", "Sedang", None),
+            ("Safe Zone", "Rendah", None),
+        ),
+        formula="Z' = 0.717×X1 + 0.847×X2 + 3.107×X3 + 0.42×X4 + 0.998×X5",
+    ),
+    'altman_emerging': LinearModel(
+        key='altman_emerging',
+        name="Altman Z'' (Emerging Markets)",
+        terms=(
+            Term('x1', 'wc_ta', 6.56, 'X1 (Working Capital/TA)'),
+            Term('x2', 're_ta', 3.26, 'X2 (Retained Earnings/TA)'),
+            Term('x3', 'ebit_ta', 6.72, 'X3 (EBIT/TA)'),
+            Term('x4', 'te_tl', 1.05, 'X4 (Book Equity/TL)'),
+        ),
+        intercept=3.25,
+        link='identity',
+        cuts=(ALTMAN_EMERGING_THRESHOLDS['distress'], ALTMAN_EMERGING_THRESHOLDS['safe']),
+        side='right',
+        zones=(
+            ("Distress Zone", "Tinggi", None),
+            ("Gray Zone", "Sedang", None),
+            ("Safe Zone", "Rendah", None),
+        ),
+        formula="Z'' = 3.25 + 6.56×X1 + 3.26×X2 + 6.72×X3 + 1.05×X4",
+    ),
+    'springate': LinearModel(
+        key='springate',
+        name='Springate S-Score',
+        terms=(
+            Term('a', 'wc_ta', 1.03, 'A (WC/TA)'),
+            Term('b', 'ebit_ta', 3.07, 'B (EBIT/TA)'),
+            Term('c', 'ebit_cl', 0.66, 'C (EBIT/CL)'),
+            Term('d', 'sales_ta', 0.4, 'D (Sales/TA)'),
+        ),
+        intercept=0.0,
+        link='identity',
+        cuts=(SPRINGATE_THRESHOLD,),
+        side='right',
+        zones=(
+            ("Bankrupt", "Tinggi", "Potensi kebangkrutan tinggi"),
+            ("Healthy", "Rendah", "Kondisi finansial sehat"),
+        ),
+        formula='S = 1.03×A + 3.07×B + 0.66×C + 0.4×D',
+    ),
+    'zmijewski': LinearModel(
+        key='zmijewski',
+        name='Zmijewski X-Score',
+        terms=(
+            Term('x1', 'ni_ta', -4.5, 'X1 (NI/TA)'),
+            Term('x2', 'tl_ta', 5.7, 'X2 (TL/TA)'),
+            Term('x3', 'ca_cl', -0.004, 'X3 (CA/CL)'),
+        ),
+        intercept=-4.3,
+        link='logistic',
+        cuts=(ZMIJEWSKI_THRESHOLD,),
+        side='left',
+        zones=(
+            ("Healthy", "Rendah", "Probabilitas kebangkrutan rendah"),
+            ("Financial Distress", "Tinggi", "Probabilitas kebangkrutan tinggi"),
+        ),
+        formula='X = -4.3 - 4.5×X1 + 5.7×X2 - 0.004×X3',
+    ),
+    'grover': LinearModel(
+        key='grover',
+        name='Grover G-Score',
+        terms=(
+            Term('x1', 'wc_ta', 1.65, 'X1 (WC/TA)'),
+            Term('x2', 'ebit_ta', 3.404, 'X2 (EBIT/TA)'),
+            Term('x3', 'ni_ta', 0.0, 'X3 (NI/TA)'),
+            Term('debt_ratio', 'tl_ta', -0.016, 'Debt Ratio'),
+        ),
+        intercept=0.057,
+        link='identity',
+        cuts=(GROVER_THRESHOLDS['bankrupt'], GROVER_THRESHOLDS['gray']),
+        side='left',
+        zones=(
+            ("Bankrupt", "Tinggi", None),
+            ("Gray Zone", "Sedang", None),
+            ("Healthy", "Rendah", None),
+        ),
+        formula='G = 1.65×X1 + 3.404×X2 - 0.016×DebtRatio + 0.057',
+    ),
+}
+
+
+def ratio_matrix(values: Mapping[str, np.ndarray], ratios: Sequence[str]) -> np.ndarray:
+    """Hitung matriks rasio (n_perusahaan × n_rasio) dari field tervalidasi"""
+    n = len(values['total_assets'])
+    matrix = np.empty((n, len(ratios)))
+    for i, key in enumerate(ratios):
+        ratio = RATIOS[key]
+        numerator = sum(coef * values[field] for field, coef in ratio.numerator.items())
+        denominator = values[ratio.denominator]
+        if ratio.floor is not None:
+            denominator = np.maximum(denominator, ratio.floor)
+        matrix[:, i] = numerator / denominator
+    return matrix
+
+
+@lru_cache(maxsize=32)
+def coefficient_matrix(models: Tuple[LinearModel, ...]) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+    """Susun tabel koefisien menjadi (rasio, W [n_rasio × n_model], intercept)"""
+    ratios = tuple(dict.fromkeys(term.ratio for model in models for term in model.terms))
+    weights = np.zeros((len(ratios), len(models)))
+    for j, model in enumerate(models):
+        for term in model.terms:
+            weights[ratios.index(term.ratio), j] += term.coefficient
+    intercepts = np.array([model.intercept for model in models])
+    weights.flags.writeable = False
+    intercepts.flags.writeable = False
+    return ratios, weights, intercepts
+
+
+def apply_link(model: LinearModel, linear: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Kembalikan (score, nilai untuk zona) dari prediktor linear"""
+    if model.link == 'logistic':
+        score = np.clip(linear, -LOGIT_CLIP, LOGIT_CLIP)
+        return score, np.exp(score) / (1 + np.exp(score))
+    return linear, linear
+
+
+def zone_index(model: LinearModel, values: np.ndarray) -> np.ndarray:
+    """Index zona risiko (urutan model.zones) untuk tiap nilai; INVALID_ZONE jika NaN/inf"""
+    values = np.asarray(values, dtype=float)
+    zones = np.searchsorted(np.asarray(model.cuts), values, side=model.side)
+    return np.where(np.isfinite(values), zones, INVALID_ZONE)
+
+
+def score_arrays(values: Mapping[str, np.ndarray],
+                 models: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Nilai semua model sekaligus: satu matriks rasio dan satu matmul.
+
+    Returns dict model key -> {'score', 'probability' (logistic), 'zone',
+    <component>...} dengan satu elemen per perusahaan.
+    """
+    specs = tuple(MODEL_REGISTRY[key] for key in (models or MODEL_REGISTRY))
+    ratios, weights, intercepts = coefficient_matrix(specs)
+    matrix = ratio_matrix(values, ratios)
+    with np.errstate(invalid='ignore'):  # inf × 0 -> NaN, diberi INVALID_ZONE
+        linear = matrix @ weights + intercepts
+
+    results = {}
+    for j, model in enumerate(specs):
+        score, zone_values = apply_link(model, linear[:, j])
+        result = {term.component: matrix[:, ratios.index(term.ratio)] for term in model.terms}
+        result['score'] = score
+        if model.link == 'logistic':
+            result['probability'] = zone_values
+        result['zone'] = zone_index(model, zone_values)
+        results[model.key] = result
+    return results
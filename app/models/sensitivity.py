@@ -0,0 +1,100 @@
+# ====================================================================
+# 📄 app/models/sensitivity.py
+# ====================================================================
+"""
+Analisis what-if dan turunan parsial analitik untuk model di MODEL_REGISTRY.
+
+Semua fungsi bekerja pada array field tervalidasi (satu elemen per
+perusahaan), sehingga satu panggilan bisa menghitung seluruh watchlist.
+"""
+
+from typing import Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.registry import LOGIT_CLIP, MODEL_REGISTRY, RATIOS, coefficient_matrix
+
+
+class Gradients(NamedTuple):
+    """Turunan parsial skor terhadap field input"""
+    fields: Tuple[str, ...]
+    score: Dict[str, np.ndarray]  # model -> (n_perusahaan × n_field)
+    probability: Dict[str, np.ndarray]  # hanya model dengan link logistic
+
+
+def input_fields(ratios: Sequence[str]) -> Tuple[str, ...]:
+    """Field input yang dipakai oleh sekumpulan rasio, urutan stabil"""
+    fields = []
+    for key in ratios:
+        ratio = RATIOS[key]
+        fields.extend(ratio.numerator)
+        fields.append(ratio.denominator)
+    return tuple(dict.fromkeys(fields))
+
+
+def apply_changes(values: Mapping[str, np.ndarray],
+                  changes: Mapping[str, float]) -> Dict[str, np.ndarray]:
+    """Skenario what-if: kalikan field dengan (1 + perubahan), mis. {'ebit': 0.2}"""
+    scenario = dict(values)
+    for field, change in changes.items():
+        if change:
+            scenario[field] = values[field] * (1.0 + change)
+    return scenario
+
+
+def scenario_error(scenario: Mapping[str, np.ndarray]) -> Optional[str]:
+    """Pesan error jika skenario tidak bisa dinilai, None jika valid.
+
+    Hanya Total Assets yang diperiksa: auto-fix validate tidak dijalankan
+    ulang, karena field yang sengaja digeser ke 0 akan diisi kembali.
+    """
+    total_assets = np.asarray(scenario['total_assets'], dtype=float)
+    if not (np.isfinite(total_assets) & (total_assets > 0)).all():
+        return "Total Assets harus lebih besar dari 0"
+    return None
+
+
+def score_gradients(values: Mapping[str, np.ndarray],
+                    models: Optional[Sequence[str]] = None) -> Gradients:
+    """Turunan parsial analitik d(score)/d(field) untuk semua model sekaligus.
+
+    Untuk rasio R = N/D: dR/dx = a_x/D - [x == D] * N/D². Penyebut dengan
+    floor (mis. max(TL, 1)) bernilai konstan di bawah floor sehingga
+    turunannya 0. Untuk model logistic, turunan probabilitas adalah
+    p(1-p) × d(score)/dx dan 0 ketika skor ter-clip.
+    """
+    specs = tuple(MODEL_REGISTRY[key] for key in (models or MODEL_REGISTRY))
+    ratios, weights, intercepts = coefficient_matrix(specs)
+    fields = input_fields(ratios)
+    n = len(values['total_assets'])
+
+    matrix = np.empty((n, len(ratios)))
+    ratio_grad = np.zeros((n, len(ratios), len(fields)))
+    for j, key in enumerate(ratios):
+        ratio = RATIOS[key]
+        numerator = sum(coef * values[field] for field, coef in ratio.numerator.items())
+        denominator = values[ratio.denominator]
+        active = np.ones(n, dtype=bool)
+        if ratio.floor is not None:
+            active = denominator > ratio.floor
+            denominator = np.maximum(denominator, ratio.floor)
+        matrix[:, j] = numerator / denominator
+        for field, coef in ratio.numerator.items():
+            ratio_grad[:, j, fields.index(field)] += coef / denominator
+        ratio_grad[:, j, fields.index(ratio.denominator)] -= np.where(
+            active, matrix[:, j] / denominator, 0.0
+        )
+
+    linear = matrix @ weights + intercepts
+    linear_grad = np.einsum('njf,jm->nmf', ratio_grad, weights)
+
+    score, probability = {}, {}
+    for m, model in enumerate(specs):
+        grad = linear_grad[:, m, :]
+        if model.link == 'logistic':
+            grad = grad * (np.abs(linear[:, m]) < LOGIT_CLIP)[:, None]
+            clipped = np.clip(linear[:, m], -LOGIT_CLIP, LOGIT_CLIP)
+            p = 1.0 / (1.0 + np.exp(-clipped))
+            probability[model.key] = grad * (p * (1.0 - p))[:, None]
+        score[model.key] = grad
+    return Gradients(fields, score, probability)
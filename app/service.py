@@ -0,0 +1,290 @@
+# ====================================================================
+# 📄 app/service.py - HTTP scoring service
+# ====================================================================
+"""
+HTTP service ringan di atas BankruptcyPredictor dan DataProvider (hanya
+stdlib + app.core, tanpa Streamlit/Plotly atau web framework):
+
+    python -m app.service --port 8000
+
+Endpoint:
+- `GET  /health`
+- `POST /score`            satu objek financials -> satu objek hasil; array
+                           objek -> array hasil, di-stream per chunk
+- `GET  /ticker/{symbol}`  data provider (cache yang sama dengan aplikasi) + skor
+
+Query `models=altman,grover` memilih subset MODEL_REGISTRY. Koneksi
+dilayani pool thread I/O (SERVICE_CONNECTIONS, dengan timeout socket
+SERVICE_REQUEST_TIMEOUT); scoring CPU berjalan di pool SERVICE_WORKERS
+(default jumlah core) dan fetch jaringan /ticker di pool terpisah, sehingga
+klien idle atau yfinance yang lambat tidak menahan scoring. Batch dinilai
+vektor per `chunk_size` record dengan `score_frame`.
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from app.core import BankruptcyPredictor, DataProvider
+from app.models.registry import MODEL_REGISTRY
+from app.utils.constants import (
+    FETCH_MAX_WORKERS,
+    SERVICE_CHUNK_SIZE,
+    SERVICE_CONNECTIONS,
+    SERVICE_HOST,
+    SERVICE_MAX_BODY_BYTES,
+    SERVICE_PORT,
+    SERVICE_REQUEST_TIMEOUT,
+    SERVICE_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ('yfinance', 'alpha_vantage')
+
+
+class ServiceError(Exception):
+    """Request tidak valid; `status` menjadi kode HTTP response"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_models(query: Mapping[str, List[str]]) -> Optional[List[str]]:
+    """Key model dari query `models=a,b` (None: semua model)"""
+    if 'models' not in query:
+        return None
+    keys = [key.strip() for value in query['models'] for key in value.split(',') if key.strip()]
+    unknown = [key for key in keys if key not in MODEL_REGISTRY]
+    if unknown:
+        raise ServiceError(f"Model tidak dikenal: {', '.join(unknown)}")
+    return keys
+
+
+def score_records(records: Sequence[Mapping[str, Any]], models: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Skor satu batch record financials; field `id` (jika ada) ikut dikembalikan"""
+    if not all(isinstance(record, Mapping) for record in records):
+        raise ServiceError("Setiap record harus berupa objek JSON")
+    frame = pd.DataFrame.from_records(records)
+    scores = BankruptcyPredictor.score_frame(frame, models)
+    if 'id' in frame.columns:
+        scores.insert(0, 'id', frame['id'].to_numpy())
+    return scores
+
+
+def to_json_records(scores: pd.DataFrame) -> bytes:
+    """Array JSON hasil (NaN -> null)"""
+    return scores.to_json(orient='records').encode()
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """Handler /score, /ticker/{symbol} dan /health"""
+
+    protocol_version = 'HTTP/1.1'  # dibutuhkan untuk chunked transfer encoding
+    server_version = 'BankruptcyScoring/1.0'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path == '/health':
+                self._send_json(200, b'{"status":"ok"}')
+            elif url.path.startswith('/ticker/') and len(url.path) > len('/ticker/'):
+                self._ticker(unquote(url.path[len('/ticker/'):]), parse_qs(url.query))
+            else:
+                raise ServiceError(f"Endpoint tidak ditemukan: {url.path}", 404)
+        except ServiceError as e:
+            self._send_error(e)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path != '/score':
+                raise ServiceError(f"Endpoint tidak ditemukan: {url.path}", 404)
+            models = parse_models(parse_qs(url.query))
+            payload = self._read_json()
+            if isinstance(payload, dict):
+                self._send_json(200, self._score([payload], models)[1:-1])
+            elif isinstance(payload, list):
+                self._score_batch(payload, models)
+            else:
+                raise ServiceError("Body harus objek atau array objek JSON")
+        except ServiceError as e:
+            self._send_error(e)
+
+    def _score_batch(self, records: List[Any], models: Optional[Sequence[str]]) -> None:
+        chunk_size = self.server.chunk_size
+        if len(records) <= chunk_size:
+            self._send_json(200, self._score(records, models))
+            return
+
+        # Validasi chunk pertama sebelum header dikirim, agar error masih bisa 400
+        first = self._score(records[:chunk_size], models)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self._write_chunk(first[:-1])
+        for start in range(chunk_size, len(records), chunk_size):
+            try:
+                body = self._score(records[start:start + chunk_size], models)
+            except ServiceError as e:
+                # Header sudah terkirim: tutup array dengan objek error
+                body = b'[' + json.dumps({'error': str(e), 'offset': start}).encode() + b']'
+                self._write_chunk(b',' + body[1:-1])
+                break
+            self._write_chunk(b',' + body[1:-1])
+        self._write_chunk(b']')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _ticker(self, symbol: str, query: Mapping[str, List[str]]) -> None:
+        models = parse_models(query)
+        source = query.get('source', ['yfinance'])[0]
+        if source not in SOURCES:
+            raise ServiceError(f"Source tidak dikenal: {source}")
+        api_key = self.headers.get('X-Api-Key') or os.environ.get('ALPHA_VANTAGE_API_KEY')
+        if source == 'alpha_vantage' and not api_key:
+            raise ServiceError("Alpha Vantage membutuhkan header X-Api-Key atau ALPHA_VANTAGE_API_KEY")
+        refresh = query.get('refresh', ['0'])[0].lower() in ('1', 'true', 'yes')
+
+        symbol = symbol.strip().upper()
+        # Fetch jaringan di pool terpisah dari scoring, dalam batas SOURCE_CONCURRENCY
+        fetch = self.server.fetching.submit(DataProvider.fetch_limited, symbol, source, api_key, refresh)
+        record, error = fetch.result()
+        if error or record is None:
+            raise ServiceError(error or f"Data {symbol} tidak tersedia", 404)
+
+        financials = record.to_dict()
+        body = json.dumps({
+            'ticker': symbol,
+            'source': source,
+            'financials': financials,
+            'scores': json.loads(self._score([financials], models))[0],
+        }).encode()
+        self._send_json(200, body)
+
+    def _score(self, records: Sequence[Any], models: Optional[Sequence[str]]) -> bytes:
+        """Skor + encode JSON di pool scoring (CPU); ServiceError diteruskan ke pemanggil"""
+        return self.server.scoring.submit(lambda: to_json_records(score_records(records, models))).result()
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            raise ServiceError("Body JSON kosong")
+        if length > self.server.max_body_bytes:
+            raise ServiceError(f"Body melebihi {self.server.max_body_bytes} byte", 413)
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError as e:
+            raise ServiceError(f"JSON tidak valid: {e}")
+
+    def _send_json(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        # Satu request per koneksi: worker tidak tertahan koneksi keep-alive yang idle
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, error: ServiceError) -> None:
+        self._send_json(error.status, json.dumps({'error': str(error)}).encode())
+
+    def _write_chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer dengan pool thread tetap, bukan satu thread baru per koneksi.
+
+    `pool` melayani koneksi (I/O, timeout socket `request_timeout`),
+    `scoring` menjalankan scoring CPU (`workers` thread) dan `fetching`
+    menjalankan fetch provider untuk /ticker.
+    """
+
+    def __init__(self, address, handler=ScoringHandler, workers: int = SERVICE_WORKERS,
+                 chunk_size: int = SERVICE_CHUNK_SIZE, max_body_bytes: int = SERVICE_MAX_BODY_BYTES,
+                 connections: int = SERVICE_CONNECTIONS, fetch_workers: int = FETCH_MAX_WORKERS,
+                 request_timeout: Optional[float] = SERVICE_REQUEST_TIMEOUT):
+        super().__init__(address, handler)
+        self.chunk_size = chunk_size
+        self.max_body_bytes = max_body_bytes
+        self.request_timeout = request_timeout
+        self.pool = ThreadPoolExecutor(max_workers=connections, thread_name_prefix='http')
+        self.scoring = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scoring')
+        self.fetching = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix='ticker-fetch')
+        self._pending: Dict[Future, Any] = {}
+        self._pending_lock = threading.Lock()
+
+    def process_request(self, request, client_address) -> None:
+        future = self.pool.submit(self._process, request, client_address)
+        with self._pending_lock:
+            self._pending[future] = request
+        future.add_done_callback(self._forget)
+
+    def _forget(self, future: Future) -> None:
+        with self._pending_lock:
+            self._pending.pop(future, None)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            # Klien yang idle atau lambat mengirim tidak menahan thread koneksi selamanya
+            request.settimeout(self.request_timeout)
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with self._pending_lock:
+            pending = list(self._pending.items())
+        # Koneksi yang belum mulai ditangani ditutup (manual: `cancel_futures` baru ada di Python 3.9)
+        for future, request in pending:
+            if future.cancel():
+                self.shutdown_request(request)
+        for pool in (self.pool, self.scoring, self.fetching):
+            pool.shutdown(wait=False)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.service', description="HTTP scoring service")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS, help="Ukuran pool scoring (default: jumlah core)")
+    parser.add_argument('--connections', type=int, default=SERVICE_CONNECTIONS,
+                        help="Jumlah koneksi yang dilayani bersamaan")
+    parser.add_argument('--timeout', type=float, default=SERVICE_REQUEST_TIMEOUT,
+                        help="Timeout socket per koneksi (detik)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    server = PooledHTTPServer((args.host, args.port), workers=args.workers, connections=args.connections,
+                              request_timeout=args.timeout)
+    logger.info("Scoring service di http://%s:%d (%d worker scoring, %d koneksi)",
+                args.host, server.server_port, args.workers, args.connections)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
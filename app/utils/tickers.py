@@ -0,0 +1,30 @@
+# ====================================================================
+# 📄 app/utils/tickers.py
+# ====================================================================
+"""
+Parsing daftar ticker dari file upload / CLI (CSV dengan kolom `ticker`
+atau teks bebas dipisah koma, spasi atau baris baru).
+"""
+
+import csv
+import io
+import re
+from typing import List, Union
+
+
+def parse_tickers(content: Union[str, bytes]) -> List[str]:
+    """Daftar ticker unik (huruf besar, urutan dipertahankan)"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig', errors='ignore')
+
+    lines = content.strip().splitlines()
+    header = [cell.strip().lower() for cell in lines[0].split(',')] if lines else []
+    if 'ticker' in header:
+        rows = csv.DictReader(io.StringIO(content.strip()), skipinitialspace=True)
+        tokens = [{key.strip().lower(): value for key, value in row.items() if key}.get('ticker') or ''
+                  for row in rows]
+    else:
+        tokens = re.split(r'[\s,;]+', content)
+
+    tickers = [token.strip().upper() for token in tokens if token and token.strip()]
+    return list(dict.fromkeys(tickers))
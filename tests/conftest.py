@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+
+@pytest.fixture
+def healthy_record():
+    """Factory FinancialRecord emiten sehat; `ticker` mengisi nama perusahaan"""
+    from app import core
+
+    def make(ticker=None):
+        return core.FinancialRecord(
+            total_assets=1e12, current_assets=6e11, current_liabilities=2e11,
+            total_liabilities=3e11, retained_earnings=4e11, total_equity=7e11,
+            total_revenue=1.2e12, ebit=2.5e11, net_income=1.8e11, market_cap=2e12,
+            info=core.CompanyInfo(company_name=f"PT {ticker}") if ticker else core.CompanyInfo())
+    return make
+
+
+@pytest.fixture
+def distressed_record():
+    """Factory FinancialRecord emiten tertekan (ekuitas negatif, rugi)"""
+    from app import core
+
+    def make(ticker=None):
+        return core.FinancialRecord(
+            total_assets=1e12, current_assets=1e11, current_liabilities=4e11,
+            total_liabilities=1.1e12, retained_earnings=-3e11, total_equity=-1e11,
+            total_revenue=2e11, ebit=-1e11, net_income=-1.5e11, market_cap=1e10,
+            info=core.CompanyInfo(company_name=f"PT {ticker}") if ticker else core.CompanyInfo())
+    return make
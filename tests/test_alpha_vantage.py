@@ -0,0 +1,156 @@
+import sys
+import threading
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.data_providers.alpha_vantage import (
+    AlphaVantageClient,
+    AlphaVantageError,
+    RateLimiter,
+    RateLimitError,
+    SlidingWindow,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _limiter(clock, per_minute=5, per_day=500):
+    return RateLimiter([SlidingWindow(per_minute, 60.0, clock), SlidingWindow(per_day, 86400.0, clock)],
+                       sleep=clock.sleep)
+
+
+def test_sliding_window_enforces_per_minute_budget():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    for _ in range(5):
+        assert limiter.acquire() == 0.0
+    # Request ke-6 menunggu request pertama keluar dari window 60 detik
+    assert limiter.acquire() == pytest.approx(60.0)
+    assert clock.now == pytest.approx(60.0)
+
+
+def test_no_sixty_second_window_exceeds_per_minute_budget():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    times = []
+    for i in range(40):
+        clock.sleep(i % 7)  # jeda tidak teratur di antara request
+        limiter.acquire()
+        times.append(clock.now)
+    for start in times:
+        assert sum(start <= t < start + 60.0 for t in times) <= 5
+
+
+def test_sliding_window_enforces_per_day_budget():
+    clock = FakeClock()
+    limiter = _limiter(clock, per_minute=1000, per_day=3)
+    for _ in range(3):
+        limiter.acquire()
+    with pytest.raises(RateLimitError):
+        limiter.acquire(max_wait=120)
+    assert clock.now == 0.0
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(params)
+        return FakeResponse(self.responses.pop(0))
+
+    def close(self):
+        pass
+
+
+def test_client_retries_rate_limit_note_after_next_token():
+    clock = FakeClock()
+    session = FakeSession([
+        {'Note': 'Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute'},
+        {'Symbol': 'IBM', 'Name': 'International Business Machines'},
+    ])
+    client = AlphaVantageClient('demo', session=session, limiter=_limiter(clock))
+
+    data = client.query('OVERVIEW', 'IBM')
+    assert data['Name'] == 'International Business Machines'
+    assert len(session.calls) == 2
+    assert session.calls[0]['function'] == 'OVERVIEW' and session.calls[0]['apikey'] == 'demo'
+    # Window menit dipenuhi setelah Note, retry menunggu slot berikutnya
+    assert clock.now == pytest.approx(60.0)
+
+
+def test_daily_limit_reply_stops_client_spending_day_budget():
+    clock = FakeClock()
+    session = FakeSession([
+        {'Information': 'Our standard API rate limit is 25 requests per day.'},
+        {'Symbol': 'IBM'},
+    ])
+    client = AlphaVantageClient('demo', session=session, limiter=_limiter(clock), max_wait=120)
+    with pytest.raises(RateLimitError):
+        client.query('OVERVIEW', 'IBM')
+    with pytest.raises(RateLimitError):
+        client.query('OVERVIEW', 'IBM')
+    assert len(session.calls) == 1
+
+
+def test_client_raises_on_error_message_and_exhausted_retries():
+    clock = FakeClock()
+    session = FakeSession([{'Error Message': 'Invalid API call.'}] + [{'Note': 'frequency'}] * 3)
+    client = AlphaVantageClient('demo', session=session, limiter=_limiter(clock), max_retries=2,
+                                max_wait=None)
+    with pytest.raises(AlphaVantageError):
+        client.query('OVERVIEW', 'NOPE')
+    with pytest.raises(RateLimitError):
+        client.query('OVERVIEW', 'IBM')
+
+
+def test_query_many_drains_queue():
+    clock = FakeClock()
+    session = FakeSession([{'Symbol': str(i)} for i in range(4)])
+    client = AlphaVantageClient('demo', session=session, limiter=_limiter(clock, per_minute=100))
+    results = list(client.query_many([('OVERVIEW', s) for s in 'ABCD']))
+    client.close()
+    assert len(results) == 4
+    assert all(error is None for _, _, error in results)
+
+
+def test_close_cancels_queued_requests():
+    started, gate = threading.Event(), threading.Event()
+
+    class BlockingSession(FakeSession):
+        def get(self, url, params=None, timeout=None):
+            started.set()
+            gate.wait(5)
+            return super().get(url, params, timeout)
+
+    session = BlockingSession([{'Symbol': str(i)} for i in range(3)])
+    client = AlphaVantageClient('demo', session=session, limiter=_limiter(FakeClock(), per_minute=100),
+                                workers=1)
+    futures = [client.submit('OVERVIEW', symbol) for symbol in 'ABC']
+    assert started.wait(5)  # request pertama sudah berjalan, dua lainnya masih antre
+    client.close()
+    gate.set()
+
+    assert futures[0].result(timeout=5) == {'Symbol': '0'}
+    assert futures[1].cancelled() and futures[2].cancelled()
+    assert len(session.calls) == 1
@@ -12,7 +12,7 @@ def test_import():
 
 def test_altman_calculation():
     """Test Altman calculation with sample data"""
-    from app.main import BankruptcyPredictor
+    from app.core import BankruptcyPredictor
     
     sample_data = {
         'current_assets': 1000000,
@@ -30,3 +30,91 @@ def test_altman_calculation():
     assert 'error' not in result
     assert 'score' in result
     assert isinstance(result['score'], (int, float))
+
+def test_score_frame_matches_single_scores():
+    """Test batch scoring gives the same result as the per-dict functions"""
+    import pandas as pd
+    from app.core import BankruptcyPredictor
+    
+    records = [
+        {
+            'current_assets': 1000000, 'current_liabilities': 500000,
+            'total_assets': 2000000, 'total_liabilities': 800000,
+            'total_revenue': 1500000, 'ebit': 200000, 'net_income': 150000,
+            'retained_earnings': 300000, 'market_cap': 1500000
+        },
+        {
+            'current_assets': 500000, 'current_liabilities': 800000,
+            'total_assets': 1000000, 'total_liabilities': 1200000,
+            'total_revenue': 200000, 'ebit': -50000, 'net_income': -100000,
+            'retained_earnings': -200000, 'market_cap': 100000
+        },
+        {'total_assets': 0}
+    ]
+    
+    frame = BankruptcyPredictor.score_frame(pd.DataFrame(records))
+    assert len(frame) == 3
+    
+    for i, record in enumerate(records[:2]):
+        row = frame.iloc[i]
+        altman = BankruptcyPredictor.altman_z_score(record)
+        zmijewski = BankruptcyPredictor.zmijewski_score(record)
+        assert round(row['altman_score'], 3) == altman['score']
+        assert row['altman_risk'] == altman['risk']
+        assert round(row['zmijewski_probability'] * 100, 1) == zmijewski['probability']
+        assert round(row['grover_score'], 3) == BankruptcyPredictor.grover_score(record)['score']
+    
+    assert frame.iloc[2]['error'] == "Total Assets harus lebih besar dari 0"
+    assert pd.isna(frame.iloc[2]['altman_score'])
+
+def test_validated_snapshot_shared_by_models():
+    """Test models accept one read-only validated snapshot"""
+    from app.core import BankruptcyPredictor
+    
+    data = {'total_assets': 2000000, 'net_income': 150000, 'total_revenue': 1500000}
+    snapshot = BankruptcyPredictor.validate(data)
+    
+    assert snapshot.is_valid
+    assert snapshot.get('current_assets') == 800000
+    assert snapshot.get('ebit') == 180000
+    assert 'current_assets' not in data
+    assert not snapshot.values['total_assets'].flags.writeable
+    
+    assert BankruptcyPredictor.altman_z_score(snapshot) == BankruptcyPredictor.altman_z_score(data)
+    assert BankruptcyPredictor.zmijewski_score(snapshot) == BankruptcyPredictor.zmijewski_score(data)
+    
+    invalid = BankruptcyPredictor.validate({'total_assets': 'invalid'})
+    assert not invalid.is_valid
+    assert BankruptcyPredictor.grover_score(invalid) == {'error': invalid.message}
+
+def test_financial_record_roundtrip():
+    """Test FinancialRecord conversion from/to dict and scoring"""
+    from app.core import BankruptcyPredictor, FinancialRecord
+    
+    data = {
+        'company_name': 'PT Contoh Tbk', 'sector': 'Industrials',
+        'current_assets': '1,000,000', 'current_liabilities': 500000,
+        'total_assets': 2000000, 'total_liabilities': 800000,
+        'total_revenue': 1500000, 'ebit': 200000, 'net_income': None
+    }
+    record = FinancialRecord.from_dict(data)
+    
+    assert record.current_assets == 1000000.0
+    assert record.net_income == 0.0
+    assert record.info.company_name == 'PT Contoh Tbk'
+    assert record.info.industry == 'N/A'
+    assert FinancialRecord.from_dict(record.to_dict()) == record
+    
+    assert BankruptcyPredictor.springate_score(record) == BankruptcyPredictor.springate_score(data)
+    frame = BankruptcyPredictor.score_frame([record, record._replace(total_assets=0.0)])
+    assert round(float(frame.iloc[0]['springate_score']), 3) == BankruptcyPredictor.springate_score(record)['score']
+    assert frame.iloc[1]['error'] is not None
+
+def test_core_import_is_lightweight():
+    """app.core tidak memuat UI maupun library jaringan saat diimpor"""
+    import subprocess
+    code = ("import sys, app.core; print(sorted({m.split('.')[0] for m in sys.modules} & "
+            "{'streamlit', 'plotly', 'yfinance', 'requests'}))")
+    output = subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).parent.parent,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.models.break_even import break_even
+from app.models.registry import MODEL_REGISTRY, score_arrays
+
+
+def _universe():
+    """Helper: validated-style arrays for a small universe"""
+    return {
+        'current_assets': np.array([1000000.0, 300000.0, 50000.0]),
+        'current_liabilities': np.array([500000.0, 400000.0, 90000.0]),
+        'total_assets': np.array([2000000.0, 1000000.0, 400000.0]),
+        'total_liabilities': np.array([800000.0, 900000.0, 380000.0]),
+        'total_revenue': np.array([1500000.0, 600000.0, 100000.0]),
+        'ebit': np.array([200000.0, 20000.0, -30000.0]),
+        'net_income': np.array([150000.0, 5000.0, -40000.0]),
+        'retained_earnings': np.array([300000.0, -50000.0, -200000.0]),
+        'market_cap': np.array([1500000.0, 200000.0, 20000.0]),
+        'total_equity': np.array([1200000.0, 100000.0, 20000.0])
+    }
+
+
+def test_break_even_values_land_on_threshold():
+    """Test substituting each break-even value puts the model exactly on its cut"""
+    values = _universe()
+    table = break_even(values, adjacent_only=False).dropna(subset=['break_even'])
+    assert set(table['model']) == set(MODEL_REGISTRY)
+    
+    for row in table.itertuples():
+        scenario = {key: array[row.position:row.position + 1].copy() for key, array in values.items()}
+        scenario[row.field] = np.array([row.break_even])
+        result = score_arrays(scenario, [row.model])[row.model]
+        value = result['probability' if 'probability' in result else 'score'][0]
+        assert np.isclose(value, row.cut, rtol=1e-6, atol=1e-9), row
+
+
+def test_break_even_adjacent_boundaries_only():
+    """Test only boundaries next to the current zone are reported"""
+    values = _universe()
+    table = break_even(values, ['altman'])
+    zones = score_arrays(values, ['altman'])['altman']['zone']
+    cuts = MODEL_REGISTRY['altman'].cuts
+    
+    for position, zone in enumerate(zones):
+        reported = set(table.loc[table['position'] == position, 'cut'])
+        expected = {cuts[i] for i in (zone - 1, zone) if 0 <= i < len(cuts)}
+        assert reported == expected
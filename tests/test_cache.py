@@ -0,0 +1,150 @@
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from app.data_providers.cache import FundamentalsCache
+from app.data_providers.coalesce import SingleFlight
+
+
+def test_cache_roundtrip_persists_across_instances(tmp_path):
+    """Payload tersimpan di disk dan terbaca oleh instance baru"""
+    path = tmp_path / 'cache.sqlite'
+    frame = pd.DataFrame({'2023': [1.0, 2.0]}, index=['Total Assets', 'EBIT'])
+
+    cache = FundamentalsCache(path)
+    cache.set('yfinance', 'BBRI.JK', {'info': {'longName': 'BRI'}, 'balance_sheet': frame})
+    cache.close()
+
+    cache = FundamentalsCache(path)
+    payload = cache.get('yfinance', 'BBRI.JK')
+    assert payload['info']['longName'] == 'BRI'
+    pd.testing.assert_frame_equal(payload['balance_sheet'], frame)
+    assert cache.get('yfinance', 'BBRI.JK', period='quarterly') is None
+    assert cache.get('alpha_vantage', 'BBRI.JK') is None
+
+
+def test_cache_ttl_expiry(tmp_path):
+    cache = FundamentalsCache(tmp_path / 'cache.sqlite', ttl=3600)
+    cache.set('yfinance', 'TLKM.JK', {'x': 1})
+    assert cache.get('yfinance', 'TLKM.JK') == {'x': 1}
+    assert cache.get('yfinance', 'TLKM.JK', ttl=0) is None
+
+    cache.ttl = 0.01
+    time.sleep(0.05)
+    assert cache.get('yfinance', 'TLKM.JK') is None
+
+
+def test_cache_lru_eviction_by_size(tmp_path):
+    cache = FundamentalsCache(tmp_path / 'cache.sqlite', max_bytes=2500)
+    blob = b'x' * 1000
+    cache.set('yfinance', 'A', blob)
+    time.sleep(0.01)
+    cache.set('yfinance', 'B', blob)
+    time.sleep(0.01)
+    assert cache.get('yfinance', 'A') == blob  # A sekarang paling baru dipakai
+    time.sleep(0.01)
+    cache.set('yfinance', 'C', blob)
+
+    assert cache.get('yfinance', 'B') is None
+    assert cache.get('yfinance', 'A') == blob
+    assert cache.get('yfinance', 'C') == blob
+    assert cache.stats()['entries'] == 2
+
+
+def test_pinned_entries_survive_eviction(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = FundamentalsCache(path, max_bytes=1500)
+    blob = b'x' * 1000
+    cache.set('yfinance', 'Q', blob, 'quarterly', pinned=True)
+    time.sleep(0.01)
+    cache.set('yfinance', 'A', blob)
+    time.sleep(0.01)
+    cache.set('yfinance', 'B', blob)
+
+    # Hanya entri biasa yang di-evict; entri pinned tidak dihitung dalam batas
+    assert cache.get('yfinance', 'A') is None
+    assert cache.get('yfinance', 'B') == blob
+    assert cache.get('yfinance', 'Q', 'quarterly') == blob
+    cache.close()
+
+    reopened = FundamentalsCache(path, max_bytes=0)
+    reopened.set('yfinance', 'C', blob)
+    assert reopened.get('yfinance', 'Q', 'quarterly') == blob
+    reopened.invalidate('yfinance', 'Q')
+    assert reopened.get('yfinance', 'Q', 'quarterly') is None
+
+
+def test_cache_migrates_table_without_pinned_column(tmp_path):
+    import pickle
+    import sqlite3
+    path = tmp_path / 'cache.sqlite'
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE fundamentals (source TEXT NOT NULL, ticker TEXT NOT NULL, "
+                 "period TEXT NOT NULL, payload BLOB NOT NULL, size INTEGER NOT NULL, "
+                 "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                 "PRIMARY KEY (source, ticker, period))")
+    blob = pickle.dumps({'old': 1})
+    conn.execute("INSERT INTO fundamentals VALUES ('yfinance', 'OLD', 'annual', ?, ?, ?, ?)",
+                 (blob, len(blob), time.time(), time.time()))
+    conn.commit()
+    conn.close()
+
+    cache = FundamentalsCache(path)
+    assert cache.get('yfinance', 'OLD') == {'old': 1}
+    cache.set('yfinance', 'Q', {'new': 2}, 'quarterly', pinned=True)
+    assert cache.get('yfinance', 'Q', 'quarterly') == {'new': 2}
+
+
+def test_yfinance_provider_uses_cache_and_refresh(tmp_path, monkeypatch):
+    """Fetch kedua dilayani cache; refresh=True memaksa fetch ulang; info dimuat terpisah"""
+    from app import core
+
+    calls, info_calls = [], []
+
+    class FakeTicker:
+        def __init__(self, ticker):
+            calls.append(ticker)
+            self.fast_info = {'lastPrice': 100.0, 'marketCap': 5e11}
+            self.balance_sheet = pd.DataFrame({'2023': [1e12, 6e11, 4e11, 3e11, 4e11]}, index=[
+                'Total Assets', 'Total Liabilities Net Minority Interest', 'Current Assets',
+                'Current Liabilities', 'Stockholders Equity'])
+            self.financials = pd.DataFrame({'2023': [8e11, 1e11, 7e10]}, index=[
+                'Total Revenue', 'EBIT', 'Net Income'])
+
+        @property
+        def info(self):
+            info_calls.append(1)
+            return {'longName': 'PT Contoh Tbk', 'sector': 'Financial Services'}
+
+    monkeypatch.setattr('yfinance.Ticker', FakeTicker)
+    monkeypatch.setattr(core.DataProvider, '_cache', FundamentalsCache(tmp_path / 'cache.sqlite'))
+    monkeypatch.setattr(core.DataProvider, '_memo', SingleFlight())
+
+    first, error = core.DataProvider.get_yfinance_data('TEST.JK')
+    assert error is None
+    core.DataProvider._memo.clear()  # paksa baca dari cache disk
+    second, error = core.DataProvider.get_yfinance_data('TEST.JK')
+    assert error is None
+    assert calls == ['TEST.JK']
+    assert second == first
+    assert second.total_assets == 1e12
+
+    assert second.market_cap == 5e11 and second.current_price == 100.0
+    assert second.info == core.CompanyInfo()
+    assert info_calls == []  # info yang lambat tidak dipakai untuk validasi
+
+    core.DataProvider.get_yfinance_data('TEST.JK', refresh=True)
+    assert calls == ['TEST.JK', 'TEST.JK']
+
+    # Metadata dimuat terpisah, lalu ikut di record berikutnya dari cache
+    info = core.DataProvider.get_company_info('TEST.JK')
+    assert info.company_name == 'PT Contoh Tbk'
+    core.DataProvider._memo.clear()
+    assert core.DataProvider.get_company_info('TEST.JK') == info
+    third, _ = core.DataProvider.get_yfinance_data('TEST.JK')
+    assert third.info == info
+    assert info_calls == [1]
+
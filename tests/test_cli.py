@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_cli_does_not_import_ui_packages():
+    code = ("import sys, app.cli; "
+            "print([m for m in sys.modules if m.split('.')[0] in ('streamlit', 'plotly')])")
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip() == '[]'
+
+
+def test_cli_scores_ticker_file(tmp_path, monkeypatch, capsys):
+    from app import cli, core
+
+    def fake_fetch(ticker, refresh=False):
+        if ticker == 'BAD.JK':
+            return None, "Ticker BAD.JK tidak ditemukan atau tidak valid"
+        return core.FinancialRecord(
+            total_assets=1e12, current_assets=6e11, current_liabilities=2e11,
+            total_liabilities=3e11, retained_earnings=4e11, total_equity=7e11,
+            total_revenue=1.2e12, ebit=2.5e11, net_income=1.8e11, market_cap=2e12), None
+
+    monkeypatch.setattr(core.DataProvider, 'get_yfinance_data', fake_fetch)
+    tickers = tmp_path / 'tickers.txt'
+    tickers.write_text("bbri.jk\nTLKM.JK, BAD.JK\n")
+
+    out = tmp_path / 'results.parquet'
+    assert cli.main(['score', '--tickers', str(tickers), '--out', str(out), '-q']) == 0
+    results = pd.read_parquet(out)
+    assert sorted(results['ticker']) == ['BBRI.JK', 'TLKM.JK']
+    assert {'altman_score', 'grover_risk', 'high_risk_models'} <= set(results.columns)
+    assert 'BAD.JK' in capsys.readouterr().err
+
+    assert cli.main(['score', '--tickers', str(tickers), '--models', 'altman', '--format', 'json', '-q']) == 0
+    records = json.loads(capsys.readouterr().out)
+    assert len(records) == 2 and 'springate_score' not in records[0]
+
+    assert cli.main(['score', '--tickers', str(tickers), '--out', str(tmp_path / 'x.xlsx')]) == 2
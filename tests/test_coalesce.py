@@ -0,0 +1,94 @@
+import sys
+import threading
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.data_providers.coalesce import SingleFlight
+
+
+def test_concurrent_calls_share_one_fetch():
+    """Thread yang meminta key sama menunggu satu fetch yang sedang berjalan"""
+    memo = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return ('record', None)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(memo.do(('yfinance', 'BBRI.JK'), fetch)))
+               for _ in range(8)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [('record', None)] * 8
+    assert memo.stats()['shared'] == 7
+
+    # Permintaan berikutnya dilayani LRU
+    assert memo.do(('yfinance', 'BBRI.JK'), fetch) == ('record', None)
+    assert len(calls) == 1
+    assert memo.stats()['hits'] == 1
+
+
+def test_refresh_ttl_and_cache_if():
+    memo = SingleFlight(ttl=0.05)
+    counter = iter(range(100))
+    fetch = lambda: next(counter)
+
+    assert memo.do('a', fetch) == 0
+    assert memo.do('a', fetch) == 0
+    assert memo.do('a', fetch, refresh=True) == 1
+    time.sleep(0.06)
+    assert memo.do('a', fetch) == 2
+
+    # Hasil gagal tidak disimpan
+    assert memo.do('b', fetch, cache_if=lambda result: False) == 3
+    assert memo.do('b', fetch, cache_if=lambda result: False) == 4
+
+
+def test_refresh_does_not_join_stale_flight():
+    """Refresh memulai fetch sendiri; hasil fetch lama yang lebih lambat tidak menimpa LRU"""
+    memo = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def stale():
+        started.set()
+        release.wait(5)
+        return 'stale'
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(memo.do('a', stale)))
+    thread.start()
+    assert started.wait(5)
+    assert memo.do('a', lambda: 'fresh', refresh=True) == 'fresh'
+    release.set()
+    thread.join(5)
+
+    assert results == ['stale']
+    assert memo.do('a', lambda: pytest.fail('LRU miss')) == 'fresh'
+
+
+def test_lru_bound_and_exception_propagation():
+    memo = SingleFlight(max_entries=2)
+    for key in 'abc':
+        memo.do(key, lambda: key)
+    assert memo.stats()['entries'] == 2
+
+    def boom():
+        raise RuntimeError('upstream down')
+
+    with pytest.raises(RuntimeError):
+        memo.do('x', boom)
+    assert memo.stats()['inflight'] == 0
+    assert memo.do('x', lambda: 'ok') == 'ok'
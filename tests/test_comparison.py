@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).parent.parent / 'app' / 'main.py')
+
+
+def test_comparison_heatmap_and_grouped_table(healthy_record, distressed_record):
+    from app import core, main
+
+    results = core.BankruptcyPredictor.score_frame([healthy_record(), distressed_record()])
+    results.index = ['SEHAT.JK', 'SAKIT.JK']
+    results['high_risk_models'] = (results[[f'{key}_risk' for key in core.UI_MODELS]] == 'Tinggi').sum(axis=1)
+    for column, value in (('company_name', 'PT'), ('market_cap', 0.0)):
+        results[column] = value
+
+    fig = main.create_comparison_heatmap(results)
+    heatmap = fig.data[0]
+    assert heatmap.z.shape == (2, len(core.UI_MODELS))
+    assert list(heatmap.y) == ['SEHAT.JK', 'SAKIT.JK']
+    assert heatmap.z[1].max() == main.RISK_LEVELS['Tinggi']
+    assert {color for _, color in heatmap.colorscale} == set(main.RISK_COLORS.values())
+
+    table = main.comparison_table(results)
+    assert list(table.index) == ['SAKIT.JK', 'SEHAT.JK']  # kelompok risiko tinggi di atas
+    assert table['Kelompok'].iloc[0].startswith("🔴")
+
+
+def test_comparison_page_fetches_once_and_scores_in_one_batch(monkeypatch, healthy_record,
+                                                              distressed_record):
+    from app import core
+
+    fetches, batches = [], []
+    score_frame = core.BankruptcyPredictor.score_frame
+
+    def fake_fetch(ticker, refresh=False):
+        fetches.append(ticker)
+        return (distressed_record if ticker == 'BBCA.JK' else healthy_record)(), None
+
+    def counting_score_frame(data, models=None):
+        batches.append(len(data))
+        return score_frame(data, models)
+
+    monkeypatch.setattr(core.DataProvider, 'get_yfinance_data', fake_fetch)
+    monkeypatch.setattr(core.BankruptcyPredictor, 'score_frame', staticmethod(counting_score_frame))
+
+    at = AppTest.from_file(APP, default_timeout=30).run()
+    at.sidebar.radio[0].set_value("Perbandingan").run()
+    next(button for button in at.sidebar.button if button.label == "📊 Bandingkan").click().run()
+    assert not at.exception
+    assert sorted(fetches) == sorted(at.sidebar.multiselect[0].value)
+    assert batches == [len(fetches)]
+    assert len(at.get('plotly_chart')) == 1
+
+    at.run()  # rerun tanpa klik: render ulang dari session state
+    assert len(fetches) == 5 and batches == [5]
+    assert len(at.get('plotly_chart')) == 1
@@ -0,0 +1,335 @@
+import sys
+import threading
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+def test_get_many_runs_in_parallel_with_source_limit(monkeypatch):
+    """get_many memakai thread pool tetapi menghormati batas per source"""
+    from app import core
+
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_fetch(ticker, refresh=False):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        if ticker == 'BAD.JK':
+            return None, "Ticker BAD.JK tidak ditemukan atau tidak valid"
+        return core.FinancialRecord(total_assets=1.0), None
+
+    monkeypatch.setattr(core.DataProvider, 'get_yfinance_data', fake_fetch)
+    monkeypatch.setattr(core.DataProvider, '_source_limits',
+                        {'yfinance': threading.BoundedSemaphore(4)})
+
+    tickers = [f"T{i}.JK" for i in range(11)] + ['BAD.JK', 'T0.JK']
+    start = time.perf_counter()
+    results = {ticker: (data, error) for ticker, data, error in core.DataProvider.get_many(tickers)}
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 12
+    assert results['BAD.JK'][0] is None and 'BAD.JK' in results['BAD.JK'][1]
+    assert results['T3.JK'][1] is None
+    assert peak[0] == 4
+    assert elapsed < 0.6  # 3 gelombang × 0.1 detik, bukan 12 × 0.1 detik
+
+
+def test_get_many_cancels_pending_when_consumer_stops(monkeypatch):
+    """Berhenti membaca hasil membatalkan ticker yang belum mulai diambil"""
+    from app import core
+
+    called = []
+
+    def fake_fetch(ticker, refresh=False):
+        called.append(ticker)
+        time.sleep(0.05)
+        return core.FinancialRecord(total_assets=1.0), None
+
+    monkeypatch.setattr(core.DataProvider, 'get_yfinance_data', fake_fetch)
+    results = core.DataProvider.get_many([f"T{i}.JK" for i in range(10)], max_workers=1)
+    next(results)
+    results.close()
+    time.sleep(0.2)
+
+    assert len(called) <= 2  # ticker pertama + paling banyak satu yang sudah berjalan
+
+
+def _alpha_vantage_payloads():
+    return {
+        'OVERVIEW': {'Symbol': 'IBM', 'Name': 'International Business Machines',
+                     'Sector': 'TECHNOLOGY', 'MarketCapitalization': '150000000000'},
+        'BALANCE_SHEET': {'symbol': 'IBM', 'annualReports': [
+            {'fiscalDateEnding': '2023-12-31', 'totalAssets': '135241000000',
+             'totalCurrentAssets': '32908000000', 'totalCurrentLiabilities': '34122000000',
+             'totalLiabilities': '112628000000', 'totalShareholderEquity': '22533000000',
+             'retainedEarnings': '151276000000', 'commonStockSharesOutstanding': '916000000'},
+            {'fiscalDateEnding': '2022-12-31', 'totalAssets': '127243000000'},
+        ]},
+        'INCOME_STATEMENT': {'symbol': 'IBM', 'annualReports': [
+            {'fiscalDateEnding': '2023-12-31', 'totalRevenue': '61860000000',
+             'ebit': '9648000000', 'netIncome': '7502000000', 'ebitda': 'None'},
+        ]},
+    }
+
+
+def _fake_client(query):
+    """AlphaVantageClient asli (antrean + seam upstream) dengan `query(function, symbol)` palsu"""
+    from app.data_providers import alpha_vantage
+
+    class FakeClient(alpha_vantage.AlphaVantageClient):
+        def query(self, function, symbol, **params):
+            return query(function, symbol)
+
+    return FakeClient('demo', session=object())
+
+def test_alpha_vantage_builds_record_from_statements(tmp_path, monkeypatch):
+    """Tiga endpoint diambil bersamaan sekali, lalu dilayani cache disk"""
+    from app import core
+    from app.data_providers import alpha_vantage
+    from app.data_providers.cache import FundamentalsCache
+    from app.data_providers.coalesce import SingleFlight
+
+    payloads = _alpha_vantage_payloads()
+    submitted = []
+
+    def query(function, symbol):
+        submitted.append((function, symbol))
+        return payloads[function]
+
+    monkeypatch.setattr(alpha_vantage, 'get_client', lambda api_key: _fake_client(query))
+    monkeypatch.setattr(core.DataProvider, '_cache', FundamentalsCache(tmp_path / 'cache.sqlite'))
+    monkeypatch.setattr(core.DataProvider, '_memo', SingleFlight())
+
+    record, error = core.DataProvider.get_alpha_vantage_data('IBM', 'demo')
+    assert error is None
+    assert record.total_assets == 135241000000
+    assert record.current_liabilities == 34122000000
+    assert record.ebit == 9648000000
+    assert record.ebitda == 0.0
+    assert record.market_cap == 150000000000
+    assert record.info.company_name == 'International Business Machines'
+    assert sorted(submitted) == [('BALANCE_SHEET', 'IBM'), ('INCOME_STATEMENT', 'IBM'), ('OVERVIEW', 'IBM')]
+
+    core.DataProvider._memo.clear()
+    again, error = core.DataProvider.get_alpha_vantage_data('IBM', 'demo')
+    assert again == record
+    assert len(submitted) == 3
+
+    # Laporan tahun sebelumnya memakai JSON yang sama dari cache
+    raw, _ = core.DataProvider._fetch_alpha_vantage_raw('IBM', 'demo')
+    previous = core.DataProvider._extract_alpha_vantage_data(raw, 'IBM', position=1)
+    assert previous.total_assets == 127243000000
+    assert previous.total_revenue == 0.0
+    assert len(submitted) == 3
+
+    history, error = core.DataProvider.get_history('IBM', 'alpha_vantage', 'demo')
+    assert error is None
+    assert list(history['total_assets']) == [127243000000, 135241000000]
+    assert list(history['market_cap']) == [0.0, 150000000000]
+    assert len(submitted) == 3
+
+
+def test_alpha_vantage_reports_api_errors_verbatim(tmp_path, monkeypatch):
+    """Error key/kuota diteruskan apa adanya; hanya payload kosong berarti symbol tidak ada"""
+    from app import core
+    from app.data_providers import alpha_vantage
+    from app.data_providers.cache import FundamentalsCache
+    from app.data_providers.coalesce import SingleFlight
+
+    payloads = _alpha_vantage_payloads()
+
+    def query(function, symbol):
+        if symbol == 'KEY':
+            raise alpha_vantage.AlphaVantageError("the parameter apikey is invalid or missing")
+        return {} if symbol == 'NOPE' else payloads[function]
+
+    monkeypatch.setattr(alpha_vantage, 'get_client', lambda api_key: _fake_client(query))
+    monkeypatch.setattr(core.DataProvider, '_cache', FundamentalsCache(tmp_path / 'cache.sqlite'))
+    monkeypatch.setattr(core.DataProvider, '_memo', SingleFlight())
+
+    _, error = core.DataProvider.get_alpha_vantage_data('KEY', 'salah')
+    assert 'apikey is invalid' in error and 'tidak ditemukan' not in error
+    _, error = core.DataProvider.get_alpha_vantage_data('NOPE', 'demo')
+    assert error == "Symbol NOPE tidak ditemukan di Alpha Vantage"
+
+
+def test_alpha_vantage_caches_endpoints_that_succeed_before_an_error(tmp_path, monkeypatch):
+    """Endpoint yang berhasil disimpan walau endpoint lain gagal, dan error tidak menunggu sisanya"""
+    from app import core
+    from app.data_providers import alpha_vantage
+    from app.data_providers.cache import FundamentalsCache
+    from app.data_providers.coalesce import SingleFlight
+
+    payloads = _alpha_vantage_payloads()
+    released = threading.Event()
+    calls = []
+
+    def query(function, symbol):
+        calls.append(function)
+        if function == 'BALANCE_SHEET' and calls.count(function) == 1:
+            raise alpha_vantage.RateLimitError("Budget request habis")
+        if function == 'INCOME_STATEMENT':
+            released.wait(5)  # endpoint lambat, masih berjalan saat error dikembalikan
+        return payloads[function]
+
+    cache = FundamentalsCache(tmp_path / 'cache.sqlite')
+    monkeypatch.setattr(alpha_vantage, 'get_client', lambda api_key: _fake_client(query))
+    monkeypatch.setattr(core.DataProvider, '_cache', cache)
+    monkeypatch.setattr(core.DataProvider, '_memo', SingleFlight())
+
+    start = time.perf_counter()
+    _, error = core.DataProvider.get_alpha_vantage_data('IBM', 'demo')
+    assert 'Rate limit' in error
+    assert time.perf_counter() - start < 2
+    released.set()
+    for _ in range(100):
+        if cache.get('alpha_vantage', 'IBM', 'income_statement') is not None:
+            break
+        time.sleep(0.02)
+    assert cache.get('alpha_vantage', 'IBM', 'overview') is not None
+    assert cache.get('alpha_vantage', 'IBM', 'income_statement') is not None
+
+    # Percobaan berikutnya hanya mengambil endpoint yang gagal
+    record, error = core.DataProvider.get_alpha_vantage_data('IBM', 'demo')
+    assert error is None and record.total_assets == 135241000000
+    assert sorted(calls) == ['BALANCE_SHEET', 'BALANCE_SHEET', 'INCOME_STATEMENT', 'OVERVIEW']
+
+def test_history_scores_every_period_from_cached_statements(tmp_path, monkeypatch):
+    """get_history memakai payload yang sama dan score_frame menilai semua tahun sekaligus"""
+    import pandas as pd
+    from app import core, main
+    from app.data_providers.cache import FundamentalsCache
+
+    dates = pd.to_datetime(['2023-12-31', '2022-12-31', '2021-12-31'])
+    raw = {
+        'quote': {'market_cap': 5e11, 'current_price': 100.0},
+        'balance_sheet': pd.DataFrame(
+            [[1e12, 9e11, 8e11], [6e11, 6e11, 7e11], [4e11, 3e11, 2e11], [3e11, 3e11, 3e11]],
+            index=['Total Assets', 'Total Liabilities Net Minority Interest', 'Current Assets',
+                   'Current Liabilities'], columns=dates),
+        'financials': pd.DataFrame([[8e11, 7e11, 6e11], [1e11, 5e10, -2e10]],
+                                   index=['Total Revenue', 'EBIT'], columns=dates),
+    }
+    cache = FundamentalsCache(tmp_path / 'cache.sqlite')
+    cache.set('yfinance', 'TEST.JK', raw)
+    monkeypatch.setattr(core.DataProvider, '_cache', cache)
+    monkeypatch.setattr(core.DataProvider, '_fetch_yfinance_raw',
+                        lambda ticker: (_ for _ in ()).throw(AssertionError('tidak boleh fetch')))
+
+    history, error = core.DataProvider.get_history('TEST.JK')
+    assert error is None
+    assert history.index.names == ['ticker', 'fiscal_date']
+    assert list(history.index.get_level_values('fiscal_date').year) == [2021, 2022, 2023]
+    assert list(history['market_cap']) == [0.0, 0.0, 5e11]
+    assert list(history.columns) == list(core.RECORD_FIELDS)
+
+    scores = core.BankruptcyPredictor.score_frame(history, core.UI_MODELS)
+    assert scores['error'].isna().all()
+    latest = core.BankruptcyPredictor.score('altman', core.FinancialRecord(**history.iloc[-1]))
+    assert round(float(scores['altman_score'].iloc[-1]), 3) == latest['score']
+    assert scores['altman_score'].is_monotonic_increasing
+
+    figure = main.create_trajectory_chart(scores)
+    assert len(figure.data) == len(core.UI_MODELS)
+
+
+def test_history_keeps_quote_off_stale_periods(tmp_path, monkeypatch):
+    """Quote terbaru tidak ditempel ke periode lama jika periode terbaru dibuang"""
+    import numpy as np
+    import pandas as pd
+    from app import core
+    from app.data_providers.cache import FundamentalsCache
+
+    dates = pd.to_datetime(['2024-12-31', '2023-12-31', '2022-12-31'])
+    raw = {
+        'quote': {'market_cap': 5e11, 'current_price': 100.0},
+        # 2024 belum punya Total Assets: periode itu dibuang dari history
+        'balance_sheet': pd.DataFrame([[np.nan, 9e11, 8e11], [np.nan, 6e11, 7e11]],
+                                      index=['Total Assets', 'Total Liabilities'], columns=dates),
+        'financials': pd.DataFrame([[9e11, 7e11, 6e11]], index=['Total Revenue'], columns=dates),
+    }
+    cache = FundamentalsCache(tmp_path / 'cache.sqlite')
+    cache.set('yfinance', 'TEST.JK', raw)
+    monkeypatch.setattr(core.DataProvider, '_cache', cache)
+
+    history, error = core.DataProvider.get_history('TEST.JK')
+    assert error is None
+    assert list(history.index.get_level_values('fiscal_date').year) == [2022, 2023]
+    assert (history[['market_cap', 'current_price']] == 0).all().all()
+
+def test_quarterly_store_refreshes_incrementally(tmp_path, monkeypatch):
+    """Kuartal hanya diambil jika sudah waktunya terbit, dan hanya periode baru yang ditambahkan"""
+    import pandas as pd
+    from app import core
+    from app.data_providers.cache import FundamentalsCache
+
+    def quarters(dates, base):
+        index = pd.DatetimeIndex(pd.to_datetime(dates), name='fiscal_date')
+        return pd.DataFrame({'total_assets': [base + i for i in range(len(dates))],
+                             'total_revenue': [10.0] * len(dates)}, index=index)
+
+    responses = [quarters(['2024-03-31', '2024-06-30', '2024-09-30', '2024-12-31'], 100.0),
+                 quarters(['2024-06-30', '2024-09-30', '2024-12-31', '2025-03-31'], 900.0)]
+    fetched = []
+
+    def fake_fetch(ticker):
+        fetched.append(ticker)
+        return responses[len(fetched) - 1], None
+
+    cache = FundamentalsCache(tmp_path / 'cache.sqlite')
+    cache.set('yfinance', 'TEST.JK', {'quote': {'market_cap': 5e11, 'current_price': 100.0},
+                                      'balance_sheet': pd.DataFrame(), 'financials': pd.DataFrame()})
+    monkeypatch.setattr(core.DataProvider, '_cache', cache)
+    monkeypatch.setattr(core.DataProvider, '_fetch_yfinance_quarterly', fake_fetch)
+
+    history, error = core.DataProvider.get_history('TEST.JK', period='quarterly')
+    assert error is None and len(fetched) == 1
+    assert list(history['total_assets']) == [100.0, 101.0, 102.0, 103.0]
+    assert history['market_cap'].iloc[-1] == 5e11
+
+    # Baru saja dicek: tidak ada fetch ulang
+    ttm, _ = core.DataProvider.get_history('TEST.JK', period='ttm')
+    assert len(fetched) == 1
+    assert list(ttm['total_revenue']) == [40.0]
+
+    # Pengecekan sudah lama dan kuartal berikutnya sudah lewat jatuh tempo
+    stored = cache.get('yfinance', 'TEST.JK', 'quarterly')
+    stored['checked_at'] -= core.CACHE_TTL + 1
+    cache.set('yfinance', 'TEST.JK', stored, 'quarterly')
+    history, _ = core.DataProvider.get_history('TEST.JK', period='quarterly')
+    assert len(fetched) == 2
+    assert list(history['total_assets']) == [100.0, 101.0, 102.0, 103.0, 903.0]
+
+
+def test_ttm_history_drops_periods_with_a_missing_quarter(tmp_path, monkeypatch):
+    """Kuartal tanpa net income tidak menghasilkan TTM net income 0 (seolah impas)"""
+    import numpy as np
+    import pandas as pd
+    from app import core
+    from app.data_providers.cache import FundamentalsCache
+
+    dates = pd.to_datetime(['2024-03-31', '2024-06-30', '2024-09-30', '2024-12-31', '2025-03-31'])
+    quarters = pd.DataFrame({'total_assets': [100.0] * 5, 'total_revenue': [10.0] * 5,
+                             'net_income': [2.0, 2.0, 2.0, np.nan, 2.0]},
+                            index=pd.DatetimeIndex(dates, name='fiscal_date'))
+    cache = FundamentalsCache(tmp_path / 'cache.sqlite')
+    cache.set('yfinance', 'TEST.JK', {'quote': {}, 'balance_sheet': pd.DataFrame(),
+                                      'financials': pd.DataFrame()})
+    monkeypatch.setattr(core.DataProvider, '_cache', cache)
+    monkeypatch.setattr(core.DataProvider, '_fetch_yfinance_quarterly', lambda ticker: (quarters, None))
+
+    ttm, error = core.DataProvider.get_history('TEST.JK', period='ttm')
+    assert ttm is None and error is not None  # kedua jendela memuat Q4 2024 yang bolong
+
+    quarters.loc['2024-12-31', 'net_income'] = 2.0
+    cache.invalidate('yfinance', 'TEST.JK')
+    cache.set('yfinance', 'TEST.JK', {'quote': {}, 'balance_sheet': pd.DataFrame(),
+                                      'financials': pd.DataFrame()})
+    ttm, error = core.DataProvider.get_history('TEST.JK', period='ttm')
+    assert error is None
+    assert list(ttm['net_income']) == [8.0, 8.0]
\ No newline at end of file
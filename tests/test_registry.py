@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.models.registry import MODEL_REGISTRY, LinearModel, Term, score_arrays
+
+
+def _values(**fields):
+    """Helper: validated-style arrays for one company"""
+    base = {
+        'current_assets': 1000000.0, 'current_liabilities': 500000.0,
+        'total_assets': 2000000.0, 'total_liabilities': 800000.0,
+        'total_revenue': 1500000.0, 'ebit': 200000.0, 'net_income': 150000.0,
+        'retained_earnings': 300000.0, 'market_cap': 1500000.0,
+        'total_equity': 1200000.0
+    }
+    base.update(fields)
+    return {key: np.array([value]) for key, value in base.items()}
+
+
+def test_registry_matches_hand_written_formulas():
+    """Test the coefficient tables reproduce the original formulas"""
+    results = score_arrays(_values())
+    
+    x1, x2, x3, x4, x5 = 0.25, 0.15, 0.1, 1500000 / 800000, 0.75
+    assert np.isclose(results['altman']['score'][0], 1.2*x1 + 1.4*x2 + 3.3*x3 + 0.6*x4 + 1.0*x5)
+    assert np.isclose(results['altman_modified']['score'][0],
+                      0.717*x1 + 0.847*x2 + 3.107*x3 + 0.42*1.5 + 0.998*x5)
+    assert np.isclose(results['grover']['score'][0], 1.65*x1 + 3.404*x3 - 0.016*0.4 + 0.057)
+    
+    x_score = -4.3 - 4.5*0.075 + 5.7*0.4 - 0.004*2.0
+    assert np.isclose(results['zmijewski']['score'][0], x_score)
+    assert np.isclose(results['zmijewski']['probability'][0], 1 / (1 + np.exp(-x_score)))
+
+
+def test_new_registry_entry_gets_batch_path():
+    """Test a model added as a table entry is scored by score_arrays"""
+    MODEL_REGISTRY['test_model'] = LinearModel(
+        key='test_model', name='Test Model',
+        terms=(Term('x1', 'wc_ta', 2.0, 'WC/TA'), Term('x2', 'tl_ta', -1.0, 'TL/TA')),
+        intercept=0.5, link='identity', cuts=(0.0,), side='right',
+        zones=(("Bad", "Tinggi", None), ("Good", "Rendah", None)), formula='T'
+    )
+    try:
+        values = {key: np.repeat(value, 2) for key, value in _values().items()}
+        values['current_assets'] = np.array([1000000.0, 200000.0])
+        result = score_arrays(values)['test_model']
+        assert np.allclose(result['score'], [2.0*0.25 - 0.4 + 0.5, 2.0*-0.15 - 0.4 + 0.5])
+        assert list(result['zone']) == [1, 0]
+    finally:
+        del MODEL_REGISTRY['test_model']
+
+
+def test_non_finite_scores_get_no_zone():
+    """Test NaN/inf scores map to INVALID_ZONE instead of the healthiest zone"""
+    from app.core import BankruptcyPredictor
+    from app.models.registry import INVALID_ZONE
+
+    values = {key: np.repeat(value, 3) for key, value in _values().items()}
+    values['ebit'] = np.array([200000.0, np.inf, np.nan])
+    zones = score_arrays(values, ['altman'])['altman']['zone']
+    assert zones[0] != INVALID_ZONE
+    assert list(zones[1:]) == [INVALID_ZONE, INVALID_ZONE]
+
+    # Validasi mengubah NaN menjadi 0; inf tetap sampai ke skor
+    frame = BankruptcyPredictor.score_frame(values)
+    assert frame['altman_status'].isna().tolist() == [False, True, False]
+    assert 'error' in BankruptcyPredictor.score('altman', {k: v[1:2] for k, v in values.items()})
+
+    infinite = BankruptcyPredictor.score_frame(dict(_values(), total_assets=np.inf))
+    assert infinite['altman_status'].isna().all() and infinite['error'].iloc[0] is not None
@@ -0,0 +1,54 @@
+import math
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from app.data_providers.coalesce import SingleFlight
+
+RESULTS = {
+    'Altman Z-Score': {'score': 3.1, 'risk': 'Rendah', 'components': {'X1': 0.2}},
+    'Springate S-Score': {'score': 0.5, 'risk': 'Tinggi', 'components': {'A': 0.1}},
+}
+
+
+def test_memoized_render_reuses_and_evicts(monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main, '_render_memo', SingleFlight(max_entries=2, ttl=math.inf))
+    builds = []
+
+    def build(results):
+        builds.append(1)
+        return main.create_risk_chart(results)
+
+    first = main.memoized_render('risk_chart', lambda: build(RESULTS), RESULTS)
+    same = {key: dict(value) for key, value in RESULTS.items()}  # isi sama, objek berbeda
+    assert main.memoized_render('risk_chart', lambda: build(same), same) is first
+    assert len(builds) == 1
+
+    changed = dict(RESULTS, **{'Altman Z-Score': dict(RESULTS['Altman Z-Score'], score=1.2)})
+    assert main.memoized_render('risk_chart', lambda: build(changed), changed) is not first
+    main.memoized_render('other', lambda: 'x', 1)
+    assert main._render_memo.stats()['entries'] == 2  # entri paling lama (first) dibuang
+    main.memoized_render('risk_chart', lambda: build(RESULTS), RESULTS)
+    assert len(builds) == 3
+
+
+def test_content_hash():
+    from app import main
+
+    frame = pd.DataFrame({'total_assets': [1.0, 2.0]}, index=pd.to_datetime(['2022-12-31', '2023-12-31']))
+    assert main.content_hash(frame) == main.content_hash(frame.copy())
+    assert main.content_hash(frame) != main.content_hash(frame * 2)
+    assert main.content_hash(np.arange(3.0)) != main.content_hash(np.arange(4.0))
+    grid = np.arange(6.0)
+    assert main.content_hash(grid) != main.content_hash(grid.reshape(2, 3))
+    assert main.content_hash(grid.reshape(2, 3)) != main.content_hash(grid.reshape(3, 2))
+    assert main.content_hash(np.zeros(2)) != main.content_hash(np.zeros(4, dtype=np.int32))
+
+    # Template Plotly global tidak diubah saat modul dimuat
+    assert pio.templates.default != 'none'
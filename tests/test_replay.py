@@ -0,0 +1,133 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pandas as pd
+import pytest
+
+from app.data_providers.cache import FundamentalsCache
+from app.data_providers.coalesce import SingleFlight
+from app.data_providers.replay import (
+    FixtureMissing,
+    FixtureStore,
+    InjectedError,
+    Outcome,
+    Recorder,
+    ReplayProvider,
+)
+
+
+class FakeTicker:
+    def __init__(self, ticker):
+        self.fast_info = {'lastPrice': 100.0, 'marketCap': 5e11}
+        self.info = {'longName': 'PT Contoh Tbk', 'sector': 'Energy'}
+        self.balance_sheet = pd.DataFrame({'2023': [1e12, 6e11, 4e11, 3e11]}, index=[
+            'Total Assets', 'Total Liabilities Net Minority Interest', 'Current Assets',
+            'Current Liabilities'])
+        self.financials = pd.DataFrame({'2023': [8e11, 1e11, 7e10]}, index=[
+            'Total Revenue', 'EBIT', 'Net Income'])
+
+
+def _isolate(core, monkeypatch, tmp_path, upstream):
+    monkeypatch.setattr(core.DataProvider, '_cache', FundamentalsCache(tmp_path / 'cache.sqlite'))
+    monkeypatch.setattr(core.DataProvider, '_memo', SingleFlight())
+    monkeypatch.setattr(core.DataProvider, '_upstream', upstream)
+
+
+def test_record_then_replay_without_network(tmp_path, monkeypatch):
+    from app import core
+
+    store = FixtureStore(tmp_path / 'fixtures')
+    monkeypatch.setattr('yfinance.Ticker', FakeTicker)
+    _isolate(core, monkeypatch, tmp_path / 'record', Recorder(store))
+    recorded, error = core.DataProvider.get_yfinance_data('TEST.JK')
+    assert error is None
+    info = core.DataProvider.get_company_info('TEST.JK')
+    assert sorted(store.keys()) == [('yfinance', 'annual', 'TEST.JK'), ('yfinance', 'info', 'TEST.JK')]
+
+    # Replay: yfinance tidak boleh dipanggil sama sekali
+    monkeypatch.setattr('yfinance.Ticker', lambda ticker: pytest.fail('network call in replay'))
+    sleeps = []
+    (tmp_path / 'replay').mkdir()
+    _isolate(core, monkeypatch, tmp_path / 'replay',
+             ReplayProvider(store, latency=0.25, sleep=sleeps.append))
+    replayed, error = core.DataProvider.get_yfinance_data('TEST.JK')
+    assert error is None
+    assert replayed == recorded
+    assert core.DataProvider.get_company_info('TEST.JK') == info
+    assert sleeps == [0.25, 0.25]
+
+    missing, error = core.DataProvider.get_yfinance_data('NONE.JK')
+    assert missing is None and 'Fixture tidak ditemukan' in error
+
+
+def test_replay_injects_errors_deterministically(tmp_path):
+    store = FixtureStore(tmp_path)
+    store.save('alpha_vantage', 'OVERVIEW', 'IBM', Outcome(value={'Symbol': 'IBM'}))
+    store.save('alpha_vantage', 'BALANCE_SHEET', 'IBM', Outcome(error=RuntimeError('recorded failure')))
+
+    def run(seed):
+        replay = ReplayProvider(store, error_rate=0.5, seed=seed, sleep=lambda s: None)
+        outcomes = []
+        for _ in range(40):
+            try:
+                replay.call('alpha_vantage', 'OVERVIEW', 'IBM', fetch=None)
+                outcomes.append(True)
+            except InjectedError:
+                outcomes.append(False)
+        return outcomes
+
+    assert run(1) == run(1)
+    assert 5 < sum(run(1)) < 35
+
+    replay = ReplayProvider(store)
+    with pytest.raises(RuntimeError, match='recorded failure'):
+        replay.call('alpha_vantage', 'BALANCE_SHEET', 'IBM', fetch=None)
+    with pytest.raises(FixtureMissing):
+        replay.call('alpha_vantage', 'INCOME_STATEMENT', 'IBM', fetch=None)
+
+
+def test_alpha_vantage_replays_through_client_queue_without_key(tmp_path, monkeypatch):
+    from app import core
+    from app.data_providers import alpha_vantage
+    from tests.test_data_provider import _alpha_vantage_payloads, _fake_client
+
+    payloads = _alpha_vantage_payloads()
+    store = FixtureStore(tmp_path / 'fixtures')
+    monkeypatch.setattr(alpha_vantage, 'get_client',
+                        lambda api_key: _fake_client(lambda function, symbol: payloads[function]))
+    _isolate(core, monkeypatch, tmp_path / 'record', Recorder(store))
+    recorded, error = core.DataProvider.get_alpha_vantage_data('IBM', 'demo')
+    assert error is None
+    assert sorted(kind for _, kind, _ in store.keys()) == ['BALANCE_SHEET', 'INCOME_STATEMENT', 'OVERVIEW']
+
+    # Replay: tanpa API key dan tanpa memanggil query
+    monkeypatch.setattr(alpha_vantage, 'get_client', lambda api_key: _fake_client(
+        lambda function, symbol: pytest.fail('network call in replay')))
+    (tmp_path / 'replay').mkdir()
+    _isolate(core, monkeypatch, tmp_path / 'replay', ReplayProvider(store))
+    replayed, error = core.DataProvider.get_alpha_vantage_data('IBM', None)
+    assert error is None
+    assert replayed == recorded
+
+
+def test_record_mode_ignores_warm_local_cache(tmp_path, monkeypatch):
+    """Cache CACHE_DIR yang hangat tidak boleh membuat fixture batal terekam"""
+    from app import core
+    from app.data_providers import cache
+
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path / 'live'))
+    monkeypatch.setattr('yfinance.Ticker', FakeTicker)
+    monkeypatch.setattr(core.DataProvider, '_cache', None)
+    monkeypatch.setattr(core.DataProvider, '_memo', SingleFlight())
+    monkeypatch.setattr(core.DataProvider, '_upstream', None)
+    live, error = core.DataProvider.get_yfinance_data('TEST.JK')
+    assert error is None
+    assert core.DataProvider.get_cache().path.parent == tmp_path / 'live'
+
+    store = FixtureStore(tmp_path / 'fixtures')
+    core.DataProvider.set_upstream(Recorder(store))
+    recorded, error = core.DataProvider.get_yfinance_data('TEST.JK')
+    assert error is None and recorded == live
+    assert store.keys() == [('yfinance', 'annual', 'TEST.JK')]
+    assert core.DataProvider.get_cache().path.parent != tmp_path / 'live'
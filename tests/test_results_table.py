@@ -0,0 +1,55 @@
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from app.components.results_table import ResultsTable
+
+
+def _results(n=50000, seed=0):
+    rng = np.random.default_rng(seed)
+    scores = rng.normal(2.0, 1.5, n)
+    scores[::97] = np.nan
+    return pd.DataFrame({
+        'company_name': [f"PT Emiten {i} Tbk" for i in range(n)],
+        'altman_score': scores,
+        'high_risk_models': rng.integers(0, 5, n),
+    }, index=pd.Index([f"T{i:05d}.JK" for i in range(n)], name='ticker'))
+
+
+def test_page_sorts_filters_and_clamps():
+    frame = _results(1000)
+    table = ResultsTable(frame, search_columns=('company_name',))
+
+    page = table.page(0, 50, 'altman_score', ascending=False)
+    assert len(page.frame) == 50 and page.pages == 20 and page.total == 1000
+    expected = frame['altman_score'].sort_values(ascending=False, kind='stable', na_position='last')
+    pd.testing.assert_frame_equal(page.frame, frame.loc[expected.index[:50]])
+
+    last = table.page(99, 50, 'altman_score', ascending=False)
+    assert last.page == 19
+    n_missing = frame['altman_score'].isna().sum()
+    assert last.frame['altman_score'].tail(n_missing).isna().all()  # NaN selalu di akhir
+
+    risky = table.page(0, 25, 'ticker', ascending=True, minimum={'high_risk_models': 3})
+    assert risky.total == (frame['high_risk_models'] >= 3).sum()
+    assert (risky.frame['high_risk_models'] >= 3).all()
+    assert list(risky.frame.index) == sorted(risky.frame.index)
+
+    found = table.page(0, 50, query='emiten 12 tbk')
+    assert list(found.frame.index) == ['T00012.JK']
+    assert table.page(0, 50, query='tidak ada').total == 0
+
+
+def test_sort_index_cached_and_pages_fast():
+    table = ResultsTable(_results(), search_columns=('company_name',))
+    order = table.sort_order('altman_score', ascending=False)
+    assert table.sort_order('altman_score', ascending=False) is order
+
+    start = time.perf_counter()
+    for page in range(20):
+        table.page(page, 100, 'altman_score', ascending=False, minimum={'high_risk_models': 2})
+    assert (time.perf_counter() - start) / 20 < 0.05
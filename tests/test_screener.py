@@ -0,0 +1,51 @@
+import sys
+import threading
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.utils.tickers import parse_tickers
+
+
+def test_screener_results_fill_progressively(monkeypatch, healthy_record, distressed_record):
+    """Ticker cepat sudah dinilai sebelum ticker lambat selesai"""
+    from app import core, main
+
+    release = threading.Event()
+
+    def fake_fetch(ticker, refresh=False):
+        if ticker == 'SLOW.JK':
+            release.wait(5)
+        if ticker == 'BAD.JK':
+            return None, "Ticker BAD.JK tidak ditemukan atau tidak valid"
+        record = distressed_record if ticker == 'SICK.JK' else healthy_record
+        return record(ticker), None
+
+    monkeypatch.setattr(core.DataProvider, 'get_yfinance_data', fake_fetch)
+
+    job = core.ScreenerJob(['GOOD.JK', 'SICK.JK', 'BAD.JK', 'SLOW.JK', 'GOOD.JK'], batch_size=2).start()
+    deadline = time.monotonic() + 5
+    while job.progress[0] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    partial = job.results()
+    assert not job.finished
+    assert job.progress == (3, 4)
+    assert set(partial.index) == {'GOOD.JK', 'SICK.JK'}
+    assert job.errors == {'BAD.JK': "Ticker BAD.JK tidak ditemukan atau tidak valid"}
+
+    release.set()
+    assert job.wait(5)
+    results = job.results()
+    assert list(results.index).count('SLOW.JK') == 1 and len(results) == 3
+    assert results.loc['SICK.JK', 'high_risk_models'] > results.loc['GOOD.JK', 'high_risk_models']
+    assert results.loc['SICK.JK', 'company_name'] == 'PT SICK.JK'
+
+    table = main.screener_table(results)
+    assert table.index.name == 'Ticker' and 'Altman Z-Score' in table.columns
+
+
+def test_parse_tickers_csv_and_text():
+    assert parse_tickers("ticker,name\nbbri.jk,BRI\nTLKM.JK,Telkom\nBBRI.JK,BRI\n") == ['BBRI.JK', 'TLKM.JK']
+    assert parse_tickers(b"BBRI.JK, tlkm.jk;ASII.JK\n\nBBRI.JK") == ['BBRI.JK', 'TLKM.JK', 'ASII.JK']
+    assert parse_tickers("") == []
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.models.registry import score_arrays
+from app.models.sensitivity import apply_changes, scenario_error, score_gradients
+
+
+def _watchlist(n=50, seed=0):
+    """Helper: random validated-style arrays for n companies"""
+    rng = np.random.default_rng(seed)
+    total_assets = rng.uniform(1e6, 1e7, n)
+    return {
+        'total_assets': total_assets,
+        'current_assets': total_assets * rng.uniform(0.1, 0.6, n),
+        'current_liabilities': total_assets * rng.uniform(0.05, 0.5, n),
+        'total_liabilities': total_assets * rng.uniform(0.2, 0.9, n),
+        'total_revenue': total_assets * rng.uniform(0.1, 2.0, n),
+        'ebit': total_assets * rng.uniform(-0.1, 0.2, n),
+        'net_income': total_assets * rng.uniform(-0.1, 0.15, n),
+        'retained_earnings': total_assets * rng.uniform(-0.3, 0.4, n),
+        'market_cap': total_assets * rng.uniform(0.1, 3.0, n),
+        'total_equity': total_assets * rng.uniform(0.1, 0.8, n)
+    }
+
+
+def test_gradients_match_finite_differences():
+    """Test analytic partial derivatives against central differences"""
+    values = _watchlist()
+    gradients = score_gradients(values)
+    
+    for i, field in enumerate(gradients.fields):
+        h = values[field] * 1e-6
+        up = dict(values, **{field: values[field] + h})
+        down = dict(values, **{field: values[field] - h})
+        up_results, down_results = score_arrays(up), score_arrays(down)
+        for key, grad in gradients.score.items():
+            numeric = (up_results[key]['score'] - down_results[key]['score']) / (2 * h)
+            assert np.allclose(grad[:, i], numeric, rtol=1e-4, atol=1e-12), (key, field)
+        numeric = (up_results['zmijewski']['probability'] - down_results['zmijewski']['probability']) / (2 * h)
+        assert np.allclose(gradients.probability['zmijewski'][:, i], numeric, rtol=1e-4, atol=1e-12)
+
+
+def test_apply_changes_scales_fields():
+    """Test what-if scenario scaling leaves the base values untouched"""
+    values = _watchlist(3)
+    scenario = apply_changes(values, {'ebit': 0.5, 'total_assets': 0.0})
+    
+    assert np.allclose(scenario['ebit'], values['ebit'] * 1.5)
+    assert scenario['total_assets'] is values['total_assets']
+    assert not np.allclose(score_arrays(scenario)['altman']['score'], score_arrays(values)['altman']['score'])
+
+
+def test_zero_denominator_scenario_is_rejected():
+    """Test a -100% total assets scenario is rejected instead of scoring NaN"""
+    values = _watchlist(1)
+    assert scenario_error(apply_changes(values, {'total_assets': -0.95})) is None
+    assert "Total Assets" in scenario_error(apply_changes(values, {'total_assets': -1.0}))
+
+
+def test_zeroed_field_is_not_auto_filled():
+    """Test -100% current assets keeps lowering Altman (no auto-fix to TA × 0.4)"""
+    values = _watchlist(1)
+    scores = [score_arrays(apply_changes(values, {'current_assets': change}))['altman']['score'][0]
+              for change in (-0.9, -0.95, -1.0)]
+    assert scenario_error(apply_changes(values, {'current_assets': -1.0})) is None
+    assert scores[0] > scores[1] > scores[2]
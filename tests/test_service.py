@@ -0,0 +1,167 @@
+import json
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.service import PooledHTTPServer
+
+HEALTHY = {
+    'current_assets': 6e11, 'current_liabilities': 2e11, 'total_assets': 1e12,
+    'total_liabilities': 3e11, 'retained_earnings': 4e11, 'total_equity': 7e11,
+    'total_revenue': 1.2e12, 'ebit': 2.5e11, 'net_income': 1.8e11, 'market_cap': 2e12,
+}
+
+
+@pytest.fixture
+def server():
+    server = PooledHTTPServer(('127.0.0.1', 0), workers=2, chunk_size=3)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=10) as response:
+            return response.status, response.headers, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, json.loads(e.read())
+
+
+def test_score_single_and_streamed_batch(server):
+    status, _, result = _request(f"{server}/score", HEALTHY)
+    assert status == 200
+    assert result['altman_risk'] == 'Rendah' and result['error'] is None
+
+    batch = [dict(HEALTHY, id=i) for i in range(7)] + [{'id': 'kosong', 'total_assets': 0}]
+    status, headers, results = _request(f"{server}/score?models=altman,grover", batch)
+    assert status == 200
+    assert headers['Transfer-Encoding'] == 'chunked'  # 8 record > chunk_size 3
+    assert [row['id'] for row in results] == list(range(7)) + ['kosong']
+    assert 'springate_score' not in results[0] and 'grover_score' in results[0]
+    assert results[-1]['error'] is not None and results[-1]['altman_score'] is None
+
+
+def test_ticker_endpoint_and_errors(server, monkeypatch):
+    from app import core
+
+    def fake_fetch(ticker, source='yfinance', api_key=None, refresh=False):
+        if ticker == 'BAD.JK':
+            return None, "Ticker BAD.JK tidak ditemukan atau tidak valid"
+        return core.FinancialRecord.from_dict(dict(HEALTHY, company_name='PT Contoh Tbk')), None
+
+    monkeypatch.setattr(core.DataProvider, 'fetch', fake_fetch)
+    status, _, result = _request(f"{server}/ticker/bbri.jk?models=zmijewski")
+    assert status == 200
+    assert result['ticker'] == 'BBRI.JK'
+    assert result['financials']['company_name'] == 'PT Contoh Tbk'
+    assert 0 <= result['scores']['zmijewski_probability'] <= 1
+
+    assert _request(f"{server}/ticker/BAD.JK")[0] == 404
+    assert _request(f"{server}/ticker/BBRI.JK?source=bloomberg")[0] == 400
+    assert _request(f"{server}/score?models=ohlson", HEALTHY)[0] == 400
+    assert _request(f"{server}/score", 'bukan objek')[0] == 400
+    assert _request(f"{server}/nope")[0] == 404
+
+
+def _serve(**kwargs):
+    server = PooledHTTPServer(('127.0.0.1', 0), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_idle_connections_time_out():
+    server = _serve(workers=1, connections=2, request_timeout=0.3)
+    try:
+        idle = [socket.create_connection(('127.0.0.1', server.server_port)) for _ in range(2)]
+        start = time.perf_counter()
+        status, _, result = _request(f"http://127.0.0.1:{server.server_port}/score", HEALTHY)
+        assert status == 200 and result['error'] is None
+        assert time.perf_counter() - start < 5
+        for sock in idle:
+            sock.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_slow_ticker_fetch_does_not_block_scoring(monkeypatch):
+    from app import core
+
+    released = threading.Event()
+
+    def slow_fetch(ticker, source='yfinance', api_key=None, refresh=False):
+        released.wait(5)
+        return core.FinancialRecord.from_dict(HEALTHY), None
+
+    monkeypatch.setattr(core.DataProvider, 'fetch', slow_fetch)
+    server = _serve(workers=1, connections=4, fetch_workers=2)
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        tickers = [threading.Thread(target=_request, args=(f"{url}/ticker/T{i}.JK",)) for i in range(2)]
+        for thread in tickers:
+            thread.start()
+        time.sleep(0.2)  # kedua fetch sedang menunggu di pool fetch
+        start = time.perf_counter()
+        assert _request(f"{url}/score", HEALTHY)[0] == 200
+        assert time.perf_counter() - start < 1
+        released.set()
+        for thread in tickers:
+            thread.join(5)
+    finally:
+        released.set()
+        server.shutdown()
+        server.server_close()
+
+
+def test_ticker_respects_source_concurrency_and_scores_in_pool(monkeypatch):
+    from app import core, service
+
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow_fetch(ticker, source='yfinance', api_key=None, refresh=False):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+        return core.FinancialRecord.from_dict(HEALTHY), None
+
+    scoring_threads = []
+    score_records = service.score_records
+
+    def tracking_score_records(records, models=None):
+        scoring_threads.append(threading.current_thread().name)
+        return score_records(records, models)
+
+    monkeypatch.setattr(core.DataProvider, 'fetch', slow_fetch)
+    monkeypatch.setattr(core.DataProvider, '_source_limits', {'yfinance': threading.BoundedSemaphore(1)})
+    monkeypatch.setattr(service, 'score_records', tracking_score_records)
+    server = _serve(workers=1, connections=4, fetch_workers=3)
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        results = []
+        threads = [threading.Thread(target=lambda i=i: results.append(_request(f"{url}/ticker/T{i}.JK")))
+                   for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        assert [status for status, _, _ in results] == [200] * 3
+        assert results[0][2]['scores']['altman_risk'] == 'Rendah'
+        assert peak[0] == 1
+        assert len(scoring_threads) == 3 and all(name.startswith('scoring') for name in scoring_threads)
+    finally:
+        server.shutdown()
+        server.server_close()
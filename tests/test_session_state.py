@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).parent.parent / 'app' / 'main.py')
+
+
+def _button(at, label):
+    return next(button for button in at.sidebar.button if button.label == label)
+
+
+def test_results_survive_reruns_without_refetch(monkeypatch, healthy_record):
+    """Rerun merender ulang dari session state; hanya refresh yang memanggil provider lagi"""
+    from app import core
+
+    fetches, info_calls = [], []
+
+    def fake_fetch(ticker, source='yfinance', api_key=None, refresh=False):
+        fetches.append((ticker, refresh))
+        return healthy_record(), None
+
+    def fake_info(ticker, refresh=False):
+        info_calls.append(ticker)
+        return core.CompanyInfo(company_name='PT Contoh Tbk')
+
+    monkeypatch.setattr(core.DataProvider, 'fetch', fake_fetch)
+    monkeypatch.setattr(core.DataProvider, 'get_history', lambda *args, **kwargs: (None, 'n/a'))
+    monkeypatch.setattr(core.DataProvider, 'get_company_info', fake_info)
+
+    at = AppTest.from_file(APP, default_timeout=30).run()
+    at.sidebar.radio[1].set_value("Custom Input").run()
+    _button(at, "🚀 Analisis Sekarang!").click().run()
+    assert not at.exception
+    assert fetches == [('BBRI.JK', False)]
+    state = at.session_state['analysis']
+    assert state.financial_data.info.company_name == 'PT Contoh Tbk' and state.company_info is None
+    assert len(state.analyses) == 1
+
+    # Rerun karena widget lain: hasil tetap tampil, tanpa fetch/skor ulang
+    at.sidebar.radio[2].set_value('ttm').run()
+    assert any("Hasil Analisis" in header.value for header in at.subheader)
+    assert fetches == [('BBRI.JK', False)] and info_calls == ['BBRI.JK']
+
+    # Klik ulang ticker yang sama memakai state tersimpan; refresh eksplisit fetch ulang
+    at.sidebar.radio[2].set_value('annual').run()
+    _button(at, "🚀 Analisis Sekarang!").click().run()
+    assert fetches == [('BBRI.JK', False)]
+    at.sidebar.checkbox[1].check().run()
+    _button(at, "🚀 Analisis Sekarang!").click().run()
+    assert fetches == [('BBRI.JK', False), ('BBRI.JK', True)]
+    assert at.session_state['analysis'] is not state
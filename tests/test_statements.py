@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from app.data_providers.statements import (
+    BALANCE_SHEET_FIELDS,
+    STATEMENT_ALIASES,
+    append_new_periods,
+    extract_history,
+    extract_statement,
+    trailing_twelve_months,
+)
+
+
+def _probe(frame, aliases, column):
+    """Referensi: probe alias satu per satu seperti _safe_extract lama"""
+    for key in aliases:
+        if key in frame.index:
+            value = frame.loc[key].iloc[column]
+            if pd.notna(value) and value != 0:
+                return float(value), key
+    return np.nan, None
+
+
+def test_extract_matches_linear_probe_for_all_periods():
+    rng = np.random.default_rng(7)
+    labels = [label for aliases in STATEMENT_ALIASES.values() for label in aliases] + ['Other Row']
+    periods = pd.to_datetime(['2023-12-31', '2022-12-31', '2021-12-31', '2020-12-31'])
+    for _ in range(30):
+        chosen = rng.choice(labels, size=rng.integers(1, len(labels)), replace=False)
+        data = rng.normal(1e9, 5e8, (len(chosen), len(periods)))
+        data[rng.random(data.shape) < 0.3] = np.nan
+        data[rng.random(data.shape) < 0.1] = 0.0
+        frame = pd.DataFrame(data, index=chosen, columns=periods)
+
+        extraction = extract_statement(frame)
+        for field, aliases in STATEMENT_ALIASES.items():
+            for column in range(len(periods)):
+                value, alias = _probe(frame, aliases, column)
+                got = extraction.values[field].iloc[column]
+                assert (np.isnan(value) and np.isnan(got)) or got == value
+                assert extraction.matched[field].iloc[column] == alias
+
+
+def test_extract_reports_alias_and_latest_values():
+    frame = pd.DataFrame(
+        {'2023': [np.nan, 900.0, 400.0, 5.0, 5.0], '2022': [800.0, np.nan, 350.0, 6.0, 6.0]},
+        index=['Total Assets', 'TotalAssets', 'Stockholders Equity', 'Current Assets', 'Current Assets']
+    )
+    extraction = extract_statement(frame, BALANCE_SHEET_FIELDS)
+    assert list(extraction.matched['total_assets']) == ['TotalAssets', 'Total Assets']
+    assert extraction.matched['total_equity'].iloc[0] == 'Stockholders Equity'
+    latest = extraction.latest()
+    assert latest['total_assets'] == 900.0
+    assert latest['current_assets'] == 5.0
+    assert latest['retained_earnings'] == 0.0
+
+    empty = extract_statement(pd.DataFrame(), BALANCE_SHEET_FIELDS)
+    assert empty.latest() == {field: 0.0 for field in BALANCE_SHEET_FIELDS}
+
+
+def test_extract_history_joins_periods_ascending():
+    dates = pd.to_datetime(['2023-12-31', '2022-12-31', '2021-12-31', '2020-12-31'])
+    balance = pd.DataFrame([[100.0, 90.0, 80.0, np.nan], [60.0, 50.0, np.nan, np.nan]],
+                           index=['Total Assets', 'Total Liabilities'], columns=dates)
+    income = pd.DataFrame([[10.0, 9.0, 8.0]], index=['Net Income'], columns=dates[:3])
+
+    history = extract_history(balance, income)
+    assert list(history.index.year) == [2021, 2022, 2023]
+    assert history.index.name == 'fiscal_date'
+    assert list(history['total_assets']) == [80.0, 90.0, 100.0]
+    assert list(history['total_liabilities']) == [0.0, 50.0, 60.0]
+    assert list(history['net_income']) == [8.0, 9.0, 10.0]
+
+
+def test_trailing_twelve_months_sums_four_consecutive_quarters():
+    dates = pd.to_datetime(['2023-03-31', '2023-06-30', '2023-09-30', '2023-12-31',
+                            '2024-03-31', '2024-09-30', '2024-12-31', '2025-03-31'])
+    quarterly = pd.DataFrame({
+        'total_assets': np.arange(1.0, 9.0) * 100,
+        'total_revenue': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0],
+        'ebit': [np.nan] * 8,  # tidak pernah dilaporkan
+    }, index=pd.DatetimeIndex(dates, name='fiscal_date'))
+
+    ttm = trailing_twelve_months(quarterly)
+    # 2023-12 dan 2024-03 lengkap; 2024-09 dst. melompati Q2 2024 (rentang > 12 bulan)
+    assert list(ttm.index.strftime('%Y-%m')) == ['2023-12', '2024-03']
+    assert list(ttm['total_revenue']) == [100.0, 140.0]
+    assert list(ttm['total_assets']) == [400.0, 500.0]
+    assert ttm['ebit'].isna().all()
+
+
+def test_trailing_twelve_months_drops_windows_with_a_missing_quarter():
+    dates = pd.to_datetime(['2023-03-31', '2023-06-30', '2023-09-30', '2023-12-31',
+                            '2024-03-31', '2024-06-30', '2024-09-30'])
+    quarterly = pd.DataFrame({
+        'total_assets': [100.0] * 7,
+        'total_revenue': [10.0] * 7,
+        'net_income': [10.0, 10.0, np.nan, 10.0, 10.0, 10.0, 10.0],
+    }, index=pd.DatetimeIndex(dates, name='fiscal_date'))
+
+    ttm = trailing_twelve_months(quarterly)
+    # Tiga jendela yang memuat Q3 2023 (tanpa net income) dibuang, bukan dijumlah menjadi NaN/0
+    assert list(ttm.index.strftime('%Y-%m')) == ['2024-09']
+    assert list(ttm['net_income']) == [40.0]
+
+
+def test_append_new_periods_never_overwrites_stored():
+    stored = pd.DataFrame({'total_assets': [1.0, 2.0]},
+                          index=pd.to_datetime(['2024-03-31', '2024-06-30']))
+    fresh = pd.DataFrame({'total_assets': [99.0, 3.0, 4.0]},
+                         index=pd.to_datetime(['2024-06-30', '2024-09-30', '2024-12-31']))
+    merged = append_new_periods(stored, fresh)
+    assert list(merged['total_assets']) == [1.0, 2.0, 3.0, 4.0]
+    assert append_new_periods(merged, fresh) is merged
+    assert list(append_new_periods(None, fresh)['total_assets']) == [99.0, 3.0, 4.0]
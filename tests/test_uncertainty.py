@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.models.registry import score_arrays
+from app.models.uncertainty import simulate_scores
+
+
+def _company():
+    """Helper: validated-style arrays for one company"""
+    return {
+        'current_assets': np.array([1000000.0]), 'current_liabilities': np.array([500000.0]),
+        'total_assets': np.array([2000000.0]), 'total_liabilities': np.array([800000.0]),
+        'total_revenue': np.array([1500000.0]), 'ebit': np.array([200000.0]),
+        'net_income': np.array([150000.0]), 'retained_earnings': np.array([300000.0]),
+        'market_cap': np.array([1500000.0]), 'total_equity': np.array([1200000.0])
+    }
+
+
+def test_zero_error_collapses_to_point_estimate():
+    """Test simulation without input error reproduces the deterministic score"""
+    values = _company()
+    distributions = simulate_scores(values, 1000, errors={}, seed=0)
+    expected = score_arrays(values)
+    
+    for key, distribution in distributions.items():
+        assert np.isclose(distribution.quantiles[0.5], expected[key]['score'][0], rtol=1e-6)
+        assert max(distribution.zone_probabilities) == 1.0
+        assert distribution.valid_fraction == 1.0
+
+
+def test_chunked_simulation_is_consistent():
+    """Test chunk size does not change results and zone probabilities sum to 1"""
+    values = _company()
+    small = simulate_scores(values, 10000, error_scale=3.0, seed=42, chunk_size=1000)
+    large = simulate_scores(values, 10000, error_scale=3.0, seed=42, chunk_size=10000)
+    
+    for key in small:
+        assert np.allclose(small[key].scores, large[key].scores, equal_nan=True)
+        assert np.isclose(sum(small[key].zone_probabilities), 1.0)
+        assert small[key].quantiles[0.05] < small[key].quantiles[0.95]